@@ -2,11 +2,18 @@
 """Central orchestration unit for S.I.O.S."""
 
 import json
+import os
 import time
 import sys
 import importlib
+import inspect
+import multiprocessing
+import multiprocessing.util
+import tempfile
+import threading
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Dict, Any, Type, Callable, List
+from typing import Dict, Any, Type, Callable, List, Optional, Iterable, Set, Tuple
 from dataclasses import dataclass
 import asyncio
 import logging
@@ -15,7 +22,7 @@ from watchdog.events import FileSystemEventHandler
 from jsonschema import ValidationError
 
 import sios_messaging as messaging
-from validation import validate_intent
+from validation import validate_intent, preload_schemas
 from metrics import (
     intents_received,
     intents_success,
@@ -24,150 +31,614 @@ from metrics import (
     start_metrics_server,
     intent_success,
     intent_failure,
+    intent_batch_size,
+    agent_reload_duration,
+    agent_reload_dispatch_failures,
 )
 
 from cognition_lattice.base_agent import BaseAgent
 from messaging_bus import MessageBus, Message
+from messaging_ipc import BusHub, RemoteMessageBus
+from worker_pool import WorkerPool
+from agent_lifecycle import AgentLifecycleManager
+from resource_manager import ResourceManager
 
 AGENTS_DIR = Path(__file__).parent / "cognition_lattice" / "agents"
+# How long a blocking receive may sit idle before the loop goes round again.
+# Brokers return as soon as an intent arrives, so this does not add latency.
+RECEIVE_TIMEOUT = 1.0
+
+
+_process_lifecycle: Optional[AgentLifecycleManager] = None
+_process_lifecycle_pid: Optional[int] = None
+
+
+def _worker_lifecycle() -> AgentLifecycleManager:
+    """Return the agent instances owned by the current (worker) process."""
+    global _process_lifecycle, _process_lifecycle_pid
+    if _process_lifecycle is None or _process_lifecycle_pid != os.getpid():
+        _process_lifecycle = AgentLifecycleManager()
+        _process_lifecycle_pid = os.getpid()
+        # tear the worker's instances down when a recycled pool lets it exit
+        multiprocessing.util.Finalize(_process_lifecycle, _process_lifecycle.shutdown, exitpriority=10)
+    return _process_lifecycle
+
+
+def run_agent(
+    agent_cls: Type[BaseAgent],
+    intent: Dict[str, Any],
+    lifecycle: Optional[AgentLifecycleManager] = None,
+) -> Dict[str, Any]:
+    """Execute ``intent`` on a pooled ``agent_cls`` instance to completion."""
+    with (lifecycle or _worker_lifecycle()).acquire(agent_cls) as agent:
+        result = agent.execute(intent)
+        if inspect.isawaitable(result):
+            result = asyncio.run(result)
+    return result
+
+
+async def run_agent_async(
+    agent_cls: Type[BaseAgent],
+    intent: Dict[str, Any],
+    lifecycle: Optional[AgentLifecycleManager] = None,
+) -> Dict[str, Any]:
+    """Async variant of :func:`run_agent`; sync agents run in a thread."""
+    if inspect.iscoroutinefunction(agent_cls.execute):
+        async with (lifecycle or _worker_lifecycle()).acquire_async(agent_cls) as agent:
+            return await agent.execute(intent)
+    return await asyncio.to_thread(run_agent, agent_cls, intent, lifecycle)
+
+
+async def _settle_batch(results: Any) -> List[Dict[str, Any]]:
+    """Await an async ``execute_batch`` or the per-intent coroutines it returned."""
+    if inspect.isawaitable(results):
+        results = await results
+    settled = []
+    for result in results:
+        if inspect.isawaitable(result):
+            try:
+                result = await result
+            except Exception as exc:
+                result = {"status": "error", "message": str(exc)}
+        settled.append(result)
+    return settled
+
+
+def _needs_loop(results: Any) -> bool:
+    return inspect.isawaitable(results) or any(inspect.isawaitable(r) for r in results)
+
+
+def run_agent_batch(
+    agent_cls: Type[BaseAgent],
+    intents: List[Dict[str, Any]],
+    lifecycle: Optional[AgentLifecycleManager] = None,
+) -> List[Dict[str, Any]]:
+    """Execute ``intents`` in one ``execute_batch`` call on a pooled instance."""
+    with (lifecycle or _worker_lifecycle()).acquire(agent_cls) as agent:
+        results = agent.execute_batch(intents)
+        if _needs_loop(results):
+            results = asyncio.run(_settle_batch(results))
+    if len(results) != len(intents):
+        raise RuntimeError(
+            f"{agent_cls.__name__}.execute_batch returned {len(results)} results for {len(intents)} intents"
+        )
+    return results
+
+
+async def run_agent_batch_async(
+    agent_cls: Type[BaseAgent],
+    intents: List[Dict[str, Any]],
+    lifecycle: Optional[AgentLifecycleManager] = None,
+) -> List[Dict[str, Any]]:
+    """Async variant of :func:`run_agent_batch`; sync agents run in a thread."""
+    if inspect.iscoroutinefunction(agent_cls.execute) or inspect.iscoroutinefunction(agent_cls.execute_batch):
+        async with (lifecycle or _worker_lifecycle()).acquire_async(agent_cls) as agent:
+            results = await _settle_batch(agent.execute_batch(intents))
+        if len(results) != len(intents):
+            raise RuntimeError(
+                f"{agent_cls.__name__}.execute_batch returned {len(results)} results for {len(intents)} intents"
+            )
+        return results
+    return await asyncio.to_thread(run_agent_batch, agent_cls, intents, lifecycle)
+
+
+def group_by_intent_type(intents: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """Split ``intents`` into per-type batches, keeping arrival order within each."""
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for intent in intents:
+        groups.setdefault(intent.get("intent", "unknown"), []).append(intent)
+    return list(groups.values())
+
 
 class AgentCore:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        executor: Optional[str] = None,
+        workers: Optional[int] = None,
+        max_inflight: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ) -> None:
+        self.batch_size = batch_size or int(os.getenv("AGENT_BATCH_SIZE", "1"))
+        executor = executor or os.getenv("AGENT_EXECUTOR")
+        self._pool: Optional[WorkerPool] = None
+        if executor:
+            self._pool = WorkerPool(
+                executor,
+                workers=workers or int(os.getenv("AGENT_WORKERS", "0")) or None,
+                max_inflight=max_inflight or int(os.getenv("AGENT_MAX_INFLIGHT", "0")) or None,
+            )
+        preload_schemas()
         self.registry: Dict[str, Type[BaseAgent]] = {}
+        self._agent_modules: Dict[str, List[Type[BaseAgent]]] = {}
+        self._reload_lock = threading.Lock()
+        self._reloading = threading.Event()
+        self.lifecycle = AgentLifecycleManager()
         self._load_agents()
         self._start_watcher()
         start_metrics_server()
 
     def _start_watcher(self) -> None:
         """Start filesystem watcher for hot-reloading agents."""
-        handler = _AgentEventHandler(self)
+        handler = self._watch_handler = _AgentEventHandler(self)
         self._observer = Observer()
         self._observer.schedule(handler, str(AGENTS_DIR), recursive=False)
         self._observer.start()
 
-    def _load_agents(self) -> None:
-        """(Re)load agent modules and rebuild the registry."""
-        self.registry.clear()
-        modules = {}
-        for path in AGENTS_DIR.glob("*.py"):
-            if path.name == "__init__.py":
-                continue
-            module_name = f"cognition_lattice.agents.{path.stem}"
-            if module_name in sys.modules:
-                module = importlib.reload(sys.modules[module_name])
-            else:
-                module = importlib.import_module(module_name)
-            modules[module_name] = module
-            for obj in module.__dict__.values():
-                if isinstance(obj, type) and issubclass(obj, BaseAgent) and obj is not BaseAgent:
-                    for intent_type in getattr(obj, "intent_types", []):
-                        self.registry[intent_type] = obj
-        # Remove deleted modules from sys.modules
-        for name in [m for m in sys.modules if m.startswith("cognition_lattice.agents.")]:
-            if name not in modules:
-                sys.modules.pop(name)
+    def _load_agents(self, paths: Optional[Iterable[str]] = None) -> None:
+        """(Re)load agent modules and atomically swap in a new registry.
+
+        With ``paths`` only those files are re-imported, otherwise every module
+        in ``AGENTS_DIR`` is.  A module that fails to import keeps its previously
+        loaded agents.  The registry being replaced stays in place until the new
+        one is complete, so concurrent dispatches never see a partial registry.
+        """
+        with self._reload_lock:
+            self._reloading.set()
+            start = time.perf_counter()
+            try:
+                if paths is None:
+                    modules: Dict[str, List[Type[BaseAgent]]] = {}
+                    targets = sorted(AGENTS_DIR.glob("*.py"))
+                else:
+                    modules = dict(self._agent_modules)
+                    targets = sorted(Path(p) for p in paths)
+                for path in targets:
+                    if path.name == "__init__.py":
+                        continue
+                    module_name = f"cognition_lattice.agents.{path.stem}"
+                    if not path.exists():
+                        modules.pop(module_name, None)
+                        continue
+                    try:
+                        if module_name in sys.modules:
+                            module = importlib.reload(sys.modules[module_name])
+                        else:
+                            module = importlib.import_module(module_name)
+                    except Exception:
+                        logging.exception("Failed to load agent module %s", module_name)
+                        if module_name in self._agent_modules:
+                            modules[module_name] = self._agent_modules[module_name]
+                        continue
+                    modules[module_name] = [
+                        obj for obj in module.__dict__.values()
+                        if isinstance(obj, type) and issubclass(obj, BaseAgent) and obj is not BaseAgent
+                    ]
+                registry: Dict[str, Type[BaseAgent]] = {}
+                for module_name in sorted(modules):
+                    for agent_cls in modules[module_name]:
+                        for intent_type in getattr(agent_cls, "intent_types", []):
+                            registry[intent_type] = agent_cls
+                if self._pool is None or self._pool.mode != "process":
+                    for agent_cls in set(registry.values()):
+                        try:
+                            self.lifecycle.warm(agent_cls)
+                        except Exception:
+                            logging.exception("Warmup of %s failed", agent_cls.__name__)
+                self._agent_modules = modules
+                self.registry = registry
+                # Hand off pooled instances of replaced classes
+                self.lifecycle.retain(registry.values())
+                if self._pool is not None:
+                    self._pool.recycle()
+                # Remove deleted modules from sys.modules
+                for name in [m for m in sys.modules if m.startswith("cognition_lattice.agents.")]:
+                    if name not in modules:
+                        sys.modules.pop(name)
+            finally:
+                agent_reload_duration.observe(time.perf_counter() - start)
+                self._reloading.clear()
+
+    def _missing_agent(self, intent_type: str) -> Dict[str, Any]:
+        if self._reloading.is_set():
+            agent_reload_dispatch_failures.labels(intent_type=intent_type).inc()
+        return {"status": "error", "message": f"No agent for intent {intent_type}"}
 
     def dispatch(self, intent: Dict[str, Any]) -> Dict[str, Any]:
         intent_type = intent.get("intent")
         agent_cls = self.registry.get(intent_type)
         if not agent_cls:
-            return {"status": "error", "message": f"No agent for intent {intent_type}"}
-        agent = agent_cls()
+            return self._missing_agent(intent_type)
         try:
-            result = agent.execute(intent)
-            if result.get("status") == "error":
-                intent_failure.labels(agent=agent_cls.__name__).inc()
-            else:
-                intent_success.labels(agent=agent_cls.__name__).inc()
-            return result
+            result = run_agent(agent_cls, intent, self.lifecycle)
         except Exception as exc:
+            result = {"status": "error", "message": str(exc)}
+        self._record_agent_result(agent_cls, result)
+        return result
+
+    @staticmethod
+    def _record_agent_result(agent_cls: Type[BaseAgent], result: Dict[str, Any]) -> None:
+        if result.get("status") == "error":
             intent_failure.labels(agent=agent_cls.__name__).inc()
-            return {"status": "error", "message": str(exc)}
+        else:
+            intent_success.labels(agent=agent_cls.__name__).inc()
+
+    def handle(self, intent: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate and dispatch a single intent inline, returning its response."""
+        intent_type = intent.get("intent", "unknown")
+        intents_received.labels(intent_type=intent_type).inc()
+        try:
+            validate_intent(intent)
+            with intent_duration.labels(intent_type=intent_type).time():
+                result = self.dispatch(intent)
+            intents_success.labels(intent_type=intent_type).inc()
+        except ValidationError as exc:
+            result = {"status": "error", "message": f"Validation error: {exc}"}
+            intents_failure.labels(intent_type=intent_type).inc()
+        except Exception as exc:
+            result = {"status": "error", "message": str(exc)}
+            intents_failure.labels(intent_type=intent_type).inc()
+        return result
+
+    def submit(self, intent: Dict[str, Any]) -> Future:
+        """Validate ``intent`` and hand its execution to the worker pool.
+
+        The response is published and the intent acknowledged once the agent
+        finishes.  The returned future resolves to the published response.
+        Without a worker pool the intent is handled inline.
+        """
+        done: Future = Future()
+        if self._pool is None:
+            self._complete(intent, self.handle(intent), done)
+            return done
+        intent_type = intent.get("intent", "unknown")
+        intents_received.labels(intent_type=intent_type).inc()
+        try:
+            validate_intent(intent)
+        except ValidationError as exc:
+            intents_failure.labels(intent_type=intent_type).inc()
+            self._complete(intent, {"status": "error", "message": f"Validation error: {exc}"}, done)
+            return done
+        except Exception as exc:
+            intents_failure.labels(intent_type=intent_type).inc()
+            self._complete(intent, {"status": "error", "message": str(exc)}, done)
+            return done
+        agent_cls = self.registry.get(intent_type)
+        if not agent_cls:
+            intents_success.labels(intent_type=intent_type).inc()
+            self._complete(intent, self._missing_agent(intent_type), done)
+            return done
+        start = time.perf_counter()
+        if self._pool.mode == "process":
+            # instances live in the worker processes, see _worker_lifecycle
+            future = self._pool.submit(run_agent, agent_cls, intent)
+        elif self._pool.mode == "asyncio":
+            future = self._pool.submit(run_agent_async, agent_cls, intent, self.lifecycle)
+        else:
+            future = self._pool.submit(run_agent, agent_cls, intent, self.lifecycle)
+
+        def _on_done(fut: Future) -> None:
+            try:
+                try:
+                    result = fut.result()
+                except Exception as exc:
+                    result = {"status": "error", "message": str(exc)}
+                intent_duration.labels(intent_type=intent_type).observe(time.perf_counter() - start)
+                self._record_agent_result(agent_cls, result)
+                intents_success.labels(intent_type=intent_type).inc()
+                self._complete(intent, result, done)
+            except Exception as exc:
+                # the pool would only log this and leave ``done`` pending forever
+                logging.exception("Completing intent %s failed", intent.get("intent_id"))
+                if not done.done():
+                    done.set_exception(exc)
+
+        future.add_done_callback(_on_done)
+        return done
+
+    def submit_batch(self, intents: List[Dict[str, Any]]) -> Future:
+        """Validate intents of one type and execute them in a single agent call.
+
+        Intents failing validation are answered individually; the rest go to
+        the agent's ``execute_batch``.  The returned future resolves to the
+        responses in the same order as ``intents``.
+        """
+        done: Future = Future()
+        intent_type = intents[0].get("intent", "unknown")
+        intents_received.labels(intent_type=intent_type).inc(len(intents))
+        responses: List[Optional[Dict[str, Any]]] = [None] * len(intents)
+        valid: List[int] = []
+        for index, intent in enumerate(intents):
+            try:
+                validate_intent(intent)
+                valid.append(index)
+            except ValidationError as exc:
+                responses[index] = {"status": "error", "message": f"Validation error: {exc}"}
+            except Exception as exc:
+                responses[index] = {"status": "error", "message": str(exc)}
+        if len(valid) < len(intents):
+            intents_failure.labels(intent_type=intent_type).inc(len(intents) - len(valid))
+        agent_cls = self.registry.get(intent_type)
+        if not valid or not agent_cls:
+            for index in valid:
+                responses[index] = self._missing_agent(intent_type)
+            if valid:
+                intents_success.labels(intent_type=intent_type).inc(len(valid))
+            self._complete_batch(intents, responses, done)
+            return done
+        batch = [intents[index] for index in valid]
+        intent_batch_size.labels(intent_type=intent_type).observe(len(batch))
+        start = time.perf_counter()
+
+        def _on_done(fut: Future) -> None:
+            try:
+                try:
+                    results = fut.result()
+                except Exception as exc:
+                    results = [{"status": "error", "message": str(exc)}] * len(batch)
+                elapsed = time.perf_counter() - start
+                histogram = intent_duration.labels(intent_type=intent_type)
+                failed = 0
+                for index, result in zip(valid, results):
+                    histogram.observe(elapsed)
+                    failed += result.get("status") == "error"
+                    responses[index] = result
+                if failed:
+                    intent_failure.labels(agent=agent_cls.__name__).inc(failed)
+                if failed < len(batch):
+                    intent_success.labels(agent=agent_cls.__name__).inc(len(batch) - failed)
+                intents_success.labels(intent_type=intent_type).inc(len(batch))
+                self._complete_batch(intents, responses, done)
+            except Exception as exc:
+                logging.exception("Completing batch of %d %s intents failed", len(intents), intent_type)
+                if not done.done():
+                    done.set_exception(exc)
+
+        if self._pool is None:
+            future: Future = Future()
+            try:
+                future.set_result(run_agent_batch(agent_cls, batch, self.lifecycle))
+            except Exception as exc:
+                future.set_exception(exc)
+        elif self._pool.mode == "process":
+            future = self._pool.submit(run_agent_batch, agent_cls, batch)
+        elif self._pool.mode == "asyncio":
+            future = self._pool.submit(run_agent_batch_async, agent_cls, batch, self.lifecycle)
+        else:
+            future = self._pool.submit(run_agent_batch, agent_cls, batch, self.lifecycle)
+        future.add_done_callback(_on_done)
+        return done
+
+    def _complete_batch(
+        self,
+        intents: List[Dict[str, Any]],
+        responses: List[Optional[Dict[str, Any]]],
+        done: Future,
+    ) -> None:
+        published = []
+        for intent, result in zip(intents, responses):
+            if 'intent_id' not in result and 'intent_id' in intent:
+                result = {**result, 'intent_id': intent['intent_id']}
+            published.append(result)
+        messaging.publish_responses(published)
+        for intent in intents:
+            messaging.acknowledge_intent(intent)
+        done.set_result(published)
+
+    def _complete(self, intent: Dict[str, Any], result: Dict[str, Any], done: Optional[Future] = None) -> None:
+        if 'intent_id' not in result and 'intent_id' in intent:
+            result['intent_id'] = intent['intent_id']
+        messaging.publish_response(result)
+        messaging.acknowledge_intent(intent)
+        if done is not None:
+            done.set_result(result)
 
     def loop(self) -> None:
         try:
             while True:
-                for intent in messaging.receive_intents(timeout=0.1):
-                    intent_type = intent.get("intent", "unknown")
-                    intents_received.labels(intent_type=intent_type).inc()
-                    try:
-                        validate_intent(intent)
-                        with intent_duration.labels(intent_type=intent_type).time():
-                            result = self.dispatch(intent)
-                        intents_success.labels(intent_type=intent_type).inc()
-                    except ValidationError as exc:
-                        result = {"status": "error", "message": f"Validation error: {exc}"}
-                        intents_failure.labels(intent_type=intent_type).inc()
-                    except Exception as exc:
-                        result = {"status": "error", "message": str(exc)}
-                        intents_failure.labels(intent_type=intent_type).inc()
-                    if 'intent_id' not in result and 'intent_id' in intent:
-                        result['intent_id'] = intent['intent_id']
-                    messaging.publish_response(result)
-                    messaging.acknowledge_intent(intent)
-                time.sleep(0.1)
+                if self.batch_size > 1:
+                    intents = messaging.receive_intent_batch(self.batch_size, timeout=RECEIVE_TIMEOUT)
+                    for batch in group_by_intent_type(intents):
+                        self.submit_batch(batch)
+                    continue
+                for intent in messaging.receive_intents(timeout=RECEIVE_TIMEOUT):
+                    self.submit(intent)
         finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+            self.lifecycle.shutdown()
             if hasattr(self, "_observer"):
                 self._observer.stop()
                 self._observer.join()
+                self._watch_handler.cancel()
 
 class _AgentEventHandler(FileSystemEventHandler):
-    """Watch agent directory for changes and reload on modifications."""
+    """Watch agent directory and reload changed modules once edits settle.
+
+    An editor save usually fires several events; they are collected until
+    ``debounce`` seconds pass without a new one and then reloaded together.
+    """
 
-    def __init__(self, core: "AgentCore") -> None:
+    # Newer watchdog releases also report opened/closed events; reloading on
+    # those would re-read the agent files and trigger yet another reload.
+    RELOAD_EVENTS = ("created", "modified", "deleted", "moved")
+
+    def __init__(self, core: "AgentCore", debounce: float = 0.25) -> None:
         self.core = core
+        self.debounce = debounce
+        self._pending: Set[str] = set()
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
 
     def on_any_event(self, event) -> None:
-        if event.src_path.endswith(".py"):
-            self.core._load_agents()
+        if event.event_type not in self.RELOAD_EVENTS:
+            return
+        paths = [
+            p for p in (event.src_path, getattr(event, "dest_path", ""))
+            if p and p.endswith(".py")
+        ]
+        if not paths:
+            return
+        with self._lock:
+            self._pending.update(paths)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self._flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush(self) -> None:
+        with self._lock:
+            paths, self._pending = self._pending, set()
+            self._timer = None
+        if paths:
+            self.core._load_agents(paths)
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._pending.clear()
 
 
 @dataclass
 class AgentContext:
-    """Context provided to async agents."""
+    """Context provided to async agents.
+
+    Agents offloaded to an executor get ``mesh=None``: the bus belongs to the
+    mesh's event loop and cannot be used from another thread or process.
+    """
 
-    mesh: "AgentMesh"
+    mesh: Optional["AgentMesh"]
     manifest: Dict[str, Any]
 
 
+def _run_offloaded(module_name: str, func_name: str, message: Message, manifest: Dict[str, Any]) -> Any:
+    """Run a mesh agent inside an executor worker, importing it by name."""
+    func = getattr(importlib.import_module(module_name), func_name)
+    result = func(message, AgentContext(None, manifest))
+    if inspect.isawaitable(result):
+        result = asyncio.run(result)
+    return result
+
+
 class AgentMesh:
-    """Simple async agent orchestrator using MessageBus."""
+    """Simple async agent orchestrator using MessageBus.
+
+    Each manifest handles up to ``concurrency`` messages at once (default
+    ``capabilities.cpu_threads``, else 1).  Agents that declare an
+    ``executor`` of ``"cpu"`` or ``"io"`` (in the manifest's capabilities or
+    as a function attribute) run on the ResourceManager's process or thread
+    pool instead of the mesh's event loop.
+    """
 
-    def __init__(self, manifest_dir: str) -> None:
+    def __init__(
+        self,
+        manifest_dir: str,
+        resource_manager: Optional[ResourceManager] = None,
+        message_bus: Optional[MessageBus] = None,
+        shard: Optional[Tuple[int, int]] = None,
+    ) -> None:
         self.manifest_dir = Path(manifest_dir)
-        self.message_bus = MessageBus()
+        self.message_bus = message_bus or MessageBus()
+        self.shard = shard
         self.manifests: List[Dict[str, Any]] = []
         self.tasks: List[asyncio.Task] = []
+        self.resource_manager = resource_manager
+        self._owns_resource_manager = False
         self._load_manifests()
 
     def _load_manifests(self) -> None:
         if not self.manifest_dir.exists():
             logging.warning("Manifest directory %s does not exist", self.manifest_dir)
             return
-        for path in self.manifest_dir.glob("*.json"):
+        for position, path in enumerate(sorted(self.manifest_dir.glob("*.json"))):
+            if self.shard is not None and position % self.shard[1] != self.shard[0]:
+                continue
             try:
                 data = json.loads(path.read_text())
                 self.manifests.append(data)
             except Exception as exc:
                 logging.error("Failed to load manifest %s: %s", path, exc)
 
+    @staticmethod
+    def _concurrency(manifest: Dict[str, Any]) -> int:
+        capabilities = manifest.get("capabilities", {})
+        return max(1, int(manifest.get("concurrency") or capabilities.get("cpu_threads") or 1))
+
     async def start(self) -> None:
         for manifest in self.manifests:
             module = importlib.import_module(manifest["module"])
             func: Callable[[Message, AgentContext], Any] = getattr(module, manifest.get("function", "main"))
+            executor = manifest.get("capabilities", {}).get("executor") or getattr(func, "executor", None)
+            if executor is not None:
+                if self.resource_manager is None:
+                    self.resource_manager = ResourceManager()
+                    self._owns_resource_manager = True
+                await self.resource_manager.initialize()
+                func = await self._offloaded(manifest, func, executor)
             context = AgentContext(self, manifest)
             task = asyncio.create_task(self._run_agent(func, manifest, context))
             self.tasks.append(task)
 
+    async def _offloaded(self, manifest: Dict[str, Any], func: Callable, executor_type: str) -> Callable:
+        executor = await self.resource_manager.get_executor(executor_type)
+        module_name, func_name = manifest["module"], manifest.get("function", "main")
+
+        async def run(message: Message, context: AgentContext) -> Any:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                executor, _run_offloaded, module_name, func_name, message, manifest
+            )
+
+        return run
+
+    async def _handle(self, func: Callable[[Message, AgentContext], Any], manifest: Dict[str, Any],
+                      context: AgentContext, message: Message) -> None:
+        try:
+            result = await func(message, context)
+            if isinstance(result, Message):
+                await self.message_bus.publish(f"response.{message.message_id}", result)
+        except Exception:
+            logging.exception("Agent %s failed", manifest.get("id"))
+
     async def _run_agent(self, func: Callable[[Message, AgentContext], Any], manifest: Dict[str, Any], context: AgentContext) -> None:
         patterns = manifest.get("subscriptions", [])
-        async for message in self.message_bus.subscribe(patterns):
-            try:
-                result = await func(message, context)
-                if isinstance(result, Message):
-                    await self.message_bus.publish(f"response.{message.message_id}", result)
-            except Exception:
-                logging.exception("Agent %s failed", manifest.get("id"))
+        config = manifest.get("config", {})
+        subscription = self.message_bus.subscribe(
+            patterns,
+            maxsize=config.get("queue_size", 0),
+            overflow=config.get("overflow", "block"),
+            name=manifest.get("id"),
+        )
+        slots = asyncio.Semaphore(self._concurrency(manifest))
+        running: Set[asyncio.Task] = set()
+
+        def finished(task: asyncio.Task) -> None:
+            running.discard(task)
+            slots.release()
+
+        try:
+            async for message in subscription:
+                # stop taking messages while every slot is busy so a bounded
+                # subscriber queue applies back-pressure
+                await slots.acquire()
+                task = asyncio.create_task(self._handle(func, manifest, context, message))
+                running.add(task)
+                task.add_done_callback(finished)
+        finally:
+            for task in list(running):
+                task.cancel()
 
     async def stop(self) -> None:
         for task in list(self.tasks):
@@ -178,6 +649,72 @@ class AgentMesh:
             except asyncio.CancelledError:
                 pass
         await self.message_bus.close()
+        if self._owns_resource_manager:
+            await self.resource_manager.cleanup()
+            self.resource_manager = None
+            self._owns_resource_manager = False
+
+async def _serve_mesh_shard(manifest_dir: str, socket_path: str, index: int, count: int) -> None:
+    bus = await RemoteMessageBus(socket_path).connect()
+    mesh = AgentMesh(manifest_dir, message_bus=bus, shard=(index, count))
+    await mesh.start()
+    # let every agent task register its subscriptions before reporting ready
+    await asyncio.sleep(0)
+    bus.ready()
+    await bus.disconnected.wait()
+    await mesh.stop()
+
+
+def _mesh_worker(manifest_dir: str, socket_path: str, index: int, count: int) -> None:
+    asyncio.run(_serve_mesh_shard(manifest_dir, socket_path, index, count))
+
+
+class MeshSupervisor:
+    """Split a manifest directory across ``workers`` AgentMesh processes.
+
+    The supervisor runs the BusHub the workers connect to; :meth:`connect`
+    returns a bus that reaches every worker's agents.  Workers exit when the
+    hub closes.
+    """
+
+    def __init__(self, manifest_dir: str, workers: Optional[int] = None, socket_path: Optional[str] = None) -> None:
+        self.manifest_dir = str(manifest_dir)
+        self.workers = workers or os.cpu_count() or 1
+        self._tmpdir = None
+        if socket_path is None:
+            self._tmpdir = tempfile.TemporaryDirectory(prefix="mesh-")
+            socket_path = os.path.join(self._tmpdir.name, "bus.sock")
+        self.socket_path = socket_path
+        self.hub = BusHub(socket_path)
+        self.processes: List[multiprocessing.Process] = []
+
+    async def start(self, timeout: float = 30.0) -> None:
+        await self.hub.start()
+        ctx = multiprocessing.get_context("spawn")
+        for index in range(self.workers):
+            process = ctx.Process(
+                target=_mesh_worker,
+                args=(self.manifest_dir, self.socket_path, index, self.workers),
+                daemon=True,
+            )
+            process.start()
+            self.processes.append(process)
+        await self.hub.wait_ready(self.workers, timeout)
+
+    async def connect(self) -> RemoteMessageBus:
+        return await RemoteMessageBus(self.socket_path).connect()
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        await self.hub.close()
+        for process in self.processes:
+            await asyncio.to_thread(process.join, timeout)
+            if process.is_alive():
+                process.terminate()
+        self.processes.clear()
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+            self._tmpdir = None
+
 
 if __name__ == "__main__":
     AgentCore().loop()
@@ -0,0 +1,151 @@
+"""Keep long-lived, pooled agent instances per BaseAgent subclass."""
+
+import asyncio
+import logging
+import threading
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Type
+
+from cognition_lattice.base_agent import BaseAgent
+
+logger = logging.getLogger(__name__)
+
+
+class _InstancePool:
+    """Instances of one agent class, created lazily up to ``pool_size``."""
+
+    def __init__(self, agent_cls: Type[BaseAgent]) -> None:
+        self.agent_cls = agent_cls
+        self.size = max(1, int(getattr(agent_cls, "pool_size", 1)))
+        self.shared = bool(getattr(agent_cls, "thread_safe", False))
+        self.retired = False
+        self._instances: List[BaseAgent] = []
+        self._idle: List[BaseAgent] = []
+        self._leases: Dict[int, int] = {}
+        self._next = 0
+        self._cond = threading.Condition()
+
+    def _create(self) -> BaseAgent:
+        agent = self.agent_cls()
+        agent.setup()
+        self._instances.append(agent)
+        self._leases[id(agent)] = 0
+        return agent
+
+    def warm(self) -> None:
+        with self._cond:
+            while len(self._instances) < self.size:
+                self._idle.append(self._create())
+
+    def checkout(self) -> BaseAgent:
+        with self._cond:
+            if self.shared and not self.retired:
+                if len(self._instances) < self.size:
+                    agent = self._create()
+                else:
+                    agent = self._instances[self._next % len(self._instances)]
+                    self._next += 1
+            else:
+                while not self.retired and not self._idle and len(self._instances) >= self.size:
+                    self._cond.wait()
+                if self.retired:
+                    # A dispatch raced a hot-reload: serve it with a throwaway
+                    # instance that is torn down on release.
+                    agent = self._create()
+                else:
+                    agent = self._idle.pop() if self._idle else self._create()
+            self._leases[id(agent)] += 1
+            return agent
+
+    def release(self, agent: BaseAgent) -> None:
+        with self._cond:
+            self._leases[id(agent)] -= 1
+            idle = self._leases[id(agent)] == 0
+            if not self.retired:
+                if not self.shared:
+                    self._idle.append(agent)
+                    self._cond.notify()
+                return
+            self._cond.notify_all()
+        if idle:
+            _teardown(agent)
+
+    def retire(self) -> None:
+        """Stop handing out instances and tear down those not in use."""
+        with self._cond:
+            self.retired = True
+            unused = [a for a in self._instances if self._leases[id(a)] == 0]
+            self._idle.clear()
+            self._cond.notify_all()
+        for agent in unused:
+            _teardown(agent)
+
+
+def _teardown(agent: BaseAgent) -> None:
+    try:
+        agent.teardown()
+    except Exception:
+        logger.exception("Teardown of %s failed", type(agent).__name__)
+
+
+class AgentLifecycleManager:
+    """Hand out warm agent instances and retire them on hot-reload.
+
+    When a reload replaces an agent class, the old class' idle instances are
+    torn down straight away; instances still executing an intent finish on the
+    old code and are torn down when released.
+    """
+
+    def __init__(self) -> None:
+        self._pools: Dict[Type[BaseAgent], _InstancePool] = {}
+        self._retired: "weakref.WeakSet[Type[BaseAgent]]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def _pool(self, agent_cls: Type[BaseAgent]) -> _InstancePool:
+        with self._lock:
+            pool = self._pools.get(agent_cls)
+            if pool is None:
+                pool = _InstancePool(agent_cls)
+                if agent_cls in self._retired:
+                    pool.retired = True
+                else:
+                    self._pools[agent_cls] = pool
+            return pool
+
+    def warm(self, agent_cls: Type[BaseAgent]) -> None:
+        """Create and set up all instances of ``agent_cls`` ahead of use."""
+        with self._lock:
+            self._retired.discard(agent_cls)
+        self._pool(agent_cls).warm()
+
+    @contextmanager
+    def acquire(self, agent_cls: Type[BaseAgent]) -> Iterator[BaseAgent]:
+        pool = self._pool(agent_cls)
+        agent = pool.checkout()
+        try:
+            yield agent
+        finally:
+            pool.release(agent)
+
+    @asynccontextmanager
+    async def acquire_async(self, agent_cls: Type[BaseAgent]) -> AsyncIterator[BaseAgent]:
+        pool = self._pool(agent_cls)
+        agent = await asyncio.to_thread(pool.checkout)
+        try:
+            yield agent
+        finally:
+            pool.release(agent)
+
+    def retain(self, agent_classes: Iterable[Type[BaseAgent]]) -> None:
+        """Retire pools for every class not in ``agent_classes``."""
+        keep = set(agent_classes)
+        with self._lock:
+            stale = [cls for cls in self._pools if cls not in keep]
+            pools = [self._pools.pop(cls) for cls in stale]
+            self._retired.update(stale)
+        for pool in pools:
+            pool.retire()
+
+    def shutdown(self) -> None:
+        self.retain(())
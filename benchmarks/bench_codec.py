@@ -0,0 +1,42 @@
+"""Compare encode/decode throughput and payload size of the broker codecs.
+
+Run with ``python -m benchmarks.bench_codec``.
+"""
+
+import time
+
+from sios_messaging.codec import CODECS, decode
+
+INTENTS = {
+    "echo": {"intent": "echo", "args": "hello world", "intent_id": "5f0c6b7e-2f1d-4c57-9a55-0f7f6b2d4e11"},
+    "response": {
+        "status": "ok",
+        "intent_id": "5f0c6b7e-2f1d-4c57-9a55-0f7f6b2d4e11",
+        "result": {"echo": "hello world", "tokens": list(range(32)), "score": 0.9375, "cached": False},
+    },
+}
+
+
+def _rate(fn, arg, seconds: float = 0.5) -> float:
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            fn(arg)
+        count += 100
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    for label, message in INTENTS.items():
+        print(f"{label}:")
+        for name, codec in CODECS.items():
+            payload = codec.encode(message)
+            enc = _rate(codec.encode, message)
+            dec = _rate(decode, payload)
+            print(f"  {name:8} {len(payload):5} bytes  encode {enc:12,.0f}/s  decode {dec:12,.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Measure AgentMesh request throughput as manifests are spread over processes.
+
+Sixteen CPU-bound agents are split across 1, 2, 4, ... worker processes by
+MeshSupervisor (up to the machine's core count) and driven through the
+Unix-socket BusHub.  Run with ``python -m benchmarks.bench_mesh_scaling``.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from agent_core import MeshSupervisor
+
+AGENTS = 16
+WORK = 20_000
+WAVE = 64
+
+
+async def busy_agent(message, context):
+    total = 0
+    for i in range(WORK):
+        total += i * i
+    return message.reply({"total": total})
+
+
+def _write_manifests(directory: Path) -> None:
+    for i in range(AGENTS):
+        (directory / f"busy{i:02}.json").write_text(json.dumps({
+            "id": f"busy{i:02}",
+            "module": "benchmarks.bench_mesh_scaling",
+            "function": "busy_agent",
+            "subscriptions": [f"busy.{i}"],
+        }))
+
+
+async def _throughput(manifest_dir: str, workers: int, seconds: float = 3.0) -> float:
+    supervisor = MeshSupervisor(manifest_dir, workers=workers)
+    await supervisor.start()
+    bus = await supervisor.connect()
+    try:
+        count = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            requests = [(f"busy.{(count + n) % AGENTS}", None) for n in range(WAVE)]
+            await bus.request_many(requests, timeout=30)
+            count += WAVE
+        return count / (time.perf_counter() - start)
+    finally:
+        await bus.close()
+        await supervisor.stop()
+
+
+async def main() -> None:
+    cores = os.cpu_count() or 1
+    counts = [n for n in (1, 2, 4, 8, 16) if n <= cores] or [1]
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_manifests(Path(tmp))
+        baseline = None
+        print(f"{AGENTS} agents, {cores} cores")
+        for workers in counts:
+            rate = await _throughput(tmp, workers)
+            baseline = baseline or rate
+            print(f"{workers:3} workers : {rate:10,.0f} requests/s ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""Measure how quickly an idle consumer picks up a new intent.
+
+Reports p50/p99 latency from ``send_intent`` to the in-memory broker handing
+the intent to a blocked receiver, and from ``send_intent`` to the echo
+response coming back through AgentCore.  Run with
+``python -m benchmarks.bench_pickup_latency``.
+"""
+
+import queue
+import statistics
+import threading
+import time
+
+import agent_core
+import sios_messaging as messaging
+from sios_messaging.inmemory import InMemoryBroker
+
+SAMPLES = 500
+# gap between intents, so the consumer is idle and blocked when each arrives
+IDLE = 0.002
+
+
+def _report(label: str, samples) -> None:
+    cuts = statistics.quantiles(samples, n=100)
+    print(f"{label:<22}: p50 {cuts[49] * 1000:7.3f} ms  p99 {cuts[98] * 1000:7.3f} ms  "
+          f"max {max(samples) * 1000:7.3f} ms")
+
+
+def _broker_wakeup() -> list:
+    broker = InMemoryBroker()
+    received: "queue.Queue[float]" = queue.Queue()
+
+    def consume() -> None:
+        while True:
+            for _ in broker.receive_intents(timeout=30.0):
+                received.put(time.perf_counter())
+
+    threading.Thread(target=consume, daemon=True).start()
+    samples = []
+    for i in range(SAMPLES):
+        time.sleep(IDLE)
+        sent = time.perf_counter()
+        broker.send_intent({"intent": "echo", "intent_id": str(i)})
+        samples.append(received.get(timeout=5.0) - sent)
+    return samples
+
+
+def _agent_core_roundtrip() -> list:
+    messaging._client = InMemoryBroker()
+    core = agent_core.AgentCore()
+    threading.Thread(target=core.loop, daemon=True).start()
+    samples = []
+    for i in range(SAMPLES):
+        time.sleep(IDLE)
+        intent_id = f"latency-{i}"
+        sent = time.perf_counter()
+        messaging.send_intent({"intent": "echo", "args": "x", "intent_id": intent_id})
+        responses = messaging.receive_responses(timeout=5.0)
+        if not any(r.get("intent_id") == intent_id for r in responses):
+            raise RuntimeError(f"no response for {intent_id}")
+        samples.append(time.perf_counter() - sent)
+    return samples
+
+
+def main() -> None:
+    print(f"{SAMPLES} intents, {IDLE * 1000:.0f} ms idle between them")
+    _report("broker wake-up", _broker_wakeup())
+    _report("AgentCore round trip", _agent_core_roundtrip())
+
+
+if __name__ == "__main__":
+    main()
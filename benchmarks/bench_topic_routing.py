@@ -0,0 +1,69 @@
+"""Compare topic routing with a linear pattern scan and with the TopicTrie.
+
+Publishes to a bus holding 10k wildcard subscriptions.  Run with
+``python -m benchmarks.bench_topic_routing``.
+"""
+
+import asyncio
+import time
+
+from messaging_bus import Message, MessageBus, MessageType, _Subscription
+
+SUBSCRIPTIONS = 10_000
+
+
+def _linear_match(pattern: str, topic: str) -> bool:
+    # the matcher MessageBus used before the trie
+    pattern_parts = pattern.split('.')
+    topic_parts = topic.split('.')
+    if len(pattern_parts) != len(topic_parts):
+        return False
+    return all(p == '*' or p == t for p, t in zip(pattern_parts, topic_parts))
+
+
+def _rate(fn, seconds: float = 1.0) -> float:
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        fn(count)
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+async def _publish_rate(bus: MessageBus, subscriptions, seconds: float = 1.0) -> float:
+    message = Message(type=MessageType.EVENT, source="bench")
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        await bus.publish(f"svc{count % SUBSCRIPTIONS}.event", message)
+        count += 1
+        if count % 1000 == 0:
+            for subscription in subscriptions:
+                # drop the backlog from the depth gauge, then discard it
+                subscription.close()
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+    return count / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    patterns = [f"svc{i}.*" for i in range(SUBSCRIPTIONS)]
+    bus = MessageBus()
+    subscriptions = [_Subscription("bench") for _ in patterns]
+    for pattern, subscription in zip(patterns, subscriptions):
+        bus._patterns.add(pattern, subscription)
+    pairs = list(zip(patterns, subscriptions))
+
+    linear = _rate(lambda n: [q for p, q in pairs if _linear_match(p, f"svc{n % SUBSCRIPTIONS}.event")], 2.0)
+    trie = _rate(lambda n: bus._patterns.match(f"svc{n % SUBSCRIPTIONS}.event"))
+    publish = await _publish_rate(bus, subscriptions)
+    print(f"{SUBSCRIPTIONS:,} pattern subscriptions")
+    print(f"linear pattern scan : {linear:12,.0f} lookups/s")
+    print(f"topic trie          : {trie:12,.0f} lookups/s ({trie / linear:.0f}x)")
+    print(f"MessageBus.publish  : {publish:12,.0f} messages/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
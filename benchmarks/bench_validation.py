@@ -0,0 +1,39 @@
+"""Compare intent validation throughput before and after validator caching.
+
+Run with ``python -m benchmarks.bench_validation``.
+"""
+
+import time
+
+from jsonschema import validate
+
+import validation
+
+INTENT = {"intent": "echo", "args": "hello world", "intent_id": "bench-1"}
+
+
+def _rate(fn, seconds: float = 1.0) -> float:
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            fn(INTENT)
+        count += 100
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    schema = validation._load_schema("echo")
+    before = _rate(lambda intent: validate(instance=intent, schema=schema))
+    validation.preload_schemas()
+    compiled = validation.validators.validator_for(schema)(schema)
+    compiled_only = _rate(compiled.validate)
+    after = _rate(validation.validate_intent)
+    print(f"jsonschema.validate per call : {before:12,.0f} validations/s")
+    print(f"compiled validator           : {compiled_only:12,.0f} validations/s")
+    print(f"validate_intent (fast path)  : {after:12,.0f} validations/s ({after / before:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
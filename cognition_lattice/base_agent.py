@@ -1,10 +1,39 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 class BaseAgent(ABC):
-    """Base class for all executor agents."""
+    """Base class for all executor agents.
+
+    AgentCore keeps agent instances alive between intents.  ``pool_size`` caps
+    how many instances of a class exist at once, and ``thread_safe`` declares
+    that one instance may run several intents concurrently, in which case
+    instances are shared rather than checked out exclusively.
+    """
+
+    pool_size: int = 1
+    thread_safe: bool = False
+
+    def setup(self) -> None:
+        """Warm up expensive resources (models, connections) once per instance."""
+
+    def teardown(self) -> None:
+        """Release resources acquired in :meth:`setup`."""
 
     @abstractmethod
     def execute(self, intent: Dict[str, Any]) -> Dict[str, Any]:
         """Execute intent and return result."""
         raise NotImplementedError
+
+    def execute_batch(self, intents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Execute several intents of this agent's type in one call.
+
+        Must return one result per intent, in the same order.  The default runs
+        :meth:`execute` for each intent; override it for vectorised work.
+        """
+        results: List[Dict[str, Any]] = []
+        for intent in intents:
+            try:
+                results.append(self.execute(intent))
+            except Exception as exc:
+                results.append({"status": "error", "message": str(exc)})
+        return results
@@ -0,0 +1,145 @@
+"""Read-through LRU/TTL cache in front of any memory backend."""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional
+
+from metrics import memory_cache_evictions, memory_cache_hits, memory_cache_misses
+
+from .memory_interface import MemoryClient
+
+
+def _pickled_size(value: Any) -> int:
+    return len(pickle.dumps(value))
+
+
+class _Entry:
+    __slots__ = ('value', 'expires', 'size')
+
+    def __init__(self, value: Any, expires: float, size: int) -> None:
+        self.value = value
+        self.expires = expires
+        self.size = size
+
+
+class CachedMemory(MemoryClient):
+    """Cache ``get`` results of another MemoryClient in least-recently-used order.
+
+    The cache holds at most ``max_entries`` values and, when ``max_bytes`` is
+    set, at most that many bytes as measured by ``sizeof`` (the pickled size
+    by default).  Entries expire ``ttl`` seconds after they are cached unless
+    ``put`` gives its own ``ttl``; ``None`` keeps them until evicted.  With
+    ``negative_ttl`` set, keys the backend does not have are remembered as
+    missing for that long.  Writes go straight to the backend and drop the
+    cached entry.  Hits, misses and evictions are counted under ``name``.
+    """
+
+    def __init__(
+        self,
+        backend: MemoryClient,
+        max_entries: int = 10_000,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        negative_ttl: Optional[float] = None,
+        sizeof: Callable[[Any], int] = _pickled_size,
+        name: str = "memory",
+    ) -> None:
+        self.backend = backend
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._sizeof = sizeof
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # per-key ttl overrides, bounded like the cache itself
+        self._ttls: "OrderedDict[str, float]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # bumped after every write so a read that raced it cannot cache the old value
+        self._version = 0
+        self._hits = memory_cache_hits.labels(cache=name)
+        self._misses = memory_cache_misses.labels(cache=name)
+        self._evictions = memory_cache_evictions.labels(cache=name)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _store(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires = time.monotonic() + ttl if ttl is not None else 0.0
+        self._drop(key)
+        self._entries[key] = _Entry(value, expires, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self._evictions.inc()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not entry.expires or entry.expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._hits.inc()
+                    return entry.value
+                self._drop(key)
+            version = self._version
+        self._misses.inc()
+        value = self.backend.get(key)
+        if value is None and self.negative_ttl is None:
+            return None
+        ttl = self.negative_ttl if value is None else self._ttls.get(key, self.ttl)
+        with self._lock:
+            if version == self._version:
+                self._store(key, value, ttl)
+        return value
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Write ``value`` to the backend; ``ttl`` overrides the default when it is next cached."""
+        self.backend.put(key, value)
+        with self._lock:
+            self._version += 1
+            self._drop(key)
+            if ttl is None:
+                self._ttls.pop(key, None)
+            else:
+                self._ttls[key] = ttl
+                self._ttls.move_to_end(key)
+                if len(self._ttls) > self.max_entries:
+                    self._ttls.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self.backend.delete(key)
+        with self._lock:
+            self._version += 1
+            self._drop(key)
+            self._ttls.pop(key, None)
+
+    def search(self, query: str, **kwargs: Any) -> Iterable[Any]:
+        return self.backend.search(query, **kwargs)
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop ``key`` from the cache, or every entry when no key is given."""
+        with self._lock:
+            self._version += 1
+            if key is None:
+                self._entries.clear()
+                self._bytes = 0
+            else:
+                self._drop(key)
@@ -1,35 +1,341 @@
 """Simple key-value memory using SQLite."""
 
+import logging
 import sqlite3
 import pickle
-from typing import Any, Iterable
+import threading
+from contextlib import nullcontext
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
 
 from .memory_interface import MemoryClient
 
+# Keys bound per statement in the *_many helpers (SQLite's variable limit is 999+).
+_CHUNK = 500
+
+# Marks a buffered delete in the write-behind buffer.
+_DELETED = object()
+_MISSING = object()
+
+# Full-text indexes over ``kv.key``: trigrams serve substring search, unicode61 tokens serve token search.
+_FTS_TABLES = {"kv_trigram": "trigram", "kv_tokens": "unicode61"}
+
+# Shortest query the trigram index can answer; shorter substrings fall back to a scan.
+_TRIGRAM = 3
+
+logger = logging.getLogger(__name__)
+
 
 class KeyValueMemory(MemoryClient):
-    def __init__(self, db_path: str) -> None:
-        self.conn = sqlite3.connect(db_path)
-        self.conn.execute(
-            "CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value BLOB)"
-        )
+    """Pickled values in a SQLite table.
+
+    The database runs in WAL mode with ``synchronous`` (default ``NORMAL``),
+    so a commit does not wait for an fsync of the main database file.  Each
+    thread gets its own connection; a ``:memory:`` database has a single
+    connection shared under a lock.  With ``write_behind`` > 0, puts and
+    deletes are buffered and written in one transaction once that many are
+    pending or ``flush_interval`` seconds after the first one; reads through
+    this instance see buffered writes immediately.  Values are pickled when
+    they are put, so an unpicklable value fails the ``put`` itself.
+
+    ``search`` matches keys by prefix through the primary-key index, or by
+    substring or token through FTS5 indexes kept in sync by triggers when
+    ``fts`` is true.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        synchronous: str = "NORMAL",
+        write_behind: int = 0,
+        flush_interval: float = 1.0,
+        fts: bool = False,
+    ) -> None:
+        self.db_path = db_path
+        self.synchronous = synchronous
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.fts = fts
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._shared: Optional[sqlite3.Connection] = None
+        self._conn_lock: Any = nullcontext()
+        if db_path == ":memory:":
+            # separate connections would each get their own in-memory database
+            self._shared = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn_lock = threading.RLock()
+        # key -> pickled value or _DELETED; _flushing is the batch being written
+        self._buffer: Dict[str, Any] = {}
+        self._flushing: Dict[str, Any] = {}
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = threading.Event()
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if write_behind:
+            self._flusher = threading.Thread(target=self._run_flusher, name="kv_flusher", daemon=True)
+            self._flusher.start()
+        with self._conn_lock:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value BLOB)"
+            )
+        if fts:
+            self._create_fts()
+
+    def _create_fts(self) -> None:
+        with self._conn_lock:
+            self._create_fts_tables(self.conn)
+
+    @staticmethod
+    def _create_fts_tables(conn: sqlite3.Connection) -> None:
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+        with conn:
+            for table, tokenizer in _FTS_TABLES.items():
+                if table in existing:
+                    continue
+                conn.execute(
+                    f"CREATE VIRTUAL TABLE {table} USING fts5("
+                    f"key, content='kv', content_rowid='rowid', tokenize='{tokenizer}')"
+                )
+                # keys never change in place (writes upsert the value), so insert/delete suffice
+                conn.execute(
+                    f"CREATE TRIGGER {table}_ai AFTER INSERT ON kv BEGIN "
+                    f"INSERT INTO {table}(rowid, key) VALUES (new.rowid, new.key); END"
+                )
+                conn.execute(
+                    f"CREATE TRIGGER {table}_ad AFTER DELETE ON kv BEGIN "
+                    f"INSERT INTO {table}({table}, rowid, key) VALUES ('delete', old.rowid, old.key); END"
+                )
+                conn.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """The calling thread's connection (the shared one for ``:memory:``)."""
+        if self._shared is not None:
+            return self._shared
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={self.synchronous}")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _write(self, puts: List[Tuple[str, bytes]], deletes: List[str]) -> None:
+        with self._conn_lock:
+            conn = self.conn
+            with conn:
+                if puts:
+                    conn.executemany(
+                        # an upsert keeps the rowid, so FTS triggers need not fire on updates
+                        "INSERT INTO kv (key, value) VALUES (?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+                        ((key, sqlite3.Binary(blob)) for key, blob in puts),
+                    )
+                if deletes:
+                    conn.executemany("DELETE FROM kv WHERE key=?", ((key,) for key in deletes))
+
+    def _run_flusher(self) -> None:
+        while True:
+            self._pending.wait()
+            if self._closed.wait(self.flush_interval):
+                return
+            try:
+                self.flush()
+            except Exception:
+                # the batch went back into the buffer and is retried next interval
+                logger.exception("Write-behind flush to %s failed", self.db_path)
+
+    def _buffered(self, items: Iterable[Tuple[str, Any]]) -> None:
+        with self._buffer_lock:
+            for key, value in items:
+                self._buffer[key] = value
+            full = len(self._buffer) >= self.write_behind
+            if self._buffer:
+                self._pending.set()
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write every buffered put and delete in one transaction.
+
+        The batch stays readable until it is committed; if the write fails
+        it is put back in the buffer, under any newer writes to its keys.
+        """
+        with self._flush_lock:
+            with self._buffer_lock:
+                pending, self._buffer = self._buffer, {}
+                self._flushing = pending
+                self._pending.clear()
+            if not pending:
+                return
+            puts = [(k, v) for k, v in pending.items() if v is not _DELETED]
+            deletes = [k for k, v in pending.items() if v is _DELETED]
+            try:
+                self._write(puts, deletes)
+            except BaseException:
+                with self._buffer_lock:
+                    pending.update(self._buffer)
+                    self._buffer = pending
+                    self._pending.set()
+                raise
+            finally:
+                with self._buffer_lock:
+                    self._flushing = {}
+
+    def _lookup(self, keys: List[str]) -> Dict[str, Any]:
+        """Return the buffered or in-flight entries for ``keys``."""
+        if not self.write_behind:
+            return {}
+        with self._buffer_lock:
+            found = {}
+            for key in keys:
+                value = self._buffer.get(key, _MISSING)
+                if value is _MISSING:
+                    value = self._flushing.get(key, _MISSING)
+                if value is not _MISSING:
+                    found[key] = value
+            return found
 
     def put(self, key: str, value: Any) -> None:
-        self.conn.execute(
-            "REPLACE INTO kv (key, value) VALUES (?, ?)", (key, sqlite3.Binary(pickle.dumps(value)))
-        )
-        self.conn.commit()
+        self.put_many([(key, value)])
+
+    def put_many(self, items: Union[Mapping[str, Any], Iterable[Tuple[str, Any]]]) -> None:
+        """Store several values in a single transaction."""
+        pairs = items.items() if isinstance(items, Mapping) else items
+        blobs = [(key, pickle.dumps(value)) for key, value in pairs]
+        if self.write_behind:
+            self._buffered(blobs)
+        else:
+            self._write(blobs, [])
 
     def get(self, key: str) -> Any:
-        cur = self.conn.execute("SELECT value FROM kv WHERE key=?", (key,))
-        row = cur.fetchone()
+        buffered = self._lookup([key])
+        if buffered:
+            value = buffered[key]
+            return None if value is _DELETED else pickle.loads(value)
+        with self._conn_lock:
+            row = self.conn.execute("SELECT value FROM kv WHERE key=?", (key,)).fetchone()
         return pickle.loads(row[0]) if row else None
 
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Return the stored values of ``keys``; missing keys are left out."""
+        keys = list(dict.fromkeys(keys))
+        buffered = self._lookup(keys)
+        found = {k: pickle.loads(v) for k, v in buffered.items() if v is not _DELETED}
+        keys = [k for k in keys if k not in buffered]
+        with self._conn_lock:
+            conn = self.conn
+            for start in range(0, len(keys), _CHUNK):
+                chunk = keys[start:start + _CHUNK]
+                cur = conn.execute(
+                    f"SELECT key, value FROM kv WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                )
+                for key, value in cur:
+                    found[key] = pickle.loads(value)
+        return found
+
     def delete(self, key: str) -> None:
-        self.conn.execute("DELETE FROM kv WHERE key=?", (key,))
-        self.conn.commit()
+        self.delete_many([key])
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        """Delete several keys in a single transaction."""
+        keys = list(keys)
+        if self.write_behind:
+            self._buffered((key, _DELETED) for key in keys)
+        else:
+            self._write([], keys)
+
+    def search(
+        self,
+        query: str,
+        mode: str = "substring",
+        limit: Optional[int] = None,
+        offset: int = 0,
+        page_size: int = 500,
+    ) -> Iterator[Any]:
+        """Yield the values whose keys match ``query``, in key order.
+
+        ``mode`` is ``prefix`` (case-sensitive, served by the primary-key
+        index), ``substring`` (case-insensitive; uses the trigram index when
+        ``fts`` is enabled and the query has at least three characters, and
+        scans otherwise) or ``token`` (whole words of the key, requires
+        ``fts``).  Rows are read from the cursor ``page_size`` at a time and
+        unpickled as they are yielded.
+        """
+        self.flush()
+        paging = (-1 if limit is None else limit, offset)
+        if mode == "prefix":
+            sql, params = self._prefix_query(query)
+        elif mode == "substring" and self.fts and len(query) >= _TRIGRAM:
+            sql = (
+                "SELECT kv.value FROM kv_trigram JOIN kv ON kv.rowid = kv_trigram.rowid "
+                "WHERE kv_trigram MATCH ? ORDER BY kv.key"
+            )
+            params = (_phrase(query),)
+        elif mode == "substring":
+            escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            sql = "SELECT value FROM kv WHERE key LIKE ? ESCAPE '\\' ORDER BY key"
+            params = (f"%{escaped}%",)
+        elif mode == "token":
+            if not self.fts:
+                raise ValueError("token search requires fts=True")
+            tokens = query.split()
+            if not tokens:
+                return
+            sql = (
+                "SELECT kv.value FROM kv_tokens JOIN kv ON kv.rowid = kv_tokens.rowid "
+                "WHERE kv_tokens MATCH ? ORDER BY kv.key"
+            )
+            params = (" ".join(_phrase(token) for token in tokens),)
+        else:
+            raise ValueError(f"unknown search mode: {mode}")
+        with self._conn_lock:
+            cur = self.conn.execute(f"{sql} LIMIT ? OFFSET ?", params + paging)
+        try:
+            while True:
+                with self._conn_lock:
+                    rows = cur.fetchmany(page_size)
+                if not rows:
+                    return
+                for row in rows:
+                    yield pickle.loads(row[0])
+        finally:
+            with self._conn_lock:
+                cur.close()
+
+    @staticmethod
+    def _prefix_query(prefix: str) -> Tuple[str, Tuple[Any, ...]]:
+        # [prefix, successor) is a range scan on the primary key
+        upper = prefix.rstrip(chr(0x10FFFF))
+        if not upper:
+            return "SELECT value FROM kv WHERE key >= ? ORDER BY key", (prefix,)
+        successor = ord(upper[-1]) + 1
+        if 0xD800 <= successor < 0xE000:
+            successor = 0xE000  # surrogates cannot be encoded
+        upper = upper[:-1] + chr(successor)
+        return "SELECT value FROM kv WHERE key >= ? AND key < ? ORDER BY key", (prefix, upper)
+
+    def close(self) -> None:
+        """Flush buffered writes and close every thread's connection."""
+        if self._flusher is not None:
+            self._closed.set()
+            self._pending.set()
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+        if self._shared is not None:
+            with self._conn_lock:
+                self._shared.close()
+
 
-    def search(self, query: str) -> Iterable[Any]:
-        cur = self.conn.execute("SELECT value FROM kv WHERE key LIKE ?", (f"%{query}%",))
-        for row in cur.fetchall():
-            yield pickle.loads(row[0])
+def _phrase(text: str) -> str:
+    """Quote ``text`` as a single FTS5 phrase."""
+    return '"' + text.replace('"', '""') + '"'
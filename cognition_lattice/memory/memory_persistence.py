@@ -1,26 +1,129 @@
 """Utilities for persistence and TTL cleanup."""
 
+import heapq
+import itertools
+import threading
 import time
-from typing import Any
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class _Entry:
+    __slots__ = ('value', 'expiry', 'seq')
+
+    def __init__(self, value: Any, expiry: float, seq: int) -> None:
+        self.value = value
+        self.expiry = expiry
+        # identifies this entry's heap item; 0 when it has none
+        self.seq = seq
 
 
 class MemoryPersistence:
-    def __init__(self) -> None:
-        self._store: dict[str, tuple[Any, float]] = {}
+    """In-process key/value store with per-key TTL.
+
+    Expiry times sit in a min-heap, so ``cleanup`` only touches entries that
+    are due or were replaced, and at most ``limit`` of them per call.  Heap
+    items of replaced, deleted or evicted entries are counted and the heap is
+    rebuilt once they outnumber the live ones.  With ``sweep_interval``
+    set, a daemon thread runs ``cleanup(sweep_batch)`` every interval until
+    ``close()``.  With ``max_size`` set, the least recently used entries are
+    evicted to make room.
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        sweep_interval: Optional[float] = None,
+        sweep_batch: int = 1000,
+    ) -> None:
+        self._store: "OrderedDict[str, _Entry]" = OrderedDict()
+        # (expiry, seq, key); items whose seq no longer matches the stored entry are stale
+        self._heap: list[tuple[float, int, str]] = []
+        self._stale = 0
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+        self.max_size = max_size
+        self.sweep_batch = sweep_batch
+        self._stopped = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+        if sweep_interval:
+            self._sweeper = threading.Thread(
+                target=self._sweep, args=(sweep_interval,), name="memory_sweeper", daemon=True
+            )
+            self._sweeper.start()
+
+    def __len__(self) -> int:
+        return len(self._store)
 
     def put(self, key: str, value: Any, ttl: float | None = None) -> None:
-        expiry = time.time() + ttl if ttl else 0
-        self._store[key] = (value, expiry)
+        expiry = time.monotonic() + ttl if ttl else 0
+        with self._lock:
+            entry = _Entry(value, expiry, next(self._seq) if expiry else 0)
+            old = self._store.pop(key, None)
+            self._store[key] = entry
+            if expiry:
+                heapq.heappush(self._heap, (expiry, entry.seq, key))
+            self._discard(old)
+            if self.max_size is not None:
+                while len(self._store) > self.max_size:
+                    self._discard(self._store.popitem(last=False)[1])
 
     def get(self, key: str) -> Any:
-        value, expiry = self._store.get(key, (None, 0))
-        if expiry and expiry < time.time():
-            self._store.pop(key, None)
-            return None
-        return value
-
-    def cleanup(self) -> None:
-        now = time.time()
-        for key, (_, expiry) in list(self._store.items()):
-            if expiry and expiry < now:
-                self._store.pop(key, None)
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None:
+                return None
+            if entry.expiry and entry.expiry <= time.monotonic():
+                del self._store[key]
+                self._discard(entry)
+                return None
+            self._store.move_to_end(key)
+            return entry.value
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._discard(self._store.pop(key, None))
+
+    def cleanup(self, limit: Optional[int] = None) -> int:
+        """Remove expired entries, examining at most ``limit`` heap items; return how many expired."""
+        now = time.monotonic()
+        removed = 0
+        examined = 0
+        with self._lock:
+            heap = self._heap
+            while heap and (limit is None or examined < limit):
+                expiry, seq, key = heap[0]
+                entry = self._store.get(key)
+                live = entry is not None and entry.seq == seq
+                if live and expiry > now:
+                    break
+                heapq.heappop(heap)
+                examined += 1
+                if live:
+                    del self._store[key]
+                    removed += 1
+                else:
+                    self._stale -= 1
+        return removed
+
+    def _discard(self, entry: Optional[_Entry]) -> None:
+        """Count the heap item of an entry that left the store; rebuild once most items are stale."""
+        if entry is None or not entry.seq:
+            return
+        self._stale += 1
+        # each rebuild follows at least as many discards as it keeps items, so this stays amortized O(1)
+        if 2 * self._stale > len(self._heap):
+            self._heap = [(e.expiry, e.seq, k) for k, e in self._store.items() if e.seq]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    def _sweep(self, interval: float) -> None:
+        while not self._stopped.wait(interval):
+            self.cleanup(self.sweep_batch)
+
+    def close(self) -> None:
+        """Stop the background sweeper, if any."""
+        self._stopped.set()
+        if self._sweeper is not None:
+            self._sweeper.join()
+            self._sweeper = None
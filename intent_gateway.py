@@ -1,29 +1,57 @@
 #!/usr/bin/env python3
 """FastAPI gateway for submitting intents."""
 
-from fastapi import FastAPI, HTTPException, Request, WebSocket
-import asyncio
-from pydantic import BaseModel
+from contextlib import asynccontextmanager
+import os
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket, status
+from fastapi.responses import JSONResponse
+import orjson
+from pydantic import BaseModel, ValidationError as ModelError
 import uvicorn
 
 import sios_messaging as messaging
-from validation import validate_intent
+from validation import validate_intent, validate_intents, preload_schemas
 from jsonschema import ValidationError
+from response_demux import ResponseDemultiplexer
+
+demux = ResponseDemultiplexer()
+
+# NDJSON lines are validated and sent to the broker this many at a time.
+STREAM_CHUNK = 1000
+
+# Gateway processes sharing the port.  Every process would pop responses from
+# the one shared queue, so a response would usually reach a process that does
+# not hold the client's socket; /ws is therefore only served by a single worker.
+WORKERS = int(os.getenv("GATEWAY_WORKERS", "1"))
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if WORKERS == 1:
+        await demux.start()
+    try:
+        yield
+    finally:
+        await demux.stop()
+        await messaging.close_async()
 
-app = FastAPI()
 
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+preload_schemas()
 
-def _wait_for_response(intent_id: str, timeout: float = 30.0):
-    """Block until a response for the given intent_id is received."""
-    import time
 
-    deadline = time.time() + timeout
-    while time.time() < deadline:
-        for resp in messaging.receive_responses(timeout=1.0):
-            if resp.get("intent_id") == intent_id:
-                return resp
-        time.sleep(0.1)
-    return None
+async def _wait_for_response(intent_id: str, timeout: float = 30.0):
+    """Wait for the response to ``intent_id`` without tying up a thread."""
+    # started lazily too, for servers that skip the lifespan protocol
+    await demux.start()
+    return await demux.wait_for(intent_id, timeout)
 
 class IntentModel(BaseModel):
     intent: str
@@ -37,19 +65,103 @@ async def create_intent(intent: IntentModel, request: Request):
         validate_intent(data)
     except ValidationError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
-    messaging.send_intent(data)
+    await messaging.send_intent_async(data)
     return {"status": "queued", "intent_id": intent.intent_id}
 
 
+async def _admit(items: List[Any], start: int = 0) -> List[Dict[str, Any]]:
+    """Validate ``items`` together, queue the valid ones in one broker call and
+    return a status per item in input order."""
+    results: List[Dict[str, Any]] = []
+    candidates: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+    for index, item in enumerate(items, start):
+        status: Dict[str, Any] = {"index": index}
+        if isinstance(item, dict):
+            status["intent_id"] = item.get("intent_id")
+        results.append(status)
+        if isinstance(item, Exception):
+            status.update(status="rejected", detail=str(item))
+            continue
+        try:
+            candidates.append((status, IntentModel.model_validate(item).model_dump()))
+        except ModelError as exc:
+            status.update(status="rejected", detail=str(exc))
+    errors = validate_intents([data for _, data in candidates])
+    accepted = []
+    for (status, data), error in zip(candidates, errors):
+        if error is None:
+            status["status"] = "queued"
+            accepted.append(data)
+        else:
+            status.update(status="rejected", detail=error)
+    if accepted:
+        await messaging.send_intents_async(accepted)
+    return results
+
+
+@app.post("/intents/batch")
+async def create_intents(items: List[Any]):
+    results = await _admit(items)
+    queued = sum(1 for r in results if r["status"] == "queued")
+    return {"queued": queued, "rejected": len(results) - queued, "results": results}
+
+
+async def _ndjson_lines(request: Request) -> AsyncIterator[bytes]:
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    yield buffer
+
+
+@app.post("/intents/stream")
+async def stream_intents(request: Request):
+    """Accept one intent per line, queueing them as they arrive in chunks of
+    ``STREAM_CHUNK``, and answer with one status line per intent."""
+    # The body is consumed before responding: a StreamingResponse would race
+    # its disconnect listener for the request's receive channel.
+    out: List[bytes] = []
+    chunk: List[Any] = []
+    index = 0
+    async for line in _ndjson_lines(request):
+        if not line.strip():
+            continue
+        try:
+            chunk.append(orjson.loads(line))
+        except ValueError as exc:
+            chunk.append(ValueError(f"invalid JSON: {exc}"))
+        if len(chunk) >= STREAM_CHUNK:
+            out.extend(orjson.dumps(status) + b"\n" for status in await _admit(chunk, index))
+            index += len(chunk)
+            chunk = []
+    if chunk:
+        out.extend(orjson.dumps(status) + b"\n" for status in await _admit(chunk, index))
+    return Response(content=b"".join(out), media_type="application/x-ndjson")
+
+
 @app.websocket("/ws/{intent_id}")
 async def intent_ws(websocket: WebSocket, intent_id: str):
+    if WORKERS > 1:
+        await websocket.close(
+            code=status.WS_1008_POLICY_VIOLATION,
+            reason="/ws needs GATEWAY_WORKERS=1",
+        )
+        return
     await websocket.accept()
     try:
-        resp = await asyncio.to_thread(_wait_for_response, intent_id)
+        resp = await _wait_for_response(intent_id)
         if resp:
             await websocket.send_json(resp)
     finally:
         await websocket.close()
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # GATEWAY_WORKERS > 1 runs that many gateway processes on one port, without /ws
+    uvicorn.run(
+        "intent_gateway:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=WORKERS,
+    )
@@ -0,0 +1,178 @@
+"""
+Bridge between a local MessageBus and Redis pub/sub.
+
+Meshes on different machines share one Redis channel.  Each bridge forwards
+local messages on its ``outbound`` patterns in batches and injects remote
+messages on its ``inbound`` patterns into the local bus, so agents are
+reached across machines without changes.
+"""
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from messaging_bus import Message, MessageBus, RESPONSE_PREFIX, TopicTrie, reply_key
+from sios_messaging.codec import decode, get_codec
+
+try:
+    import redis.asyncio as aioredis
+except Exception:  # pragma: no cover - redis optional
+    aioredis = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Message ids remembered for loop suppression and reply routing.
+MEMORY = 100_000
+
+
+def _remember(store: "OrderedDict[str, Any]", key: str, value: Any = None) -> None:
+    store[key] = value
+    store.move_to_end(key)
+    if len(store) > MEMORY:
+        store.popitem(last=False)
+
+
+class RedisBusBridge:
+    """Forward selected MessageBus topics between meshes over Redis pub/sub.
+
+    Outbound messages are published in batches of up to ``batch_size``,
+    waiting ``linger`` seconds for stragglers.  Messages that arrived from
+    Redis are never sent back out, and batches from this bridge are ignored
+    when they echo back.  A request that crosses the bridge has its reply
+    (published on ``response.<id>``) returned to the originating bridge only.
+    """
+
+    def __init__(
+        self,
+        bus: MessageBus,
+        outbound: List[str],
+        inbound: Optional[List[str]] = None,
+        url: str = "redis://localhost:6379/0",
+        channel: str = "mesh",
+        node_id: Optional[str] = None,
+        batch_size: int = 100,
+        linger: float = 0.002,
+        client: Any = None,
+        codec: Optional[str] = None,
+    ) -> None:
+        if client is None:
+            if aioredis is None:
+                raise RuntimeError("redis.asyncio is not available")
+            client = aioredis.Redis.from_url(url)
+        self.bus = bus
+        self.outbound = list(outbound)
+        self.inbound = list(outbound if inbound is None else inbound)
+        self.channel = channel
+        self.node_id = node_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.batch_size = batch_size
+        self.linger = linger
+        self._client = client
+        self._codec = get_codec(codec)
+        self._outbound = TopicTrie()
+        for pattern in self.outbound:
+            self._outbound.add(pattern, True)
+        self._inbound = TopicTrie()
+        for pattern in self.inbound:
+            self._inbound.add(pattern, True)
+        self._outbox: asyncio.Queue = asyncio.Queue()
+        # ids of messages injected from Redis, which must not be re-forwarded
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        # remote request id -> node id its reply goes back to
+        self._routes: "OrderedDict[str, str]" = OrderedDict()
+        self._pubsub = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        self._pubsub = self._client.pubsub()
+        await self._pubsub.subscribe(self.channel)
+        self._tasks = [
+            asyncio.create_task(self._forward()),
+            asyncio.create_task(self._send()),
+            asyncio.create_task(self._receive()),
+        ]
+        # let the local subscription register before messages are published
+        await asyncio.sleep(0)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(self.channel)
+            await self._pubsub.aclose()
+            self._pubsub = None
+
+    async def _forward(self) -> None:
+        # response.# catches replies to requests that came in over the bridge
+        subscription = self.bus.subscribe(
+            self.outbound + [RESPONSE_PREFIX + "#"], name=f"bridge:{self.channel}", with_topics=True
+        )
+        try:
+            async for topic, message in subscription:
+                if message.message_id in self._seen:
+                    continue
+                item: Dict[str, Any] = {"topic": topic, "message": message.to_dict()}
+                key = reply_key(topic, message.type, message.correlation_id, message.message_id) if self._routes else None
+                if key is not None and key in self._routes:
+                    item["to"] = self._routes.pop(key)
+                elif not self._outbound.match(topic):
+                    continue
+                self._outbox.put_nowait(item)
+        finally:
+            await subscription.aclose()
+
+    async def _send(self) -> None:
+        while True:
+            batch = [await self._outbox.get()]
+            if self.linger:
+                await asyncio.sleep(self.linger)
+            while len(batch) < self.batch_size and not self._outbox.empty():
+                batch.append(self._outbox.get_nowait())
+            try:
+                await self._client.publish(
+                    self.channel, self._codec.encode({"origin": self.node_id, "items": batch})
+                )
+            except Exception:
+                logger.exception("Failed to forward %d messages", len(batch))
+
+    async def _receive(self) -> None:
+        async for raw in self._pubsub.listen():
+            if raw.get("type") != "message":
+                continue
+            try:
+                batch = decode(raw["data"])
+            except Exception:
+                logger.error("Dropping malformed bridge batch")
+                continue
+            origin = batch.get("origin")
+            if origin == self.node_id:
+                continue
+            for item in batch.get("items", []):
+                await self._inject(origin, item)
+
+    async def _inject(self, origin: str, item: Dict[str, Any]) -> None:
+        to = item.get("to")
+        topic = item["topic"]
+        if to is not None:
+            if to != self.node_id:
+                return
+        elif not self._inbound.match(topic):
+            return
+        message = Message.from_dict(item["message"])
+        if message.message_id in self._seen:
+            return
+        _remember(self._seen, message.message_id)
+        if to is None:
+            _remember(self._routes, message.message_id, origin)
+        try:
+            await self.bus.publish(topic, message)
+        except Exception:
+            logger.exception("Failed to deliver bridged message on %s", topic)
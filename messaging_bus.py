@@ -4,12 +4,14 @@ Messaging bus implementation for inter-agent communication.
 import asyncio
 import json
 from enum import Enum
-from typing import Dict, List, Optional, AsyncGenerator, Set, Callable, Any, Tuple
+from typing import Dict, List, Optional, AsyncGenerator, Set, Callable, Any, Tuple, Union
 from dataclasses import dataclass, field
 import uuid
 from datetime import datetime
 import logging
 
+from metrics import bus_queue_depth, bus_messages_dropped
+
 logger = logging.getLogger(__name__)
 
 class MessageType(str, Enum):
@@ -20,9 +22,14 @@ class MessageType(str, Enum):
     ERROR = "error"
     SIGNAL = "signal"
 
-@dataclass
+@dataclass(frozen=True)
 class Message:
-    """Base message class for all inter-agent communication."""
+    """Base message class for all inter-agent communication.
+
+    Messages are immutable: in-process delivery hands the same instance to
+    every subscriber, so the payload and metadata must be treated as
+    read-only too.
+    """
     type: MessageType
     source: str
     target: Optional[str] = None
@@ -31,6 +38,10 @@ class Message:
     message_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     correlation_id: Optional[str] = None
     timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+
+    def __post_init__(self) -> None:
+        if self.correlation_id is None:
+            object.__setattr__(self, "correlation_id", self.message_id)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert message to dictionary."""
@@ -41,7 +52,7 @@ class Message:
             "payload": self.payload,
             "metadata": self.metadata,
             "message_id": self.message_id,
-            "correlation_id": self.correlation_id or self.message_id,
+            "correlation_id": self.correlation_id,
             "timestamp": self.timestamp
         }
     
@@ -70,6 +81,167 @@ class Message:
             **kwargs
         )
 
+class OverflowPolicy(str, Enum):
+    """What publishing does when a bounded subscriber queue is full."""
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    RAISE = "raise"
+
+
+class SubscriberOverflowError(Exception):
+    """Raised by publish when a subscriber using ``OverflowPolicy.RAISE`` is full."""
+
+
+class _Subscription:
+    """A subscriber queue with its overflow policy and metrics.
+
+    Subscriptions may share a ``name``; the depth gauge is their combined
+    backlog, so each one adjusts it by its own changes rather than setting it.
+    """
+
+    __slots__ = ('name', 'queue', 'overflow', '_depth', '_dropped')
+
+    def __init__(self, name: str, maxsize: int = 0,
+                 overflow: Union[OverflowPolicy, str] = OverflowPolicy.BLOCK) -> None:
+        self.name = name
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.overflow = OverflowPolicy(overflow)
+        self._depth = bus_queue_depth.labels(name)
+        self._dropped = bus_messages_dropped.labels(name, self.overflow.value)
+
+    async def put(self, item: Tuple[str, 'Message']) -> bool:
+        """Enqueue ``item``; returns False if it was rejected under ``RAISE``."""
+        queue = self.queue
+        if queue.full():
+            if self.overflow is OverflowPolicy.BLOCK:
+                await queue.put(item)
+            elif self.overflow is OverflowPolicy.DROP_OLDEST:
+                queue.get_nowait()
+                queue.task_done()
+                queue.put_nowait(item)
+                self._dropped.inc()
+                return True
+            else:
+                self._dropped.inc()
+                return self.overflow is OverflowPolicy.DROP_NEWEST
+        else:
+            queue.put_nowait(item)
+        self._depth.inc()
+        return True
+
+    async def get(self) -> Tuple[str, 'Message']:
+        item = await self.queue.get()
+        self._depth.dec()
+        return item
+
+    def close(self) -> None:
+        """Remove this subscription's unread messages from the depth gauge."""
+        self._depth.dec(self.queue.qsize())
+
+
+RESPONSE_PREFIX = "response."
+
+
+def reply_key(topic: str, message_type: str, correlation_id: Optional[str], message_id: str) -> Optional[str]:
+    """Return the id of the request a message answers, or None.
+
+    Replies are published to response.<request id>, or are RESPONSE messages
+    whose correlation id is the request id.  Other messages often carry a
+    propagated correlation id for tracing, so they never count as replies.
+    """
+    if topic.startswith(RESPONSE_PREFIX):
+        key = topic[len(RESPONSE_PREFIX):]
+    elif message_type == MessageType.RESPONSE:
+        key = correlation_id
+    else:
+        return None
+    # a request's own correlation id points at itself
+    return None if key == message_id else key
+
+
+def is_pattern(topic: str) -> bool:
+    """Return True if ``topic`` contains a ``*`` or ``#`` wildcard level."""
+    return any(part in ('*', '#') for part in topic.split('.'))
+
+
+class _TrieNode:
+    __slots__ = ('children', 'subscribers')
+
+    def __init__(self) -> None:
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.subscribers: Set[Any] = set()
+
+
+class TopicTrie:
+    """Wildcard subscriptions indexed by topic level.
+
+    ``*`` matches exactly one level and ``#`` matches zero or more levels, so
+    ``echo.*`` matches ``echo.test`` and ``echo.#`` also matches ``echo`` and
+    ``echo.a.b``.  Matching walks one trie level per topic level instead of
+    testing every registered pattern.
+    """
+
+    def __init__(self) -> None:
+        self._root = _TrieNode()
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, pattern: str, subscriber: Any) -> None:
+        node = self._root
+        for part in pattern.split('.'):
+            node = node.children.setdefault(part, _TrieNode())
+        if subscriber not in node.subscribers:
+            node.subscribers.add(subscriber)
+            self._count += 1
+
+    def remove(self, pattern: str, subscriber: Any) -> None:
+        path = [self._root]
+        parts = pattern.split('.')
+        for part in parts:
+            child = path[-1].children.get(part)
+            if child is None:
+                return
+            path.append(child)
+        if subscriber not in path[-1].subscribers:
+            return
+        path[-1].subscribers.discard(subscriber)
+        self._count -= 1
+        # prune branches that no longer lead to a subscriber
+        for depth in range(len(parts), 0, -1):
+            node = path[depth]
+            if node.subscribers or node.children:
+                break
+            del path[depth - 1].children[parts[depth - 1]]
+
+    def clear(self) -> None:
+        self._root = _TrieNode()
+        self._count = 0
+
+    def match(self, topic: str) -> Set[Any]:
+        """Return every subscriber whose pattern matches ``topic``."""
+        found: Set[Any] = set()
+        if self._count:
+            self._collect(self._root, topic.split('.'), 0, found)
+        return found
+
+    def _collect(self, node: _TrieNode, parts: List[str], index: int, found: Set[Any]) -> None:
+        multi = node.children.get('#')
+        if multi is not None:
+            # '#' may swallow any number of the remaining levels
+            for rest in range(index, len(parts) + 1):
+                self._collect(multi, parts, rest, found)
+        if index == len(parts):
+            found.update(node.subscribers)
+            return
+        for key in (parts[index], '*'):
+            child = node.children.get(key)
+            if child is not None:
+                self._collect(child, parts, index + 1, found)
+
+
 class MessageBus:
     """
     Message bus for inter-agent communication.
@@ -79,8 +251,10 @@ class MessageBus:
     
     def __init__(self):
         self._queues: Dict[str, asyncio.Queue] = {}
-        self._subscriptions: Dict[str, Set[asyncio.Queue]] = {}
-        self._patterns: List[Tuple[str, asyncio.Queue]] = []
+        self._subscriptions: Dict[str, Set[_Subscription]] = {}
+        self._patterns = TopicTrie()
+        # request message id -> future resolved by the matching reply
+        self._pending: Dict[str, asyncio.Future] = {}
         self._running = True
     
     async def publish(self, topic: str, message: Message) -> None:
@@ -91,45 +265,49 @@ class MessageBus:
         if not isinstance(message, Message):
             raise ValueError("Message must be an instance of Message class")
             
-        # Convert message to dict for serialization
-        message_dict = message.to_dict()
-        
-        # Publish to direct subscribers
-        for queue in self._subscriptions.get(topic, set()):
-            await queue.put((topic, message_dict))
-        
-        # Publish to pattern subscribers
-        for pattern, queue in self._patterns:
-            if self._match_pattern(pattern, topic):
-                await queue.put((topic, message_dict))
-    
-    def _match_pattern(self, pattern: str, topic: str) -> bool:
-        """Check if a topic matches a pattern with wildcards."""
-        pattern_parts = pattern.split('.')
-        topic_parts = topic.split('.')
-        
-        if len(pattern_parts) != len(topic_parts):
-            return False
-            
-        for p, t in zip(pattern_parts, topic_parts):
-            if p == '*':
-                continue
-            if p != t:
-                return False
-                
-        return True
+        # Every subscriber receives the same immutable instance; messages are
+        # only serialized (to_dict) when they leave the process.  A queue whose
+        # patterns overlap still receives each message once.
+        if self._pending:
+            self._resolve_reply(topic, message)
+
+        subscribers = self._patterns.match(topic)
+        direct = self._subscriptions.get(topic)
+        if direct:
+            subscribers.update(direct)
+        overflowed = []
+        for subscriber in subscribers:
+            if not await subscriber.put((topic, message)):
+                overflowed.append(subscriber.name)
+        if overflowed:
+            raise SubscriberOverflowError(
+                f"Subscriber queue full for {topic}: {', '.join(sorted(overflowed))}"
+            )
     
-    async def subscribe(self, patterns: List[str]) -> AsyncGenerator[Message, None]:
-        """Subscribe to messages matching the given patterns."""
+    async def subscribe(
+        self,
+        patterns: List[str],
+        maxsize: int = 0,
+        overflow: Union[OverflowPolicy, str] = OverflowPolicy.BLOCK,
+        name: Optional[str] = None,
+        with_topics: bool = False,
+    ) -> AsyncGenerator[Any, None]:
+        """Subscribe to messages matching the given patterns.
+
+        ``maxsize`` bounds the subscriber's queue (0 means unbounded) and
+        ``overflow`` decides what publishing does once it is full.  ``name``
+        labels the queue-depth and drop metrics; it defaults to the patterns.
+        With ``with_topics`` each item is a ``(topic, message)`` tuple.
+        """
         if not self._running:
             raise RuntimeError("Message bus is not running")
             
-        queue = asyncio.Queue()
+        queue = _Subscription(name or ",".join(patterns), maxsize, overflow)
         
         # Subscribe to direct topics
         for pattern in patterns:
-            if '*' in pattern:
-                self._patterns.append((pattern, queue))
+            if is_pattern(pattern):
+                self._patterns.add(pattern, queue)
             else:
                 if pattern not in self._subscriptions:
                     self._subscriptions[pattern] = set()
@@ -137,64 +315,100 @@ class MessageBus:
         
         try:
             while self._running:
-                topic, message_dict = await queue.get()
-                yield Message.from_dict(message_dict)
-                queue.task_done()
-        except asyncio.CancelledError:
-            # Clean up on cancellation
+                item = await queue.get()
+                yield item if with_topics else item[1]
+                queue.queue.task_done()
+        finally:
+            # Clean up on cancellation or when the consumer stops iterating
             for pattern in patterns:
-                if '*' in pattern:
-                    self._patterns = [(p, q) for p, q in self._patterns 
-                                    if p != pattern or q != queue]
+                if is_pattern(pattern):
+                    self._patterns.remove(pattern, queue)
                 else:
                     if pattern in self._subscriptions:
                         self._subscriptions[pattern].discard(queue)
                         if not self._subscriptions[pattern]:
                             del self._subscriptions[pattern]
-            raise
+            queue.close()
     
-    async def request(self, topic: str, payload: Dict[str, Any] = None, 
-                     timeout: float = 10.0, **kwargs) -> Message:
-        """Send a request and wait for a response."""
-        if not self._running:
-            raise RuntimeError("Message bus is not running")
-            
-        message = Message(
+    def _intent(self, topic: str, payload: Optional[Dict[str, Any]], **kwargs) -> Message:
+        return Message(
             type=MessageType.INTENT,
             source="system",
             target=topic,
             payload=payload or {},
             **kwargs
         )
-        
-        response_queue = asyncio.Queue()
-        response_pattern = f"response.{message.message_id}"
-        
-        # Subscribe to the response
-        if response_pattern not in self._subscriptions:
-            self._subscriptions[response_pattern] = set()
-        self._subscriptions[response_pattern].add(response_queue)
+
+    def _resolve_reply(self, topic: str, message: Message) -> None:
+        key = reply_key(topic, message.type, message.correlation_id, message.message_id)
+        if key is None:
+            return
+        future = self._pending.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(message)
+
+    async def request(self, topic: str, payload: Dict[str, Any] = None, 
+                     timeout: float = 10.0, **kwargs) -> Message:
+        """Send a request and wait for a response."""
+        if not self._running:
+            raise RuntimeError("Message bus is not running")
+            
+        message = self._intent(topic, payload, **kwargs)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message.message_id] = future
         
         try:
-            # Publish the request
             await self.publish(topic, message)
-            
-            # Wait for response with timeout
             try:
-                _, response_dict = await asyncio.wait_for(
-                    response_queue.get(),
-                    timeout=timeout
-                )
-                return Message.from_dict(response_dict)
+                return await asyncio.wait_for(future, timeout=timeout)
             except asyncio.TimeoutError:
                 raise asyncio.TimeoutError(
                     f"Timeout waiting for response to {message.message_id}"
                 )
         finally:
-            # Clean up
-            self._subscriptions[response_pattern].discard(response_queue)
-            if not self._subscriptions[response_pattern]:
-                del self._subscriptions[response_pattern]
+            self._pending.pop(message.message_id, None)
+
+    async def request_many(
+        self,
+        requests: List[Tuple[str, Optional[Dict[str, Any]]]],
+        timeout: float = 10.0,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Send several ``(topic, payload)`` requests and gather their replies.
+
+        All requests share one deadline of ``timeout`` seconds.  Replies are
+        returned in request order; a missing reply raises
+        ``asyncio.TimeoutError`` or, with ``return_exceptions``, leaves the
+        exception in its slot.
+        """
+        if not self._running:
+            raise RuntimeError("Message bus is not running")
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        messages = [self._intent(topic, payload) for topic, payload in requests]
+        futures = [loop.create_future() for _ in messages]
+        for message, future in zip(messages, futures):
+            self._pending[message.message_id] = future
+        try:
+            for (topic, _), message in zip(requests, messages):
+                await self.publish(topic, message)
+            remaining = max(deadline - loop.time(), 0)
+            if futures:
+                await asyncio.wait(futures, timeout=remaining)
+            results: List[Any] = []
+            for message, future in zip(messages, futures):
+                if future.done():
+                    results.append(future.result())
+                    continue
+                error = asyncio.TimeoutError(f"Timeout waiting for response to {message.message_id}")
+                if not return_exceptions:
+                    raise error
+                results.append(error)
+            return results
+        finally:
+            for message in messages:
+                self._pending.pop(message.message_id, None)
     
     async def close(self):
         """Close the message bus and clean up resources."""
@@ -206,6 +420,10 @@ class MessageBus:
                 queue.get_nowait()
                 queue.task_done()
         
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
         # Clear subscriptions
         self._subscriptions.clear()
         self._patterns.clear()
@@ -0,0 +1,236 @@
+"""
+Cross-process MessageBus transport over a Unix domain socket.
+
+A :class:`BusHub` listens on a socket and routes frames between processes;
+each process uses a :class:`RemoteMessageBus`, which behaves like
+:class:`~messaging_bus.MessageBus` locally and forwards publishes and
+subscriptions through the hub.  Frames are a 4-byte big-endian length
+followed by a payload encoded with the ``sios_messaging`` codec.
+"""
+import asyncio
+import logging
+import struct
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
+
+from messaging_bus import Message, MessageBus, SubscriberOverflowError, TopicTrie, reply_key
+from sios_messaging.codec import Codec, decode, get_codec
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct(">I")
+
+# Requests whose replies the hub still routes back to their sender.
+REPLY_ROUTES = 100_000
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> Optional[Dict[str, Any]]:
+    try:
+        header = await reader.readexactly(_HEADER.size)
+        return decode(await reader.readexactly(_HEADER.unpack(header)[0]))
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+
+
+def _frame(codec: Codec, frame: Dict[str, Any]) -> bytes:
+    payload = codec.encode(frame)
+    return _HEADER.pack(len(payload)) + payload
+
+
+class _Peer:
+    __slots__ = ('writer', 'patterns')
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+        self.patterns: Set[str] = set()
+
+
+class BusHub:
+    """Routes messages between the RemoteMessageBus clients of one machine.
+
+    Subscriptions use the same ``*``/``#`` semantics as MessageBus.  A
+    message is never sent back to the connection that published it: that
+    process has already delivered it locally.  Replies to ``request()`` are
+    routed to the requesting connection without it subscribing to them.
+    """
+
+    def __init__(self, path: str, codec: Optional[str] = None) -> None:
+        self.path = path
+        self._codec = get_codec(codec)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._trie = TopicTrie()
+        self._peers: Set[_Peer] = set()
+        self._routes: "OrderedDict[str, _Peer]" = OrderedDict()
+        self._ready = 0
+        self._ready_changed = asyncio.Event()
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_unix_server(self._serve, path=self.path)
+
+    async def wait_ready(self, count: int, timeout: float = 30.0) -> None:
+        """Wait until ``count`` clients have sent their ``ready`` frame."""
+        async def wait() -> None:
+            while self._ready < count:
+                self._ready_changed.clear()
+                await self._ready_changed.wait()
+        await asyncio.wait_for(wait(), timeout)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+        for peer in list(self._peers):
+            peer.writer.close()
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        peer = _Peer(writer)
+        self._peers.add(peer)
+        try:
+            while True:
+                frame = await _read_frame(reader)
+                if frame is None:
+                    break
+                op = frame.get("op")
+                if op == "pub":
+                    await self._route(peer, frame)
+                elif op == "sub":
+                    peer.patterns.add(frame["pattern"])
+                    self._trie.add(frame["pattern"], peer)
+                elif op == "unsub":
+                    peer.patterns.discard(frame["pattern"])
+                    self._trie.remove(frame["pattern"], peer)
+                elif op == "ready":
+                    self._ready += 1
+                    self._ready_changed.set()
+        finally:
+            self._peers.discard(peer)
+            for pattern in peer.patterns:
+                self._trie.remove(pattern, peer)
+            writer.close()
+
+    async def _route(self, sender: _Peer, frame: Dict[str, Any]) -> None:
+        topic = frame["topic"]
+        message = frame["message"]
+        targets = self._trie.match(topic)
+        if frame.get("reply"):
+            self._routes[message["message_id"]] = sender
+            if len(self._routes) > REPLY_ROUTES:
+                self._routes.popitem(last=False)
+        elif self._routes:
+            key = reply_key(topic, message.get("type"), message.get("correlation_id"), message.get("message_id"))
+            if key is not None:
+                requester = self._routes.pop(key, None)
+                if requester is not None:
+                    targets.add(requester)
+        targets.discard(sender)
+        if not targets:
+            return
+        data = _frame(self._codec, {"op": "msg", "topic": topic, "message": message})
+        for peer in targets:
+            peer.writer.write(data)
+        for peer in targets:
+            try:
+                await peer.writer.drain()
+            except ConnectionError:
+                pass
+
+
+class RemoteMessageBus(MessageBus):
+    """A MessageBus whose publishes and subscriptions span processes via a BusHub.
+
+    ``publish``/``subscribe``/``request`` keep their MessageBus behaviour;
+    local subscribers are served in-process and the hub forwards messages to
+    and from the other processes.
+    """
+
+    def __init__(self, path: str, codec: Optional[str] = None) -> None:
+        super().__init__()
+        self.path = path
+        self._codec = get_codec(codec)
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._remote_patterns: Dict[str, int] = {}
+        self.disconnected = asyncio.Event()
+
+    async def connect(self) -> "RemoteMessageBus":
+        self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+        self._reader_task = asyncio.create_task(self._receive())
+        return self
+
+    def _send(self, frame: Dict[str, Any]) -> None:
+        if self._writer is not None and not self._writer.is_closing():
+            self._writer.write(_frame(self._codec, frame))
+
+    def ready(self) -> None:
+        """Tell the hub this process has registered its subscriptions."""
+        self._send({"op": "ready"})
+
+    async def _receive(self) -> None:
+        try:
+            while True:
+                frame = await _read_frame(self._reader)
+                if frame is None:
+                    break
+                if frame.get("op") == "msg" and self._running:
+                    # deliver locally only; the hub already fanned it out
+                    try:
+                        await MessageBus.publish(self, frame["topic"], Message.from_dict(frame["message"]))
+                    except SubscriberOverflowError as exc:
+                        logger.warning("Dropped remote message: %s", exc)
+        except Exception:
+            logger.exception("Hub connection failed")
+        finally:
+            self.disconnected.set()
+
+    async def publish(self, topic: str, message: Message) -> None:
+        await super().publish(topic, message)
+        if self._writer is not None:
+            self._send({
+                "op": "pub",
+                "topic": topic,
+                "message": message.to_dict(),
+                "reply": message.message_id in self._pending,
+            })
+            await self._writer.drain()
+
+    def _remote_subscribe(self, patterns: List[str]) -> None:
+        for pattern in patterns:
+            count = self._remote_patterns.get(pattern, 0)
+            self._remote_patterns[pattern] = count + 1
+            if not count:
+                self._send({"op": "sub", "pattern": pattern})
+
+    def _remote_unsubscribe(self, patterns: List[str]) -> None:
+        for pattern in patterns:
+            count = self._remote_patterns.get(pattern, 0) - 1
+            if count > 0:
+                self._remote_patterns[pattern] = count
+            else:
+                self._remote_patterns.pop(pattern, None)
+                self._send({"op": "unsub", "pattern": pattern})
+
+    async def subscribe(self, patterns: List[str], *args, **kwargs):
+        self._remote_subscribe(patterns)
+        local = super().subscribe(patterns, *args, **kwargs)
+        try:
+            async for message in local:
+                yield message
+        finally:
+            await local.aclose()
+            self._remote_unsubscribe(patterns)
+
+    async def close(self):
+        await super().close()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+            self._reader_task = None
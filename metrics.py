@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram, start_http_server
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
 
 intents_received = Counter('intents_received_total', 'Total intents received', ['intent_type'])
 intents_success = Counter('intents_success_total', 'Total intents processed successfully', ['intent_type'])
@@ -6,6 +6,30 @@ intents_failure = Counter('intents_failure_total', 'Total intents failed', ['int
 intent_duration = Histogram('intent_execution_duration_seconds', 'Intent execution time', ['intent_type'])
 intent_success = Counter('intent_success_total', 'Total successful intents', ['agent'])
 intent_failure = Counter('intent_failure_total', 'Total failed intents', ['agent'])
+intent_batch_size = Histogram(
+    'intent_batch_size', 'Intents dispatched per agent batch', ['intent_type'],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+
+agent_reload_duration = Histogram('agent_reload_duration_seconds', 'Time spent hot-reloading agent modules')
+agent_reload_dispatch_failures = Counter(
+    'agent_reload_dispatch_failures_total',
+    'Dispatches that found no agent while a hot-reload was running',
+    ['intent_type'],
+)
+
+bus_queue_depth = Gauge('bus_queue_depth', 'Messages waiting in a MessageBus subscriber queue', ['subscriber'])
+bus_messages_dropped = Counter(
+    'bus_messages_dropped_total',
+    'Messages a full MessageBus subscriber queue discarded or rejected',
+    ['subscriber', 'policy'],
+)
+
+memory_cache_hits = Counter('memory_cache_hits_total', 'Memory reads answered from the cache', ['cache'])
+memory_cache_misses = Counter('memory_cache_misses_total', 'Memory reads that went to the backend', ['cache'])
+memory_cache_evictions = Counter(
+    'memory_cache_evictions_total', 'Cache entries evicted to stay within the size bound', ['cache']
+)
 
 
 def start_metrics_server(port: int = 8001) -> None:
@@ -0,0 +1,117 @@
+"""Route broker responses to the coroutines waiting for them."""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple
+
+import sios_messaging as messaging
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseDemultiplexer:
+    """One background consumer per process resolving per-intent futures.
+
+    A single thread reads ``receive_responses`` and hands each response to the
+    event loop, where it resolves the futures registered for its
+    ``intent_id``.  Responses nobody is waiting for yet are parked for
+    ``park_ttl`` seconds so a client that subscribes late still gets them.
+    """
+
+    def __init__(
+        self,
+        receive: Optional[Callable[[float], Generator[Dict[str, Any], None, None]]] = None,
+        park_ttl: float = 60.0,
+        poll_timeout: float = 1.0,
+    ) -> None:
+        self._receive = receive or messaging.receive_responses
+        self.park_ttl = park_ttl
+        self.poll_timeout = poll_timeout
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._parked: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = threading.Event()
+
+    async def start(self) -> None:
+        """Start the consumer thread, bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # A new loop (e.g. a restarted app) invalidates old waiters.
+            self._waiters.clear()
+            self._loop = loop
+        if self._thread is None or not self._thread.is_alive():
+            self._running.set()
+            self._thread = threading.Thread(target=self._consume, name="response_demux", daemon=True)
+            self._thread.start()
+
+    async def stop(self) -> None:
+        self._running.clear()
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join)
+            self._thread = None
+
+    def _consume(self) -> None:
+        while self._running.is_set():
+            try:
+                for response in self._receive(self.poll_timeout):
+                    loop = self._loop
+                    if loop is None or loop.is_closed():
+                        continue
+                    loop.call_soon_threadsafe(self._dispatch, response)
+                    if not self._running.is_set():
+                        break
+            except Exception:
+                logger.exception("Response consumer failed")
+                time.sleep(self.poll_timeout)
+
+    def _dispatch(self, response: Dict[str, Any]) -> None:
+        self._prune()
+        intent_id = response.get("intent_id")
+        if intent_id is None:
+            return
+        waiters = self._waiters.pop(intent_id, [])
+        delivered = False
+        for future in waiters:
+            if not future.done():
+                future.set_result(response)
+                delivered = True
+        if not delivered:
+            self._parked[intent_id] = (time.monotonic() + self.park_ttl, response)
+            self._parked.move_to_end(intent_id)
+
+    def _prune(self) -> None:
+        # Entries share one TTL, so the oldest are always first to expire.
+        now = time.monotonic()
+        while self._parked:
+            intent_id, (expiry, _) = next(iter(self._parked.items()))
+            if expiry > now:
+                break
+            self._parked.popitem(last=False)
+
+    async def wait_for(self, intent_id: str, timeout: float = 30.0) -> Optional[Dict[str, Any]]:
+        """Return the response for ``intent_id`` or ``None`` after ``timeout``."""
+        self._prune()
+        parked = self._parked.pop(intent_id, None)
+        if parked is not None:
+            return parked[1]
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(intent_id, []).append(future)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            waiters = self._waiters.get(intent_id)
+            if waiters is not None:
+                if future in waiters:
+                    waiters.remove(future)
+                if not waiters:
+                    del self._waiters[intent_id]
+
+    @property
+    def pending(self) -> int:
+        return sum(len(w) for w in self._waiters.values())
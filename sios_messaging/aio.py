@@ -0,0 +1,100 @@
+"""Non-blocking send paths for asyncio callers such as the intent gateway."""
+
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .codec import Codec, get_codec
+
+try:
+    import redis.asyncio as aioredis
+except Exception:  # pragma: no cover - redis optional
+    aioredis = None  # type: ignore
+
+# Upper bound on values sent in a single LPUSH inside a pipeline.
+PUSH_CHUNK = 500
+
+
+class AsyncBrokerClient(ABC):
+    """Send-side broker interface for code running on an event loop."""
+
+    @abstractmethod
+    async def send_intent(self, intent: Dict[str, Any]) -> None:
+        pass
+
+    async def send_intents(self, intents: List[Dict[str, Any]]) -> None:
+        for intent in intents:
+            await self.send_intent(intent)
+
+    async def close(self) -> None:
+        pass
+
+
+class ExecutorBridge(AsyncBrokerClient):
+    """Run blocking send functions on a small dedicated thread pool.
+
+    Backends without an asyncio client (Kafka, RabbitMQ, ...) go through here
+    so a slow broker round-trip occupies a bridge thread instead of the event
+    loop.  ``send_intent``/``send_intents`` are looked up on every call, which
+    lets callers pass late-bound module functions.
+    """
+
+    def __init__(
+        self,
+        send_intent: Callable[[Dict[str, Any]], None],
+        send_intents: Callable[[List[Dict[str, Any]]], None],
+        max_workers: int = 4,
+    ) -> None:
+        self._send_intent = send_intent
+        self._send_intents = send_intents
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="broker_bridge")
+
+    async def send_intent(self, intent: Dict[str, Any]) -> None:
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._send_intent, intent)
+
+    async def send_intents(self, intents: List[Dict[str, Any]]) -> None:
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._send_intents, intents)
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+class AsyncRedisBroker(AsyncBrokerClient):
+    """Native asyncio producer for :class:`~sios_messaging.redis_backend.RedisBroker` queues."""
+
+    def __init__(
+        self,
+        url: str,
+        max_connections: Optional[int] = None,
+        pool_timeout: float = 20.0,
+        client: Any = None,
+        codec: Union[str, Codec, None] = None,
+    ) -> None:
+        if client is None:
+            if aioredis is None:
+                raise RuntimeError("redis.asyncio is not available")
+            if max_connections:
+                # wait for a free connection rather than raising when all are in use
+                pool = aioredis.BlockingConnectionPool.from_url(
+                    url, max_connections=max_connections, timeout=pool_timeout
+                )
+                client = aioredis.Redis(connection_pool=pool)
+            else:
+                client = aioredis.Redis.from_url(url)
+        self._client = client
+        self._codec = get_codec(codec)
+
+    async def send_intent(self, intent: Dict[str, Any]) -> None:
+        await self._client.lpush("intents", self._codec.encode(intent))
+
+    async def send_intents(self, intents: List[Dict[str, Any]]) -> None:
+        if not intents:
+            return
+        pipe = self._client.pipeline(transaction=False)
+        for start in range(0, len(intents), PUSH_CHUNK):
+            pipe.lpush("intents", *(self._codec.encode(i) for i in intents[start:start + PUSH_CHUNK]))
+        await pipe.execute()
+
+    async def close(self) -> None:
+        await self._client.aclose()
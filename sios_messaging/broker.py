@@ -1,15 +1,40 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Generator
+from typing import Dict, Any, Generator, List
+
+# How long the default batch receive waits for stragglers after the first intent.
+BATCH_LINGER = 0.001
+
 
 class BrokerClient(ABC):
     @abstractmethod
     def send_intent(self, intent: Dict[str, Any]) -> None:
         pass
 
+    def send_intents(self, intents: List[Dict[str, Any]]) -> None:
+        """Send several intents; backends override this to batch round-trips."""
+        for intent in intents:
+            self.send_intent(intent)
+
     @abstractmethod
     def receive_intents(self, timeout: float = 1.0) -> Generator[Dict[str, Any], None, None]:
         pass
 
+    def receive_intent_batch(self, max_items: int, timeout: float = 1.0) -> List[Dict[str, Any]]:
+        """Wait up to ``timeout`` for an intent, then take whatever else is pending.
+
+        Returns at most ``max_items`` intents; an empty list means none arrived.
+        """
+        batch: List[Dict[str, Any]] = []
+        for intent in self.receive_intents(timeout):
+            batch.append(intent)
+            break
+        if batch and max_items > 1:
+            for intent in self.receive_intents(BATCH_LINGER):
+                batch.append(intent)
+                if len(batch) >= max_items:
+                    break
+        return batch
+
     @abstractmethod
     def acknowledge_intent(self, intent: Dict[str, Any]) -> None:
         pass
@@ -18,6 +43,11 @@ class BrokerClient(ABC):
     def publish_response(self, response: Dict[str, Any]) -> None:
         pass
 
+    def publish_responses(self, responses: List[Dict[str, Any]]) -> None:
+        """Publish several responses; backends override this to batch round-trips."""
+        for response in responses:
+            self.publish_response(response)
+
     @abstractmethod
     def receive_responses(self, timeout: float = 1.0) -> Generator[Dict[str, Any], None, None]:
         pass
@@ -0,0 +1,108 @@
+"""Message codecs shared by every broker backend.
+
+JSON payloads are written as plain JSON so consumers that predate the codec
+layer can still read them.  Other codecs prefix the body with a marker: the
+byte ``0xC1`` (never the first byte of a JSON text or of a msgpack value)
+followed by the codec name and a NUL.  :func:`decode` reads either form, so
+producers and consumers can switch codecs independently.
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Union
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - orjson optional
+    orjson = None  # type: ignore
+try:
+    import msgpack
+except Exception:  # pragma: no cover - msgpack optional
+    msgpack = None  # type: ignore
+
+MARKER = b"\xc1"
+
+
+class Codec(ABC):
+    name = ""
+    content_type = ""
+
+    @abstractmethod
+    def encode(self, obj: Any) -> bytes:
+        pass
+
+    @abstractmethod
+    def decode_body(self, body: bytes) -> Any:
+        pass
+
+
+class JsonCodec(Codec):
+    name = "json"
+    content_type = "application/json"
+
+    def encode(self, obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    def decode_body(self, body: bytes) -> Any:
+        return _loads_json(body)
+
+
+class OrjsonCodec(JsonCodec):
+    """JSON on the wire, produced by orjson; indistinguishable from :class:`JsonCodec`."""
+
+    name = "orjson"
+
+    def encode(self, obj: Any) -> bytes:
+        # json.dumps accepts int/float/bool/None keys; orjson only with this option
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+
+class MsgpackCodec(Codec):
+    name = "msgpack"
+    content_type = "application/msgpack"
+
+    def __init__(self) -> None:
+        self._prefix = MARKER + self.name.encode() + b"\x00"
+
+    def encode(self, obj: Any) -> bytes:
+        return self._prefix + msgpack.packb(obj, use_bin_type=True)
+
+    def decode_body(self, body: bytes) -> Any:
+        return msgpack.unpackb(body, raw=False)
+
+
+def _loads_json(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            pass  # e.g. NaN, which json.dumps emits but orjson rejects
+    return json.loads(data)
+
+
+CODECS: Dict[str, Codec] = {"json": JsonCodec()}
+if orjson is not None:
+    CODECS["orjson"] = OrjsonCodec()
+if msgpack is not None:
+    CODECS["msgpack"] = MsgpackCodec()
+
+
+def get_codec(codec: Union[str, Codec, None] = None) -> Codec:
+    """Resolve ``codec`` by name; ``None`` means ``$SIOS_CODEC`` (default ``json``)."""
+    if isinstance(codec, Codec):
+        return codec
+    name = codec or os.getenv("SIOS_CODEC", "json")
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise ValueError(f"Unknown or unavailable codec: {name}") from None
+
+
+def decode(data: Union[bytes, str]) -> Any:
+    """Decode a payload written by any codec."""
+    if isinstance(data, (bytes, bytearray, memoryview)) and data[:1] == MARKER:
+        data = bytes(data)
+        end = data.index(b"\x00", 1)
+        return get_codec(data[1:end].decode()).decode_body(data[end + 1:])
+    return _loads_json(data)
@@ -1,22 +1,60 @@
-from typing import Dict, Any, Generator
-from queue import Queue, Empty
+import threading
+from collections import deque
+from typing import Dict, Any, Generator, Deque, List
 from .broker import BrokerClient
 
+
+class _ConditionQueue:
+    """FIFO whose consumers sleep on a condition until an item arrives."""
+
+    def __init__(self) -> None:
+        self._items: Deque[Dict[str, Any]] = deque()
+        self._ready = threading.Condition()
+
+    def put(self, item: Dict[str, Any]) -> None:
+        with self._ready:
+            self._items.append(item)
+            self._ready.notify()
+
+    def put_many(self, items: List[Dict[str, Any]]) -> None:
+        with self._ready:
+            self._items.extend(items)
+            self._ready.notify(len(items))
+
+    def drain(self, timeout: float) -> Generator[Dict[str, Any], None, None]:
+        """Yield items as they arrive until none shows up within ``timeout``."""
+        while True:
+            with self._ready:
+                if not self._ready.wait_for(lambda: self._items, timeout):
+                    break
+                item = self._items.popleft()
+            yield item
+
+    def drain_batch(self, max_items: int, timeout: float) -> List[Dict[str, Any]]:
+        """Wait up to ``timeout`` for one item, then pop up to ``max_items``."""
+        with self._ready:
+            if not self._ready.wait_for(lambda: self._items, timeout):
+                return []
+            count = min(max_items, len(self._items))
+            return [self._items.popleft() for _ in range(count)]
+
+
 class InMemoryBroker(BrokerClient):
     def __init__(self) -> None:
-        self._intent_queue: Queue = Queue()
-        self._response_queue: Queue = Queue()
+        self._intent_queue = _ConditionQueue()
+        self._response_queue = _ConditionQueue()
 
     def send_intent(self, intent: Dict[str, Any]) -> None:
         self._intent_queue.put(intent)
 
+    def send_intents(self, intents: List[Dict[str, Any]]) -> None:
+        self._intent_queue.put_many(intents)
+
     def receive_intents(self, timeout: float = 1.0) -> Generator[Dict[str, Any], None, None]:
-        while True:
-            try:
-                intent = self._intent_queue.get(timeout=timeout)
-                yield intent
-            except Empty:
-                break
+        yield from self._intent_queue.drain(timeout)
+
+    def receive_intent_batch(self, max_items: int, timeout: float = 1.0) -> List[Dict[str, Any]]:
+        return self._intent_queue.drain_batch(max_items, timeout)
 
     def acknowledge_intent(self, intent: Dict[str, Any]) -> None:
         # no-op for in-memory
@@ -25,10 +63,8 @@ class InMemoryBroker(BrokerClient):
     def publish_response(self, response: Dict[str, Any]) -> None:
         self._response_queue.put(response)
 
+    def publish_responses(self, responses: List[Dict[str, Any]]) -> None:
+        self._response_queue.put_many(responses)
+
     def receive_responses(self, timeout: float = 1.0) -> Generator[Dict[str, Any], None, None]:
-        while True:
-            try:
-                resp = self._response_queue.get(timeout=timeout)
-                yield resp
-            except Empty:
-                break
+        yield from self._response_queue.drain(timeout)
@@ -1,22 +1,101 @@
 """Kafka broker implementation."""
 
-from typing import Dict, Any, Generator
-import json
-from kafka import KafkaProducer, KafkaConsumer
+from collections import deque
+from typing import Dict, Any, Deque, Generator, List, Optional, Tuple, Union
+import logging
+import threading
+from kafka import KafkaProducer, KafkaConsumer, TopicPartition, ConsumerRebalanceListener
+from kafka.structs import OffsetAndMetadata
 
 from .broker import BrokerClient
+from .codec import Codec, decode, get_codec
+
+logger = logging.getLogger(__name__)
+
+
+def _offset(offset: int) -> OffsetAndMetadata:
+    # kafka-python 2.1 added a leader_epoch field to OffsetAndMetadata
+    extra = (-1,) * (len(OffsetAndMetadata._fields) - 2)
+    return OffsetAndMetadata(offset, "", *extra)
+
+
+class _PartitionOffsets:
+    """Delivered offsets of one partition, committed only once contiguous.
+
+    Intents may finish out of order on a worker pool; the committed offset
+    only advances past records whose predecessors have all been acknowledged.
+    """
+
+    def __init__(self) -> None:
+        self._delivered: Deque[int] = deque()
+        self._acked: set = set()
+
+    def delivered(self, offset: int) -> None:
+        self._delivered.append(offset)
+
+    def acked(self, offset: int) -> None:
+        self._acked.add(offset)
+
+    def committable(self) -> Optional[int]:
+        last = None
+        while self._delivered and self._delivered[0] in self._acked:
+            last = self._delivered.popleft()
+            self._acked.discard(last)
+        return None if last is None else last + 1
+
+
+class _RevokeListener(ConsumerRebalanceListener):
+    def __init__(self, broker: "KafkaBroker") -> None:
+        self.broker = broker
+
+    def on_partitions_revoked(self, revoked) -> None:
+        self.broker._commit_acked()
+        with self.broker._lock:
+            for tp in revoked:
+                self.broker._offsets.pop(tp, None)
+
+    def on_partitions_assigned(self, assigned) -> None:
+        pass
 
 
 class KafkaBroker(BrokerClient):
-    def __init__(self, bootstrap_servers: str) -> None:
-        self._producer = KafkaProducer(bootstrap_servers=bootstrap_servers)
+    """Kafka transport with batched async produce and manual offset commits.
+
+    Sends are not flushed per message; ``linger_ms``/``batch_size`` let the
+    producer group them and delivery failures are logged from callbacks.
+    Records are keyed by ``partition_key`` ("intent" or "intent_id") so
+    members of the consumer group work on different partitions in parallel.
+    Offsets are committed once :meth:`acknowledge_intent` has been called for
+    every earlier record of the partition; commits happen on the polling
+    thread because ``KafkaConsumer`` is not thread-safe.
+    """
+
+    def __init__(
+        self,
+        bootstrap_servers: str,
+        linger_ms: int = 5,
+        batch_size: int = 64 * 1024,
+        partition_key: str = "intent",
+        max_poll_records: int = 500,
+        codec: Union[str, Codec, None] = None,
+    ) -> None:
+        self._codec = get_codec(codec)
+        self.partition_key = partition_key
+        self.max_poll_records = max_poll_records
+        self._producer = KafkaProducer(
+            bootstrap_servers=bootstrap_servers,
+            linger_ms=linger_ms,
+            batch_size=batch_size,
+            acks=1,
+        )
         self._consumer = KafkaConsumer(
-            "intents",
             bootstrap_servers=bootstrap_servers,
             auto_offset_reset="earliest",
-            enable_auto_commit=True,
+            enable_auto_commit=False,
             group_id="sios",
+            max_poll_records=max_poll_records,
         )
+        self._consumer.subscribe(["intents"], listener=_RevokeListener(self))
         self._response_consumer = KafkaConsumer(
             "responses",
             bootstrap_servers=bootstrap_servers,
@@ -24,24 +103,84 @@ class KafkaBroker(BrokerClient):
             enable_auto_commit=True,
             group_id="sios-resp",
         )
+        self._lock = threading.Lock()
+        self._offsets: Dict[TopicPartition, _PartitionOffsets] = {}
+        # id(intent) -> (intent, partition, offset) until acknowledged
+        self._unacked: Dict[int, Tuple[Dict[str, Any], TopicPartition, int]] = {}
+
+    def _key(self, message: Dict[str, Any]) -> Optional[bytes]:
+        value = message.get(self.partition_key)
+        return str(value).encode() if value is not None else None
+
+    def _send(self, topic: str, message: Dict[str, Any]) -> None:
+        future = self._producer.send(topic, self._codec.encode(message), key=self._key(message))
+        future.add_errback(
+            lambda exc: logger.error("Delivery to %s failed for %s: %s", topic, message.get("intent_id"), exc)
+        )
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until every buffered message has been delivered."""
+        self._producer.flush(timeout)
+
+    def _poll(self, timeout: float, max_records: int) -> List[Dict[str, Any]]:
+        self._commit_acked()
+        batch = self._consumer.poll(timeout_ms=int(timeout * 1000), max_records=max_records)
+        intents = []
+        with self._lock:
+            for tp, records in batch.items():
+                offsets = self._offsets.setdefault(tp, _PartitionOffsets())
+                for record in records:
+                    intent = decode(record.value)
+                    offsets.delivered(record.offset)
+                    self._unacked[id(intent)] = (intent, tp, record.offset)
+                    intents.append(intent)
+        return intents
+
+    def _commit_acked(self) -> None:
+        with self._lock:
+            commits = {}
+            for tp, offsets in self._offsets.items():
+                offset = offsets.committable()
+                if offset is not None:
+                    commits[tp] = _offset(offset)
+        if commits:
+            self._consumer.commit(commits)
 
     def send_intent(self, intent: Dict[str, Any]) -> None:
-        self._producer.send("intents", json.dumps(intent).encode())
-        self._producer.flush()
+        self._send("intents", intent)
+
+    def send_intents(self, intents: List[Dict[str, Any]]) -> None:
+        for intent in intents:
+            self._send("intents", intent)
 
     def receive_intents(self, timeout: float = 1.0) -> Generator[Dict[str, Any], None, None]:
-        for msg in self._consumer.poll(timeout_ms=int(timeout * 1000)).values():
-            for record in msg:
-                yield json.loads(record.value)
+        while True:
+            intents = self._poll(timeout, self.max_poll_records)
+            if not intents:
+                break
+            yield from intents
+
+    def receive_intent_batch(self, max_items: int, timeout: float = 1.0) -> List[Dict[str, Any]]:
+        return self._poll(timeout, max_items)
 
     def acknowledge_intent(self, intent: Dict[str, Any]) -> None:
-        pass
+        with self._lock:
+            tracked = self._unacked.pop(id(intent), None)
+            if tracked is None:
+                return
+            _, tp, offset = tracked
+            offsets = self._offsets.get(tp)
+            if offsets is not None:
+                offsets.acked(offset)
 
     def publish_response(self, response: Dict[str, Any]) -> None:
-        self._producer.send("responses", json.dumps(response).encode())
-        self._producer.flush()
+        self._send("responses", response)
+
+    def publish_responses(self, responses: List[Dict[str, Any]]) -> None:
+        for response in responses:
+            self._send("responses", response)
 
     def receive_responses(self, timeout: float = 1.0) -> Generator[Dict[str, Any], None, None]:
         for msg in self._response_consumer.poll(timeout_ms=int(timeout * 1000)).values():
             for record in msg:
-                yield json.loads(record.value)
+                yield decode(record.value)
@@ -1,46 +1,167 @@
 """RabbitMQ broker implementation."""
 
-from typing import Dict, Any, Generator
-import json
+from collections import deque
+from functools import partial
+from typing import Dict, Any, Deque, Generator, List, Optional, Tuple, Union
+import threading
+import time
 import pika
 
 from .broker import BrokerClient
+from .codec import Codec, decode, get_codec
 
 
 class RabbitMQBroker(BrokerClient):
-    def __init__(self, url: str) -> None:
-        params = pika.URLParameters(url)
-        self._connection = pika.BlockingConnection(params)
-        self._channel = self._connection.channel()
-        self._channel.queue_declare(queue="intents", durable=True)
-        self._channel.queue_declare(queue="responses", durable=True)
+    """Push-based RabbitMQ transport.
+
+    Intents are delivered by ``basic_consume`` with a ``basic_qos`` prefetch
+    window and are only acked from :meth:`acknowledge_intent`.  Publishing uses
+    its own connection and channel, guarded by a lock, because pika's blocking
+    connections are not thread-safe and responses are published from worker
+    threads.  A bulk send runs inside an AMQP transaction on a second channel,
+    so the broker confirms it once per batch rather than once per message;
+    single messages are plain publishes and wait for no round-trip.
+    Consumers start lazily so a gateway never competes for intents and
+    AgentCore never competes for responses.
+    """
+
+    def __init__(self, url: str, prefetch: int = 100, codec: Union[str, Codec, None] = None) -> None:
+        self._params = pika.URLParameters(url)
+        self._codec = get_codec(codec)
+        self.prefetch = prefetch
+        self._publish_lock = threading.Lock()
+        self._publish_connection: Optional[pika.BlockingConnection] = None
+        self._publish_channel = None
+        self._tx_channel = None
+        self._open_publisher()
+        self._consume_connection = pika.BlockingConnection(self._params)
+        self._intent_channel = None
+        self._response_channel = None
+        self._intents: Deque[Tuple[int, bytes]] = deque()
+        self._responses: Deque[bytes] = deque()
+        # id(intent) -> (intent, delivery tag) until acknowledged
+        self._unacked: Dict[int, Tuple[Dict[str, Any], int]] = {}
+
+    def _open_publisher(self) -> None:
+        self._publish_connection = pika.BlockingConnection(self._params)
+        self._publish_channel = self._publish_connection.channel()
+        self._publish_channel.queue_declare(queue="intents", durable=True)
+        self._publish_channel.queue_declare(queue="responses", durable=True)
+        self._tx_channel = self._publish_connection.channel()
+        self._tx_channel.tx_select()
+
+    def _publish(self, routing_key: str, messages: List[Dict[str, Any]]) -> None:
+        if not messages:
+            return
+        batch = len(messages) > 1
+        with self._publish_lock:
+            for attempt in (1, 2):
+                channel = self._tx_channel if batch else self._publish_channel
+                try:
+                    for message in messages:
+                        channel.basic_publish(
+                            exchange="",
+                            routing_key=routing_key,
+                            body=self._codec.encode(message),
+                            properties=pika.BasicProperties(
+                                delivery_mode=2, content_type=self._codec.content_type
+                            ),
+                        )
+                    if batch:
+                        channel.tx_commit()
+                    return
+                except pika.exceptions.AMQPConnectionError:
+                    # the idle publisher may have missed heartbeats; the
+                    # uncommitted transaction was discarded, so resend it all
+                    if attempt == 2:
+                        raise
+                    self._open_publisher()
+
+    def _start_intent_consumer(self) -> None:
+        if self._intent_channel is None:
+            self._intent_channel = self._consume_connection.channel()
+            self._intent_channel.queue_declare(queue="intents", durable=True)
+            self._intent_channel.basic_qos(prefetch_count=self.prefetch)
+            self._intent_channel.basic_consume(
+                "intents",
+                lambda ch, method, props, body: self._intents.append((method.delivery_tag, body)),
+                auto_ack=False,
+            )
+
+    def _start_response_consumer(self) -> None:
+        if self._response_channel is None:
+            self._response_channel = self._consume_connection.channel()
+            self._response_channel.queue_declare(queue="responses", durable=True)
+            self._response_channel.basic_qos(prefetch_count=self.prefetch)
+            self._response_channel.basic_consume(
+                "responses",
+                lambda ch, method, props, body: self._responses.append(body),
+                auto_ack=True,
+            )
+
+    def _wait(self, buffer: Deque, timeout: float) -> None:
+        """Process connection events until ``buffer`` has data or ``timeout`` passes."""
+        deadline = time.monotonic() + timeout
+        while not buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._consume_connection.process_data_events(time_limit=remaining)
 
     def send_intent(self, intent: Dict[str, Any]) -> None:
-        self._channel.basic_publish(
-            exchange="",
-            routing_key="intents",
-            body=json.dumps(intent).encode(),
-            properties=pika.BasicProperties(delivery_mode=2),
-        )
+        self._publish("intents", [intent])
+
+    def send_intents(self, intents: List[Dict[str, Any]]) -> None:
+        self._publish("intents", intents)
+
+    def _next_intent(self, timeout: float) -> Optional[Dict[str, Any]]:
+        if not self._intents:
+            self._wait(self._intents, timeout)
+            if not self._intents:
+                return None
+        tag, body = self._intents.popleft()
+        intent = decode(body)
+        self._unacked[id(intent)] = (intent, tag)
+        return intent
 
     def receive_intents(self, timeout: float = 1.0) -> Generator[Dict[str, Any], None, None]:
-        method_frame, _, body = self._channel.basic_get("intents", auto_ack=False)
-        if method_frame:
-            yield json.loads(body)
-            self._channel.basic_ack(method_frame.delivery_tag)
+        self._start_intent_consumer()
+        while True:
+            intent = self._next_intent(timeout)
+            if intent is None:
+                break
+            yield intent
+
+    def receive_intent_batch(self, max_items: int, timeout: float = 1.0) -> List[Dict[str, Any]]:
+        self._start_intent_consumer()
+        batch: List[Dict[str, Any]] = []
+        intent = self._next_intent(timeout)
+        while intent is not None:
+            batch.append(intent)
+            if len(batch) >= max_items:
+                break
+            intent = self._next_intent(0)
+        return batch
 
     def acknowledge_intent(self, intent: Dict[str, Any]) -> None:
-        pass
+        tracked = self._unacked.pop(id(intent), None)
+        if tracked is not None:
+            # Acks may come from worker threads; run them on the consumer's thread.
+            self._consume_connection.add_callback_threadsafe(
+                partial(self._intent_channel.basic_ack, tracked[1])
+            )
 
     def publish_response(self, response: Dict[str, Any]) -> None:
-        self._channel.basic_publish(
-            exchange="",
-            routing_key="responses",
-            body=json.dumps(response).encode(),
-            properties=pika.BasicProperties(delivery_mode=2),
-        )
+        self._publish("responses", [response])
+
+    def publish_responses(self, responses: List[Dict[str, Any]]) -> None:
+        self._publish("responses", responses)
 
     def receive_responses(self, timeout: float = 1.0) -> Generator[Dict[str, Any], None, None]:
-        method_frame, _, body = self._channel.basic_get("responses", auto_ack=True)
-        if method_frame:
-            yield json.loads(body)
+        self._start_response_consumer()
+        while True:
+            if not self._responses:
+                self._wait(self._responses, timeout)
+                if not self._responses:
+                    break
+            yield decode(self._responses.popleft())
@@ -1,34 +1,111 @@
-import json
-from typing import Dict, Any, Generator
+from typing import Dict, Any, Generator, List, Optional, Union
 import redis
 from .broker import BrokerClient
+from .codec import Codec, decode, get_codec
+
+# Upper bound on values sent in a single LPUSH inside a pipeline.
+PUSH_CHUNK = 500
+
 
 class RedisBroker(BrokerClient):
-    def __init__(self, url: str) -> None:
-        self._client = redis.Redis.from_url(url)
+    """Intents and responses on Redis lists.
+
+    Popped items are gone from Redis, so ``receive_intents`` takes one per
+    round-trip by default.  A larger ``receive_batch`` saves round-trips but
+    holds that many intents in this process: a crash loses all of them, and
+    one consumer can take work another replica is idle for.
+    ``receive_intent_batch`` always pops as many as its caller asks for.
+
+    With ``max_connections`` set, a caller that finds every connection in use
+    waits up to ``pool_timeout`` seconds for one instead of failing.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_connections: Optional[int] = None,
+        receive_batch: int = 1,
+        pool_timeout: float = 20.0,
+        client: Optional[redis.Redis] = None,
+        codec: Union[str, Codec, None] = None,
+    ) -> None:
+        if client is None:
+            if max_connections:
+                pool = redis.BlockingConnectionPool.from_url(
+                    url, max_connections=max_connections, timeout=pool_timeout
+                )
+            else:
+                pool = redis.ConnectionPool.from_url(url)
+            client = redis.Redis(connection_pool=pool)
+        self._client = client
+        self._codec = get_codec(codec)
+        self.receive_batch = receive_batch
+        self._has_blmpop = True
+
+    def _push(self, key: str, items: List[Dict[str, Any]]) -> None:
+        if not items:
+            return
+        pipe = self._client.pipeline(transaction=False)
+        for start in range(0, len(items), PUSH_CHUNK):
+            pipe.lpush(key, *(self._codec.encode(item) for item in items[start:start + PUSH_CHUNK]))
+        pipe.execute()
+
+    def _pop(self, key: str, max_items: int, timeout: float) -> List[bytes]:
+        """Block up to ``timeout`` for one item, then take up to ``max_items`` in total."""
+        if self._has_blmpop:
+            try:
+                item = self._client.blmpop(timeout, 1, key, direction="RIGHT", count=max_items)
+                return item[1] if item else []
+            except redis.ResponseError as exc:
+                if "unknown command" not in str(exc).lower():
+                    raise
+                # BLMPOP needs Redis 7; fall back to BRPOP + RPOP count (6.2)
+                self._has_blmpop = False
+        item = self._client.brpop(key, timeout=timeout)
+        if item is None:
+            return []
+        values = [item[1]]
+        if max_items > 1:
+            values.extend(self._client.rpop(key, max_items - 1) or [])
+        return values
+
+    def _drain(self, key: str, timeout: float) -> Generator[Dict[str, Any], None, None]:
+        pending: List[bytes] = []
+        try:
+            while True:
+                pending = self._pop(key, self.receive_batch, timeout)
+                if not pending:
+                    break
+                while pending:
+                    data = pending.pop(0)
+                    yield decode(data)
+        finally:
+            if pending:
+                # The consumer stopped early: put unread items back at the
+                # consuming end so they are next in line, in their original order.
+                self._client.rpush(key, *reversed(pending))
 
     def send_intent(self, intent: Dict[str, Any]) -> None:
-        self._client.lpush("intents", json.dumps(intent))
+        self._client.lpush("intents", self._codec.encode(intent))
+
+    def send_intents(self, intents: List[Dict[str, Any]]) -> None:
+        self._push("intents", intents)
 
     def receive_intents(self, timeout: float = 1.0) -> Generator[Dict[str, Any], None, None]:
-        while True:
-            item = self._client.brpop("intents", timeout=timeout)
-            if item is None:
-                break
-            _, data = item
-            yield json.loads(data)
+        yield from self._drain("intents", timeout)
+
+    def receive_intent_batch(self, max_items: int, timeout: float = 1.0) -> List[Dict[str, Any]]:
+        return [decode(data) for data in self._pop("intents", max_items, timeout)]
 
     def acknowledge_intent(self, intent: Dict[str, Any]) -> None:
         # Redis lists do not require explicit ack
         pass
 
     def publish_response(self, response: Dict[str, Any]) -> None:
-        self._client.lpush("responses", json.dumps(response))
+        self._client.lpush("responses", self._codec.encode(response))
+
+    def publish_responses(self, responses: List[Dict[str, Any]]) -> None:
+        self._push("responses", responses)
 
     def receive_responses(self, timeout: float = 1.0) -> Generator[Dict[str, Any], None, None]:
-        while True:
-            item = self._client.brpop("responses", timeout=timeout)
-            if item is None:
-                break
-            _, data = item
-            yield json.loads(data)
+        yield from self._drain("responses", timeout)
@@ -0,0 +1,206 @@
+"""Redis Streams broker with consumer groups and explicit acknowledgements."""
+
+import logging
+import os
+import socket
+import time
+from typing import Dict, Any, Generator, List, Optional, Tuple, Union
+
+import redis
+
+from .broker import BrokerClient
+from .codec import Codec, decode, get_codec
+
+logger = logging.getLogger(__name__)
+
+INTENTS = "intents"
+RESPONSES = "responses"
+
+
+class RedisStreamsBroker(BrokerClient):
+    """At-least-once intent delivery shared by many AgentCore replicas.
+
+    Intents are read with ``XREADGROUP`` and stay pending until
+    :meth:`acknowledge_intent` sends ``XACK``.  Entries left pending by a
+    consumer that died are taken over with ``XAUTOCLAIM`` once they have been
+    idle for ``claim_idle`` seconds.
+
+    Every ``trim_interval`` seconds a write also calls :meth:`trim`.  That
+    removes only entries every consumer group has read and acknowledged, so
+    unread or pending intents are never lost.  Setting ``maxlen`` also caps
+    the streams at that length.  The cap deletes the oldest entries whether
+    or not they were handled, so only use it when losing a backlog is better
+    than running out of memory.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        group: str = "sios",
+        consumer: Optional[str] = None,
+        count: int = 100,
+        maxlen: Optional[int] = None,
+        trim_interval: Optional[float] = 60.0,
+        claim_idle: float = 60.0,
+        claim_interval: float = 5.0,
+        client: Optional[redis.Redis] = None,
+        codec: Union[str, Codec, None] = None,
+    ) -> None:
+        self._client = client or redis.Redis.from_url(url)
+        self._codec = get_codec(codec)
+        self.group = group
+        self.response_group = f"{group}-resp"
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.count = count
+        self.maxlen = maxlen
+        self.trim_interval = trim_interval
+        self._last_trim = time.monotonic()
+        self.claim_idle = claim_idle
+        self.claim_interval = claim_interval
+        self._last_claim = 0.0
+        # id(intent) -> (intent, entry id); holding the intent keeps its id unique
+        self._unacked: Dict[int, Tuple[Dict[str, Any], bytes]] = {}
+        self._ensure_group(INTENTS, self.group)
+        self._ensure_group(RESPONSES, self.response_group)
+
+    def _ensure_group(self, stream: str, group: str) -> None:
+        try:
+            self._client.xgroup_create(stream, group, id="0", mkstream=True)
+        except redis.ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+
+    def _add(self, stream: str, items: List[Dict[str, Any]]) -> None:
+        pipe = self._client.pipeline(transaction=False)
+        for item in items:
+            pipe.xadd(stream, {"data": self._codec.encode(item)})
+        pipe.execute()
+        if self.trim_interval is not None:
+            now = time.monotonic()
+            if now - self._last_trim >= self.trim_interval:
+                self._last_trim = now
+                self.trim()
+
+    def _decode(self, entries: List[Tuple[bytes, Dict[bytes, bytes]]]) -> List[Tuple[bytes, Dict[str, Any]]]:
+        decoded = []
+        for entry_id, fields in entries:
+            if fields is None:
+                # XAUTOCLAIM on Redis 6.2 reports entries deleted while pending this way
+                logger.warning("Pending stream entry %s was deleted before it was handled", entry_id)
+                self._client.xack(INTENTS, self.group, entry_id)
+                continue
+            try:
+                decoded.append((entry_id, decode(fields[b"data"])))
+            except (KeyError, ValueError):
+                logger.error("Dropping malformed stream entry %s", entry_id)
+                self._client.xack(INTENTS, self.group, entry_id)
+        return decoded
+
+    def _read(self, count: int, timeout: float) -> List[Tuple[bytes, Dict[str, Any]]]:
+        now = time.monotonic()
+        if now - self._last_claim >= self.claim_interval:
+            self._last_claim = now
+            claimed = self.reclaim(count)
+            if claimed:
+                return claimed
+        block = int(timeout * 1000) or None
+        result = self._client.xreadgroup(
+            self.group, self.consumer, {INTENTS: ">"}, count=count, block=block
+        )
+        if not result:
+            return []
+        return self._decode(result[0][1])
+
+    def _track(self, entries: List[Tuple[bytes, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        intents = []
+        for entry_id, intent in entries:
+            self._unacked[id(intent)] = (intent, entry_id)
+            intents.append(intent)
+        return intents
+
+    def reclaim(self, count: Optional[int] = None) -> List[Tuple[bytes, Dict[str, Any]]]:
+        """Take over intents another consumer left pending for ``claim_idle`` seconds."""
+        result = self._client.xautoclaim(
+            INTENTS,
+            self.group,
+            self.consumer,
+            min_idle_time=int(self.claim_idle * 1000),
+            start_id="0-0",
+            count=count or self.count,
+        )
+        if len(result) > 2 and result[2]:
+            # Redis 7 drops deleted entries from the PEL and lists their ids here
+            logger.warning("%d pending stream entries were deleted before they were handled", len(result[2]))
+        return self._decode(result[1])
+
+    def _handled_below(self, stream: str) -> Optional[bytes]:
+        """Return the oldest id some consumer group may still need from ``stream``."""
+        bound = None
+        for group in self._client.xinfo_groups(stream):
+            needed = [group["last-delivered-id"]]
+            if group["pending"]:
+                needed.append(self._client.xpending(stream, group["name"])["min"])
+            for entry_id in needed:
+                if bound is None or _id_key(entry_id) < _id_key(bound):
+                    bound = entry_id
+        return bound
+
+    def trim(self, maxlen: Optional[int] = None, approximate: bool = True) -> None:
+        """Drop entries every group has read and acknowledged; then apply ``maxlen``, if any.
+
+        The MINID trim never removes an unread or pending entry.  A ``maxlen``
+        cap (this argument or the broker's own) does, once a stream is longer.
+        """
+        maxlen = maxlen or self.maxlen
+        for stream in (INTENTS, RESPONSES):
+            minid = self._handled_below(stream)
+            if minid is not None:
+                self._client.xtrim(stream, minid=minid, approximate=approximate)
+            if maxlen:
+                self._client.xtrim(stream, maxlen=maxlen, approximate=approximate)
+
+    def send_intent(self, intent: Dict[str, Any]) -> None:
+        self._add(INTENTS, [intent])
+
+    def send_intents(self, intents: List[Dict[str, Any]]) -> None:
+        self._add(INTENTS, intents)
+
+    def receive_intents(self, timeout: float = 1.0) -> Generator[Dict[str, Any], None, None]:
+        while True:
+            entries = self._read(self.count, timeout)
+            if not entries:
+                break
+            yield from self._track(entries)
+
+    def receive_intent_batch(self, max_items: int, timeout: float = 1.0) -> List[Dict[str, Any]]:
+        return self._track(self._read(max_items, timeout))
+
+    def acknowledge_intent(self, intent: Dict[str, Any]) -> None:
+        tracked = self._unacked.pop(id(intent), None)
+        if tracked is not None:
+            self._client.xack(INTENTS, self.group, tracked[1])
+
+    def publish_response(self, response: Dict[str, Any]) -> None:
+        self._add(RESPONSES, [response])
+
+    def publish_responses(self, responses: List[Dict[str, Any]]) -> None:
+        self._add(RESPONSES, responses)
+
+    def receive_responses(self, timeout: float = 1.0) -> Generator[Dict[str, Any], None, None]:
+        block = int(timeout * 1000) or None
+        while True:
+            result = self._client.xreadgroup(
+                self.response_group, self.consumer, {RESPONSES: ">"},
+                count=self.count, block=block, noack=True,
+            )
+            if not result:
+                break
+            for _, fields in result[0][1]:
+                yield decode(fields[b"data"])
+
+
+def _id_key(entry_id: Union[bytes, str]) -> Tuple[int, int]:
+    if isinstance(entry_id, bytes):
+        entry_id = entry_id.decode()
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
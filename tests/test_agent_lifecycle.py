@@ -0,0 +1,114 @@
+import threading
+import time
+
+import agent_core
+from agent_lifecycle import AgentLifecycleManager
+from cognition_lattice.base_agent import BaseAgent
+
+
+class CountingAgent(BaseAgent):
+    intent_types = ["echo"]
+    created = 0
+    torn_down = 0
+
+    def setup(self):
+        type(self).created += 1
+
+    def teardown(self):
+        type(self).torn_down += 1
+
+    def execute(self, intent):
+        return {"status": "ok", "echo": intent.get("args"), "agent": id(self)}
+
+
+def _agent_cls(**attrs):
+    return type("TmpAgent", (CountingAgent,), {"created": 0, "torn_down": 0, **attrs})
+
+
+def test_instances_are_reused():
+    cls = _agent_cls()
+    manager = AgentLifecycleManager()
+    seen = set()
+    for _ in range(5):
+        with manager.acquire(cls) as agent:
+            seen.add(id(agent))
+    assert len(seen) == 1
+    assert cls.created == 1
+
+
+def test_pool_size_bounds_exclusive_checkout():
+    cls = _agent_cls(pool_size=2)
+    manager = AgentLifecycleManager()
+    with manager.acquire(cls) as a, manager.acquire(cls) as b:
+        assert a is not b
+        acquired = threading.Event()
+
+        def third():
+            with manager.acquire(cls):
+                acquired.set()
+
+        t = threading.Thread(target=third)
+        t.start()
+        time.sleep(0.05)
+        assert not acquired.is_set()
+    t.join(timeout=1)
+    assert acquired.is_set()
+    assert cls.created == 2
+
+
+def test_thread_safe_instances_are_shared():
+    cls = _agent_cls(thread_safe=True)
+    manager = AgentLifecycleManager()
+    with manager.acquire(cls) as a, manager.acquire(cls) as b:
+        assert a is b
+
+
+def test_retire_hands_off_in_flight_instances():
+    old = _agent_cls(pool_size=2)
+    new = _agent_cls()
+    manager = AgentLifecycleManager()
+    manager.warm(old)
+    with manager.acquire(old):
+        manager.retain([new])
+        # the idle instance goes at once, the busy one when released
+        assert old.torn_down == 1
+    assert old.torn_down == 2
+    with manager.acquire(new):
+        pass
+    assert new.created == 1
+
+
+def test_retire_wakes_waiting_checkout():
+    old = _agent_cls()
+    manager = AgentLifecycleManager()
+    acquired = threading.Event()
+
+    def dispatch():
+        with manager.acquire(old):
+            acquired.set()
+
+    with manager.acquire(old):
+        waiter = threading.Thread(target=dispatch, daemon=True)
+        waiter.start()
+        time.sleep(0.05)
+        assert not acquired.is_set()
+        manager.retain([])
+        assert acquired.wait(2)
+    waiter.join(2)
+    # the waiter got a throwaway instance; both are torn down after use
+    assert old.created == 2
+    assert old.torn_down == 2
+
+
+def test_agent_core_reuses_warm_instances(monkeypatch):
+    monkeypatch.setattr(agent_core.AgentCore, '_start_watcher', lambda self: None)
+    monkeypatch.setattr(agent_core, 'start_metrics_server', lambda port=8001: None)
+    core = agent_core.AgentCore()
+    cls = _agent_cls()
+    core.registry["echo"] = cls
+    core.lifecycle.warm(cls)
+    results = [core.dispatch({"intent": "echo", "args": "hi", "intent_id": str(i)}) for i in range(3)]
+    assert len({r["agent"] for r in results}) == 1
+    assert cls.created == 1
+    core.lifecycle.shutdown()
+    assert cls.torn_down == 1
@@ -0,0 +1,82 @@
+import asyncio
+import json
+import os
+import textwrap
+
+import pytest
+
+from agent_core import AgentMesh
+
+AGENTS = textwrap.dedent('''
+    import asyncio
+    import os
+    import threading
+
+
+    async def slow(message, context):
+        await asyncio.sleep(0.2)
+        return message.reply({"mesh": context.mesh is not None})
+
+
+    def crunch(message, context):
+        total = sum(range(100_000))
+        return message.reply({
+            "total": total,
+            "pid": os.getpid(),
+            "thread": threading.current_thread().name,
+            "mesh": context.mesh is not None,
+        })
+    crunch.executor = "io"
+''')
+
+
+@pytest.fixture
+def manifest_dir(tmp_path, monkeypatch):
+    (tmp_path / "mesh_test_agents.py").write_text(AGENTS)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    return manifests
+
+
+def _write(manifest_dir, manifest):
+    (manifest_dir / f"{manifest['id']}.json").write_text(json.dumps(manifest))
+
+
+@pytest.mark.asyncio
+async def test_cpu_threads_sets_concurrency(manifest_dir):
+    _write(manifest_dir, {
+        "id": "slow", "module": "mesh_test_agents", "function": "slow",
+        "subscriptions": ["slow.*"], "capabilities": {"cpu_threads": 4},
+    })
+    mesh = AgentMesh(str(manifest_dir))
+    await mesh.start()
+    await asyncio.sleep(0.05)
+    try:
+        replies = await mesh.message_bus.request_many([(f"slow.{i}", None) for i in range(4)], timeout=0.5)
+        assert all(r.payload["mesh"] for r in replies)
+    finally:
+        await mesh.stop()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("executor", ["io", "cpu"])
+async def test_executor_offload(manifest_dir, executor):
+    _write(manifest_dir, {
+        "id": "crunch", "module": "mesh_test_agents", "function": "crunch",
+        "subscriptions": ["crunch.*"], "capabilities": {"executor": executor, "cpu_threads": 2},
+    })
+    mesh = AgentMesh(str(manifest_dir))
+    await mesh.start()
+    await asyncio.sleep(0.05)
+    try:
+        reply = await mesh.message_bus.request("crunch.run", timeout=10)
+        assert reply.payload["total"] == sum(range(100_000))
+        assert reply.payload["mesh"] is False
+        if executor == "io":
+            assert reply.payload["thread"].startswith("io_worker")
+        else:
+            assert reply.payload["pid"] != os.getpid()
+    finally:
+        await mesh.stop()
+    assert mesh.resource_manager is None
@@ -1,6 +1,10 @@
 import importlib
+import threading
+import time
 from pathlib import Path
 
+from watchdog.events import FileCreatedEvent, FileModifiedEvent, FileOpenedEvent
+
 import agent_core
 
 
@@ -38,3 +42,77 @@ def test_dynamic_agent_registration(monkeypatch):
             a_file.unlink()
         if b_file.exists():
             b_file.unlink()
+
+
+def _core(monkeypatch):
+    monkeypatch.setattr(agent_core.AgentCore, '_start_watcher', lambda self: None)
+    monkeypatch.setattr(agent_core, 'start_metrics_server', lambda port=8001: None)
+    return agent_core.AgentCore()
+
+
+def test_incremental_reload_only_imports_changed_file(monkeypatch):
+    agents_dir = Path('cognition_lattice/agents')
+    a_file = agents_dir / 'tmp_agent_c.py'
+    _write_agent(a_file, 'TmpAgentC', 'c')
+    try:
+        core = _core(monkeypatch)
+        assert 'c' in core.registry
+        reloaded = []
+        real_reload = importlib.reload
+
+        def spy(module):
+            reloaded.append(module.__name__)
+            return real_reload(module)
+
+        monkeypatch.setattr(importlib, 'reload', spy)
+        _write_agent(a_file, 'TmpAgentC', 'c2')
+        importlib.invalidate_caches()
+        core._load_agents([str(a_file)])
+        assert reloaded == ['cognition_lattice.agents.tmp_agent_c']
+        assert 'c2' in core.registry and 'c' not in core.registry
+        assert 'echo' in core.registry
+
+        a_file.write_text('this is not python')
+        core._load_agents([str(a_file)])
+        assert 'c2' in core.registry
+    finally:
+        if a_file.exists():
+            a_file.unlink()
+
+
+def test_registry_never_empty_during_reload(monkeypatch):
+    core = _core(monkeypatch)
+    misses = []
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            if core.registry.get('echo') is None:
+                misses.append(1)
+
+    t = threading.Thread(target=reader)
+    t.start()
+    try:
+        for _ in range(20):
+            core._load_agents()
+    finally:
+        stop.set()
+        t.join()
+    assert not misses
+
+
+def test_watcher_debounces_events():
+    calls = []
+
+    class FakeCore:
+        def _load_agents(self, paths=None):
+            calls.append(set(paths))
+
+    handler = agent_core._AgentEventHandler(FakeCore(), debounce=0.05)
+    handler.on_any_event(FileModifiedEvent('/x/a.py'))
+    handler.on_any_event(FileModifiedEvent('/x/a.py'))
+    handler.on_any_event(FileCreatedEvent('/x/b.py'))
+    handler.on_any_event(FileOpenedEvent('/x/c.py'))
+    handler.on_any_event(FileModifiedEvent('/x/notes.txt'))
+    time.sleep(0.2)
+    assert calls == [{'/x/a.py', '/x/b.py'}]
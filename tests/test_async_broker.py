@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import intent_gateway
+import sios_messaging as messaging
+from sios_messaging.aio import AsyncBrokerClient, AsyncRedisBroker, ExecutorBridge
+from sios_messaging.redis_backend import RedisBroker
+
+
+@pytest.mark.asyncio
+async def test_executor_bridge_sends_off_the_event_loop():
+    threads = []
+    bridge = ExecutorBridge(
+        lambda intent: threads.append(threading.current_thread()),
+        lambda intents: threads.extend(threading.current_thread() for _ in intents),
+    )
+    try:
+        await bridge.send_intent({"intent_id": "1"})
+        await bridge.send_intents([{"intent_id": "2"}, {"intent_id": "3"}])
+    finally:
+        await bridge.close()
+    assert len(threads) == 3
+    assert threading.current_thread() not in threads
+
+
+@pytest.mark.asyncio
+async def test_async_redis_broker_feeds_sync_consumer():
+    fakeredis = pytest.importorskip('fakeredis')
+    server = fakeredis.FakeServer()
+    producer = AsyncRedisBroker('redis://localhost:6379/0', client=fakeredis.FakeAsyncRedis(server=server))
+    consumer = RedisBroker('redis://localhost:6379/0', client=fakeredis.FakeRedis(server=server))
+    await producer.send_intent({"intent_id": "0"})
+    await producer.send_intents([{"intent_id": str(i)} for i in range(1, 4)])
+    await producer.close()
+    assert [i["intent_id"] for i in consumer.receive_intents(timeout=0.05)] == ["0", "1", "2", "3"]
+
+
+@pytest.mark.asyncio
+async def test_async_redis_broker_pool_waits_when_exhausted():
+    aioredis = pytest.importorskip('redis.asyncio')
+    producer = AsyncRedisBroker('redis://localhost:6379/0', max_connections=3, pool_timeout=2)
+    pool = producer._client.connection_pool
+    assert isinstance(pool, aioredis.BlockingConnectionPool)
+    assert pool.max_connections == 3 and pool.timeout == 2
+    await producer.close()
+
+
+def test_gateway_sends_through_async_client(monkeypatch):
+    sent = []
+
+    class Recorder:
+        async def send_intent(self, intent):
+            sent.append(intent)
+
+    monkeypatch.setattr(messaging, "_async_client", Recorder())
+    client = TestClient(intent_gateway.app)
+    data = {"intent": "echo", "args": "hi", "intent_id": "9"}
+    resp = client.post('/intents', json=data)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    assert sent == [data]
+
+
+def test_async_broker_client_requires_send_intent():
+    class Incomplete(AsyncBrokerClient):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
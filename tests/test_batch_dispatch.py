@@ -0,0 +1,95 @@
+import pytest
+
+import agent_core
+from agent_core import group_by_intent_type
+from cognition_lattice.base_agent import BaseAgent
+from sios_messaging.inmemory import InMemoryBroker
+
+
+class BatchEchoAgent(BaseAgent):
+    intent_types = ["echo"]
+    calls = []
+
+    def execute(self, intent):
+        return self.execute_batch([intent])[0]
+
+    def execute_batch(self, intents):
+        type(self).calls.append(len(intents))
+        return [{"status": "ok", "echo": i.get("args")} for i in intents]
+
+
+class FlakyAgent(BaseAgent):
+    intent_types = ["echo"]
+
+    def execute(self, intent):
+        if intent.get("args") == "boom":
+            raise RuntimeError("boom")
+        return {"status": "ok"}
+
+
+@pytest.fixture
+def core(monkeypatch):
+    monkeypatch.setattr(agent_core.AgentCore, '_start_watcher', lambda self: None)
+    monkeypatch.setattr(agent_core, 'start_metrics_server', lambda port=8001: None)
+    monkeypatch.setattr(agent_core.messaging, 'publish_response', lambda r: None)
+    monkeypatch.setattr(agent_core.messaging, 'publish_responses', lambda r: None)
+    return agent_core.AgentCore(batch_size=8)
+
+
+def test_default_execute_batch_isolates_failures():
+    results = FlakyAgent().execute_batch([{"args": "a"}, {"args": "boom"}, {"args": "b"}])
+    assert [r["status"] for r in results] == ["ok", "error", "ok"]
+
+
+def test_submit_batch_maps_results_to_intent_ids(core):
+    BatchEchoAgent.calls = []
+    core.registry["echo"] = BatchEchoAgent
+    intents = [
+        {"intent": "echo", "args": "a", "intent_id": "1"},
+        {"intent": "echo", "intent_id": "2", "extra": True},
+        {"intent": "echo", "args": "c", "intent_id": "3"},
+    ]
+    responses = core.submit_batch(intents).result(timeout=5)
+    assert [r["intent_id"] for r in responses] == ["1", "2", "3"]
+    assert responses[0]["echo"] == "a"
+    assert responses[1]["status"] == "error"
+    assert responses[2]["echo"] == "c"
+    assert BatchEchoAgent.calls == [2]
+
+
+def test_submit_batch_rejects_short_results(core):
+    class ShortAgent(BatchEchoAgent):
+        def execute_batch(self, intents):
+            return []
+
+    core.registry["echo"] = ShortAgent
+    intents = [{"intent": "echo", "args": "a", "intent_id": "1"}]
+    responses = core.submit_batch(intents).result(timeout=5)
+    assert responses[0]["status"] == "error"
+    assert responses[0]["intent_id"] == "1"
+
+
+def test_submit_batch_surfaces_publish_failure(core, monkeypatch):
+    def publish_responses(responses):
+        raise ConnectionError("broker down")
+
+    monkeypatch.setattr(agent_core.messaging, 'publish_responses', publish_responses)
+    core.registry["echo"] = BatchEchoAgent
+    done = core.submit_batch([{"intent": "echo", "args": "a", "intent_id": "1"}])
+    with pytest.raises(ConnectionError):
+        done.result(timeout=2)
+
+
+def test_inmemory_receive_intent_batch():
+    broker = InMemoryBroker()
+    for i in range(5):
+        broker.send_intent({"intent": "echo", "intent_id": str(i)})
+    batch = broker.receive_intent_batch(3, timeout=0.1)
+    assert [i["intent_id"] for i in batch] == ["0", "1", "2"]
+    assert len(broker.receive_intent_batch(10, timeout=0.1)) == 2
+    assert broker.receive_intent_batch(10, timeout=0.01) == []
+
+
+def test_group_by_intent_type():
+    intents = [{"intent": "a"}, {"intent": "b"}, {"intent": "a"}]
+    assert group_by_intent_type(intents) == [[{"intent": "a"}, {"intent": "a"}], [{"intent": "b"}]]
@@ -0,0 +1,81 @@
+import time
+
+from prometheus_client import REGISTRY
+
+from cognition_lattice.memory.cached_memory import CachedMemory
+from cognition_lattice.memory.keyvalue_memory import KeyValueMemory
+
+
+class CountingMemory(KeyValueMemory):
+    def __init__(self):
+        super().__init__(":memory:")
+        self.reads = 0
+
+    def get(self, key):
+        self.reads += 1
+        return super().get(key)
+
+
+def _sample(name, cache):
+    return REGISTRY.get_sample_value(name, {"cache": cache}) or 0
+
+
+def test_read_through_and_invalidation():
+    backend = CountingMemory()
+    cache = CachedMemory(backend, name="rt")
+    cache.put("a", {"v": 1})
+    assert cache.get("a") == {"v": 1}
+    assert cache.get("a") == {"v": 1}
+    assert backend.reads == 1
+    assert _sample("memory_cache_hits_total", "rt") == 1
+    assert _sample("memory_cache_misses_total", "rt") == 1
+    cache.put("a", {"v": 2})
+    assert cache.get("a") == {"v": 2}
+    cache.delete("a")
+    assert cache.get("a") is None
+    assert backend.reads == 3
+
+
+def test_lru_bound_by_entries_and_bytes():
+    backend = CountingMemory()
+    for key in "abcd":
+        backend.put(key, b"x" * 100)
+    cache = CachedMemory(backend, max_entries=2, name="lru")
+    cache.get("a")
+    cache.get("b")
+    cache.get("a")
+    cache.get("c")  # evicts b, the least recently used
+    assert len(cache) == 2
+    reads = backend.reads
+    cache.get("a")
+    assert backend.reads == reads
+    cache.get("b")
+    assert backend.reads == reads + 1
+    assert _sample("memory_cache_evictions_total", "lru") == 2
+
+    sized = CachedMemory(backend, max_bytes=250, sizeof=len, name="bytes")
+    for key in "abc":
+        sized.get(key)
+    assert len(sized) == 2 and sized.size_bytes == 200
+
+
+def test_ttl_and_negative_caching():
+    backend = CountingMemory()
+    backend.put("a", 1)
+    cache = CachedMemory(backend, ttl=60, negative_ttl=0.05, name="ttl")
+    cache.put("short", 2, ttl=0.05)
+    assert cache.get("a") == 1 and cache.get("short") == 2
+    assert cache.get("missing") is None
+    assert cache.get("missing") is None
+    reads = backend.reads
+    time.sleep(0.08)
+    assert cache.get("a") == 1
+    assert backend.reads == reads
+    assert cache.get("short") == 2
+    assert cache.get("missing") is None
+    assert backend.reads == reads + 2
+
+    uncached = CachedMemory(backend, name="noneg")
+    uncached.get("missing")
+    uncached.get("missing")
+    assert len(uncached) == 0
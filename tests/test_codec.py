@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from sios_messaging.codec import CODECS, MARKER, decode, get_codec
+
+INTENT = {"intent": "echo", "args": "héllo", "intent_id": "1", "meta": {"n": [1, 2.5, None, True]}}
+
+
+@pytest.mark.parametrize("name", sorted(CODECS))
+def test_roundtrip(name):
+    assert decode(get_codec(name).encode(INTENT)) == INTENT
+
+
+def test_json_codecs_stay_plain_json():
+    for name in ("json", "orjson"):
+        if name in CODECS:
+            assert json.loads(get_codec(name).encode(INTENT)) == INTENT
+
+
+def test_msgpack_payload_is_marked():
+    if "msgpack" not in CODECS:
+        pytest.skip("msgpack not installed")
+    payload = get_codec("msgpack").encode(INTENT)
+    assert payload.startswith(MARKER + b"msgpack\x00")
+    assert len(payload) < len(get_codec("json").encode(INTENT))
+
+
+def test_decode_legacy_text_payload():
+    assert decode(json.dumps(INTENT)) == INTENT
+
+
+def test_default_codec_from_env(monkeypatch):
+    monkeypatch.setenv("SIOS_CODEC", "msgpack")
+    if "msgpack" in CODECS:
+        assert get_codec().name == "msgpack"
+    monkeypatch.setenv("SIOS_CODEC", "nope")
+    with pytest.raises(ValueError):
+        get_codec()
+
+
+def test_json_codecs_accept_non_string_keys():
+    payload = {"counts": {1: "a", 2.5: "b", True: "c", None: "d"}}
+    expected = json.loads(json.dumps(payload))
+    for name in ("json", "orjson"):
+        if name in CODECS:
+            assert decode(CODECS[name].encode(payload)) == expected
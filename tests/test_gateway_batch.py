@@ -0,0 +1,54 @@
+import json
+
+from fastapi.testclient import TestClient
+
+import intent_gateway
+import sios_messaging as messaging
+from validation import validate_intents
+
+client = TestClient(intent_gateway.app)
+
+
+def test_validate_intents_reports_per_item():
+    errors = validate_intents([
+        {"intent": "echo", "intent_id": "1"},
+        {"intent_id": "2"},
+        {"intent": "nope", "intent_id": "3"},
+    ])
+    assert errors[0] is None
+    assert errors[1] == "intent field missing"
+    assert "unknown intent type" in errors[2]
+
+
+def test_batch_endpoint_sends_valid_intents_in_one_call(monkeypatch):
+    sent = []
+    monkeypatch.setattr(messaging, "send_intents", lambda intents: sent.append(list(intents)))
+    body = [
+        {"intent": "echo", "args": "a", "intent_id": "1"},
+        {"intent": "echo", "args": "b"},
+        {"intent": "unknown", "intent_id": "3"},
+        {"intent": "echo", "args": "d", "intent_id": "4"},
+    ]
+    resp = client.post("/intents/batch", json=body)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["queued"] == 2 and data["rejected"] == 2
+    assert [r["status"] for r in data["results"]] == ["queued", "rejected", "rejected", "queued"]
+    assert len(sent) == 1
+    assert [i["intent_id"] for i in sent[0]] == ["1", "4"]
+
+
+def test_stream_endpoint_chunks_ndjson(monkeypatch):
+    sent = []
+    monkeypatch.setattr(messaging, "send_intents", lambda intents: sent.append(len(intents)))
+    monkeypatch.setattr(intent_gateway, "STREAM_CHUNK", 2)
+    lines = [json.dumps({"intent": "echo", "args": str(i), "intent_id": str(i)}) for i in range(5)]
+    lines.insert(2, "{not json")
+    resp = client.post("/intents/stream", content="\n".join(lines) + "\n",
+                       headers={"Content-Type": "application/x-ndjson"})
+    assert resp.status_code == 200
+    statuses = [json.loads(line) for line in resp.text.splitlines()]
+    assert [s["index"] for s in statuses] == list(range(6))
+    assert statuses[2]["status"] == "rejected"
+    assert sum(1 for s in statuses if s["status"] == "queued") == 5
+    assert sent == [2, 1, 2]
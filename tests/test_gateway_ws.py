@@ -1,4 +1,7 @@
+import pytest
 from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
 import intent_gateway
 import sios_messaging as messaging
 
@@ -6,7 +9,7 @@ client = TestClient(intent_gateway.app)
 
 def test_websocket_response(monkeypatch):
     resp_data = {"status": "ok", "echo": "hi", "intent_id": "123"}
-    def fake_wait(intent_id, timeout=30.0):
+    async def fake_wait(intent_id, timeout=30.0):
         return resp_data
     monkeypatch.setattr(intent_gateway, "_wait_for_response", fake_wait)
     data = {"intent": "echo", "args": "hi", "intent_id": "123"}
@@ -17,3 +20,15 @@ def test_websocket_response(monkeypatch):
         result = ws.receive_json()
         assert result == resp_data
 
+
+
+def test_websocket_refused_with_several_workers(monkeypatch):
+    monkeypatch.setattr(intent_gateway, "WORKERS", 2)
+
+    async def fail_wait(intent_id, timeout=30.0):
+        raise AssertionError("responses must not be consumed")
+    monkeypatch.setattr(intent_gateway, "_wait_for_response", fail_wait)
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with client.websocket_connect("/ws/123") as ws:
+            ws.receive_json()
+    assert exc.value.code == 1008
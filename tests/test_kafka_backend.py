@@ -0,0 +1,135 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('kafka')
+
+from kafka import TopicPartition
+
+from sios_messaging import kafka_backend
+from sios_messaging.codec import MARKER, decode
+from sios_messaging.kafka_backend import _PartitionOffsets
+
+
+def test_commit_waits_for_contiguous_acks():
+    offsets = _PartitionOffsets()
+    for offset in (10, 11, 12):
+        offsets.delivered(offset)
+    offsets.acked(11)
+    assert offsets.committable() is None
+    offsets.acked(10)
+    assert offsets.committable() == 12
+    assert offsets.committable() is None
+    offsets.acked(12)
+    assert offsets.committable() == 13
+
+
+class FakeFuture:
+    def __init__(self):
+        self.errbacks = []
+
+    def add_errback(self, fn):
+        self.errbacks.append(fn)
+
+
+class FakeProducer:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.sent = []
+
+    def send(self, topic, value, key=None):
+        future = FakeFuture()
+        self.sent.append((topic, value, key, future))
+        return future
+
+    def flush(self, timeout=None):
+        pass
+
+
+class FakeConsumer:
+    def __init__(self, *topics, **kwargs):
+        self.topics = topics
+        self.kwargs = kwargs
+        self.listener = None
+        self.batches = []
+        self.commits = []
+
+    def subscribe(self, topics, listener=None):
+        self.topics = topics
+        self.listener = listener
+
+    def poll(self, timeout_ms=0, max_records=None):
+        return self.batches.pop(0) if self.batches else {}
+
+    def commit(self, offsets):
+        self.commits.append({tp: meta.offset for tp, meta in offsets.items()})
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    monkeypatch.setattr(kafka_backend, 'KafkaProducer', FakeProducer)
+    monkeypatch.setattr(kafka_backend, 'KafkaConsumer', FakeConsumer)
+    return kafka_backend.KafkaBroker('kafka:9092', codec='msgpack')
+
+
+def _records(tp, start, intents, codec):
+    return {tp: [SimpleNamespace(offset=start + i, value=codec.encode(intent)) for i, intent in enumerate(intents)]}
+
+
+def test_records_are_keyed_by_partition_key(broker):
+    broker.send_intents([{"intent": "echo", "intent_id": "1"}, {"intent_id": "2"}])
+    keys = [key for _, _, key, _ in broker._producer.sent]
+    assert keys == [b"echo", None]
+    broker.partition_key = "intent_id"
+    broker.publish_response({"intent_id": "7"})
+    assert broker._producer.sent[-1][2] == b"7"
+
+
+def test_codec_round_trip(broker):
+    broker.send_intent({"intent": "echo", "args": [1, 2]})
+    topic, value, _, _ = broker._producer.sent[0]
+    assert topic == "intents"
+    assert value.startswith(MARKER)
+    assert decode(value) == {"intent": "echo", "args": [1, 2]}
+
+
+def test_delivery_failure_is_logged(broker, caplog):
+    broker.send_intent({"intent": "echo", "intent_id": "42"})
+    future = broker._producer.sent[0][3]
+    with caplog.at_level(logging.ERROR, logger=kafka_backend.__name__):
+        for errback in future.errbacks:
+            errback(RuntimeError("broker down"))
+    assert "42" in caplog.text and "broker down" in caplog.text
+
+
+def test_poll_tracks_offsets_and_commits_on_next_poll(broker):
+    tp = TopicPartition("intents", 0)
+    consumer = broker._consumer
+    consumer.batches.append(_records(tp, 5, [{"intent_id": str(i)} for i in range(3)], broker._codec))
+    intents = broker.receive_intent_batch(10, timeout=0)
+    assert [i["intent_id"] for i in intents] == ["0", "1", "2"]
+    assert len(broker._unacked) == 3
+
+    broker.acknowledge_intent(intents[1])
+    broker.receive_intent_batch(10, timeout=0)
+    assert consumer.commits == []  # offset 5 is still outstanding
+
+    broker.acknowledge_intent(intents[0])
+    broker.receive_intent_batch(10, timeout=0)
+    assert consumer.commits == [{tp: 7}]
+    assert len(broker._unacked) == 1
+
+
+def test_revoke_commits_and_forgets_partition(broker):
+    tp = TopicPartition("intents", 3)
+    consumer = broker._consumer
+    consumer.batches.append(_records(tp, 0, [{"intent_id": "a"}, {"intent_id": "b"}], broker._codec))
+    intents = broker.receive_intent_batch(10, timeout=0)
+    broker.acknowledge_intent(intents[0])
+    consumer.listener.on_partitions_revoked([tp])
+    assert consumer.commits == [{tp: 1}]
+    assert tp not in broker._offsets
+    # acknowledging after the revoke must not resurrect the partition
+    broker.acknowledge_intent(intents[1])
+    assert tp not in broker._offsets
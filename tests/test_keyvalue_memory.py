@@ -0,0 +1,230 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from cognition_lattice.memory.keyvalue_memory import KeyValueMemory
+
+
+def test_wal_and_synchronous(tmp_path):
+    kv = KeyValueMemory(str(tmp_path / "kv.db"), synchronous="OFF")
+    assert kv.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert kv.conn.execute("PRAGMA synchronous").fetchone()[0] == 0
+    kv.close()
+
+
+def test_bulk_operations(tmp_path):
+    kv = KeyValueMemory(str(tmp_path / "kv.db"))
+    kv.put_many({f"k{i}": {"n": i} for i in range(1200)})
+    found = kv.get_many([f"k{i}" for i in range(0, 1200, 2)] + ["missing"])
+    assert len(found) == 600
+    assert found["k10"] == {"n": 10}
+    kv.delete_many([f"k{i}" for i in range(1000)])
+    assert kv.get("k999") is None
+    assert kv.get("k1000") == {"n": 1000}
+    kv.close()
+
+
+def test_connection_per_thread(tmp_path):
+    kv = KeyValueMemory(str(tmp_path / "kv.db"))
+    connections = []
+
+    def work(n):
+        kv.put(f"t{n}", n)
+        connections.append(kv.conn)
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({id(c) for c in connections}) == 4
+    assert kv.get_many([f"t{n}" for n in range(4)]) == {f"t{n}": n for n in range(4)}
+    kv.close()
+
+
+def test_in_memory_shared_between_threads():
+    kv = KeyValueMemory(":memory:")
+    thread = threading.Thread(target=kv.put, args=("a", 1))
+    thread.start()
+    thread.join()
+    assert kv.get("a") == 1
+    kv.close()
+
+
+def test_in_memory_concurrent_writers():
+    kv = KeyValueMemory(":memory:", fts=True)
+
+    def work(n):
+        for i in range(200):
+            kv.put(f"t{n}:{i}", i)
+            kv.get(f"t{n}:{i}")
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(list(kv.search("t", mode="prefix"))) == 1600
+    assert len(list(kv.search(":19", limit=None))) == 8 * 11
+    kv.close()
+
+
+def test_unpicklable_put_raises_at_call(tmp_path):
+    kv = KeyValueMemory(str(tmp_path / "kv.db"), write_behind=100, flush_interval=60)
+    with pytest.raises(Exception):
+        kv.put("lock", threading.Lock())
+    kv.put("a", 1)
+    kv.close()
+    reader = KeyValueMemory(str(tmp_path / "kv.db"))
+    assert reader.get_many(["lock", "a"]) == {"a": 1}
+    reader.close()
+
+
+def test_read_during_flush_sees_batch(tmp_path, monkeypatch):
+    kv = KeyValueMemory(str(tmp_path / "kv.db"), write_behind=100, flush_interval=60)
+    kv.put("a", 1)
+    writing = threading.Event()
+    release = threading.Event()
+    write = kv._write
+
+    def slow_write(puts, deletes):
+        writing.set()
+        release.wait(5)
+        write(puts, deletes)
+
+    monkeypatch.setattr(kv, "_write", slow_write)
+    flusher = threading.Thread(target=kv.flush)
+    flusher.start()
+    assert writing.wait(5)
+    assert kv.get("a") == 1
+    assert kv.get_many(["a"]) == {"a": 1}
+    release.set()
+    flusher.join()
+    kv.close()
+
+
+def test_failed_flush_keeps_batch_and_flusher(tmp_path, monkeypatch):
+    path = str(tmp_path / "kv.db")
+    kv = KeyValueMemory(path, write_behind=100, flush_interval=0.05)
+    write = kv._write
+    failures = []
+
+    def flaky_write(puts, deletes):
+        if not failures:
+            failures.append(puts)
+            kv.put("a", 2)
+            raise sqlite3.OperationalError("database is locked")
+        write(puts, deletes)
+
+    monkeypatch.setattr(kv, "_write", flaky_write)
+    kv.put("a", 1)
+    kv.put("b", 1)
+    reader = KeyValueMemory(path)
+    deadline = time.monotonic() + 5
+    while reader.get("b") is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert failures
+    # the write made while the batch was failing wins over the restored batch
+    assert reader.get_many(["a", "b"]) == {"a": 2, "b": 1}
+    kv.close()
+    reader.close()
+
+
+def test_write_behind_flushes_on_size(tmp_path):
+    path = str(tmp_path / "kv.db")
+    kv = KeyValueMemory(path, write_behind=3, flush_interval=60)
+    reader = KeyValueMemory(path)
+    kv.put("a", 1)
+    kv.put("b", 2)
+    kv.delete("a")
+    assert kv.get("a") is None and kv.get("b") == 2
+    assert reader.get("b") is None
+    kv.put("c", 3)
+    assert reader.get_many(["a", "b", "c"]) == {"b": 2, "c": 3}
+    kv.close()
+    reader.close()
+
+
+def test_write_behind_flushes_on_time(tmp_path):
+    path = str(tmp_path / "kv.db")
+    kv = KeyValueMemory(path, write_behind=100, flush_interval=0.05)
+    reader = KeyValueMemory(path)
+    kv.put("a", 1)
+    deadline = time.monotonic() + 2
+    while reader.get("a") is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert reader.get("a") == 1
+    kv.close()
+    reader.close()
+
+
+def test_close_flushes_buffer(tmp_path):
+    path = str(tmp_path / "kv.db")
+    kv = KeyValueMemory(path, write_behind=100, flush_interval=60)
+    kv.put("a", 1)
+    kv.close()
+    reader = KeyValueMemory(path)
+    assert reader.get("a") == 1
+    reader.close()
+
+
+def _keys_db(tmp_path, **kwargs):
+    kv = KeyValueMemory(str(tmp_path / "kv.db"), **kwargs)
+    kv.put_many({
+        "user:1:profile": "p1",
+        "user:1:settings": "s1",
+        "user:2:profile": "p2",
+        "user_3": "u3",
+        "session:abc": "sa",
+        "users": "all",
+    })
+    return kv
+
+
+def test_prefix_search_uses_primary_key(tmp_path):
+    kv = _keys_db(tmp_path)
+    assert list(kv.search("user:1:", mode="prefix")) == ["p1", "s1"]
+    assert list(kv.search("user", mode="prefix", limit=2, offset=1)) == ["s1", "p2"]
+    sql, params = kv._prefix_query("user:")
+    plan = " ".join(row[-1] for row in kv.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+    assert "USING INDEX" in plan and "SCAN" not in plan
+    kv.close()
+
+
+def test_substring_search_with_and_without_fts(tmp_path):
+    kv = _keys_db(tmp_path)
+    assert list(kv.search("profile")) == ["p1", "p2"]
+    assert list(kv.search("_")) == ["u3"]
+    kv.close()
+    # enabling fts on an existing table indexes the rows already there
+    kv = KeyValueMemory(str(tmp_path / "kv.db"), fts=True)
+    assert list(kv.search("PROFILE")) == ["p1", "p2"]
+    assert list(kv.search("ser", limit=1, offset=4)) == ["all"]
+    kv.delete("user:1:profile")
+    kv.put("user:2:profile", "p2b")
+    kv.put("team:profile", "t")
+    assert list(kv.search("profile")) == ["t", "p2b"]
+    kv.close()
+
+
+def test_token_search(tmp_path):
+    kv = _keys_db(tmp_path, fts=True)
+    assert list(kv.search("settings", mode="token")) == ["s1"]
+    assert list(kv.search("1 profile", mode="token")) == ["p1"]
+    assert list(kv.search("prof", mode="token")) == []
+    kv.close()
+    plain = KeyValueMemory(str(tmp_path / "plain.db"))
+    with pytest.raises(ValueError):
+        next(plain.search("x", mode="token"))
+    plain.close()
+
+
+def test_search_streams_pages(tmp_path):
+    kv = KeyValueMemory(str(tmp_path / "kv.db"))
+    kv.put_many((f"k{i:04d}", i) for i in range(1000))
+    results = kv.search("k", mode="prefix", page_size=10)
+    assert next(results) == 0
+    assert list(results)[-1] == 999
+    kv.close()
@@ -0,0 +1,62 @@
+import time
+
+from cognition_lattice.memory.memory_persistence import MemoryPersistence
+
+
+def test_ttl_expiry_and_bounded_cleanup():
+    store = MemoryPersistence()
+    for i in range(10):
+        store.put(f"s{i}", i, ttl=0.01)
+    store.put("keep", "k")
+    store.put("s0", "renewed", ttl=60)
+    time.sleep(0.02)
+    assert store.get("s9") is None
+    assert store.cleanup(limit=4) == 3  # the stale heap item for s0 counts towards the limit
+    assert store.cleanup() == 5
+    assert len(store) == 2
+    assert store.get("s0") == "renewed" and store.get("keep") == "k"
+
+
+def test_lru_eviction():
+    store = MemoryPersistence(max_size=2)
+    store.put("a", 1)
+    store.put("b", 2)
+    store.get("a")
+    store.put("c", 3)
+    assert store.get("b") is None
+    assert store.get("a") == 1 and store.get("c") == 3
+
+
+def test_background_sweeper():
+    store = MemoryPersistence(sweep_interval=0.01, sweep_batch=10)
+    for i in range(25):
+        store.put(str(i), i, ttl=0.01)
+    deadline = time.monotonic() + 2
+    while len(store) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    store.close()
+    assert len(store) == 0
+
+
+def test_heap_bounded_under_live_anchor():
+    # a live entry on the heap top must not keep stale items below it around
+    store = MemoryPersistence()
+    store.put("anchor", 0, ttl=3600)
+    for i in range(20_000):
+        store.put(f"k{i % 50}", i, ttl=7200)
+    assert len(store) == 51
+    assert len(store._heap) <= 2 * len(store)
+    for _ in range(10_000):
+        store.put("gone", 1, ttl=7200)
+        store.delete("gone")
+    assert len(store._heap) <= 2 * len(store) + 1
+
+    bounded = MemoryPersistence(max_size=100)
+    for i in range(20_000):
+        bounded.put(f"e{i}", i, ttl=3600)
+    assert len(bounded) == 100
+    assert len(bounded._heap) <= 200
+    assert bounded.cleanup() == 0
+    bounded.put("k", 1)
+    bounded.delete("k")
+    assert bounded.cleanup() == 0
@@ -0,0 +1,229 @@
+import asyncio
+import dataclasses
+
+import pytest
+
+from prometheus_client import REGISTRY
+
+from messaging_bus import Message, MessageBus, MessageType, SubscriberOverflowError, TopicTrie
+
+
+async def _collect(bus, patterns, count, out):
+    subscription = bus.subscribe(patterns)
+    try:
+        async for message in subscription:
+            out.append(message)
+            if len(out) == count:
+                return
+    finally:
+        await subscription.aclose()
+
+
+@pytest.mark.asyncio
+async def test_fan_out_shares_one_message():
+    bus = MessageBus()
+    received = [[], [], []]
+    tasks = [
+        asyncio.create_task(_collect(bus, ["echo.*"], 1, received[0])),
+        asyncio.create_task(_collect(bus, ["echo.*"], 1, received[1])),
+        asyncio.create_task(_collect(bus, ["echo.test"], 1, received[2])),
+    ]
+    await asyncio.sleep(0)
+    message = Message(type=MessageType.EVENT, source="test", payload={"n": 1})
+    await bus.publish("echo.test", message)
+    await asyncio.wait_for(asyncio.gather(*tasks), 1)
+    assert all(r[0] is message for r in received)
+
+
+def test_message_is_immutable():
+    message = Message(type=MessageType.EVENT, source="test")
+    assert message.correlation_id == message.message_id
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        message.source = "other"
+    assert Message.from_dict(message.to_dict()) == message
+
+
+@pytest.mark.parametrize("pattern,topic,expected", [
+    ("echo.*", "echo.test", True),
+    ("echo.*", "echo", False),
+    ("echo.*", "echo.a.b", False),
+    ("echo.#", "echo", True),
+    ("echo.#", "echo.a.b", True),
+    ("#", "anything.at.all", True),
+    ("a.#.z", "a.z", True),
+    ("a.#.z", "a.b.c.z", True),
+    ("a.#.z", "a.b.c", False),
+    ("*.b.#", "a.b", True),
+    ("*.b.#", "b.a", False),
+])
+def test_topic_trie_matching(pattern, topic, expected):
+    trie = TopicTrie()
+    trie.add(pattern, "sub")
+    assert (trie.match(topic) == {"sub"}) is expected
+
+
+def test_topic_trie_remove_prunes():
+    trie = TopicTrie()
+    trie.add("a.*.c", 1)
+    trie.add("a.#", 2)
+    trie.remove("a.*.c", 1)
+    assert trie.match("a.b.c") == {2}
+    trie.remove("a.#", 2)
+    assert len(trie) == 0 and not trie._root.children
+
+
+@pytest.mark.asyncio
+async def test_overlapping_patterns_deliver_once():
+    bus = MessageBus()
+    received = []
+    task = asyncio.create_task(_collect(bus, ["echo.#", "echo.*", "echo.test"], 2, received))
+    await asyncio.sleep(0)
+    first = Message(type=MessageType.EVENT, source="test")
+    second = Message(type=MessageType.EVENT, source="test")
+    await bus.publish("echo.test", first)
+    await bus.publish("echo.test", second)
+    await asyncio.wait_for(task, 1)
+    assert received == [first, second]
+    assert len(bus._patterns) == 0 and not bus._subscriptions
+
+
+async def _fill(bus, overflow, count):
+    """Subscribe with a 2-slot queue and return it after the first delivery."""
+    subscription = bus.subscribe(["slow"], maxsize=2, overflow=overflow, name=f"slow-{overflow}")
+    first = asyncio.ensure_future(subscription.__anext__())
+    await asyncio.sleep(0)
+    messages = [Message(type=MessageType.EVENT, source="test", payload={"n": n}) for n in range(count)]
+    await bus.publish("slow", messages[0])
+    assert (await first).payload["n"] == 0
+    return subscription, messages[1:]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("overflow,expected", [
+    ("drop_oldest", [3, 4]),
+    ("drop_newest", [1, 2]),
+])
+async def test_bounded_queue_drop_policies(overflow, expected):
+    bus = MessageBus()
+    subscription, messages = await _fill(bus, overflow, 5)
+    for message in messages:
+        await bus.publish("slow", message)
+    received = [(await subscription.__anext__()).payload["n"] for _ in range(2)]
+    await subscription.aclose()
+    assert received == expected
+    dropped = REGISTRY.get_sample_value(
+        "bus_messages_dropped_total", {"subscriber": f"slow-{overflow}", "policy": overflow}
+    )
+    assert dropped == 2
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_raise_and_block():
+    bus = MessageBus()
+    subscription, messages = await _fill(bus, "raise", 4)
+    await bus.publish("slow", messages[0])
+    await bus.publish("slow", messages[1])
+    with pytest.raises(SubscriberOverflowError):
+        await bus.publish("slow", messages[2])
+    assert REGISTRY.get_sample_value("bus_queue_depth", {"subscriber": "slow-raise"}) == 2
+    await subscription.aclose()
+
+    subscription, messages = await _fill(bus, "block", 4)
+    await bus.publish("slow", messages[0])
+    await bus.publish("slow", messages[1])
+    blocked = asyncio.ensure_future(bus.publish("slow", messages[2]))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+    await subscription.__anext__()
+    await asyncio.wait_for(blocked, 1)
+    await subscription.aclose()
+
+
+async def _responder(bus, pattern):
+    async for message in bus.subscribe([pattern]):
+        await bus.publish(f"response.{message.message_id}", message.reply({"echo": message.target}))
+
+
+@pytest.mark.asyncio
+async def test_request_uses_pending_map():
+    bus = MessageBus()
+    task = asyncio.create_task(_responder(bus, "svc.*"))
+    await asyncio.sleep(0)
+    try:
+        response = await bus.request("svc.a", {"x": 1}, timeout=1)
+        assert response.payload == {"echo": "svc.a"}
+        assert list(bus._subscriptions) == [] and not bus._pending
+    finally:
+        task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_propagated_correlation_id_does_not_resolve_request():
+    bus = MessageBus()
+
+    async def respond():
+        async for message in bus.subscribe(["svc.*"]):
+            progress = Message(type=MessageType.EVENT, source="svc", payload={"progress": 50},
+                               correlation_id=message.message_id)
+            await bus.publish("audit.progress", progress)
+            await bus.publish(f"response.{message.message_id}", message.reply({"done": True}))
+
+    task = asyncio.create_task(respond())
+    await asyncio.sleep(0)
+    try:
+        response = await bus.request("svc.a", timeout=1)
+        assert response.payload == {"done": True}
+    finally:
+        task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_request_many_shares_deadline():
+    bus = MessageBus()
+    task = asyncio.create_task(_responder(bus, "svc.*"))
+    await asyncio.sleep(0)
+    try:
+        replies = await bus.request_many([("svc.a", None), ("svc.b", {"y": 2})], timeout=1)
+        assert [r.payload["echo"] for r in replies] == ["svc.a", "svc.b"]
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        replies = await bus.request_many(
+            [("svc.c", None), ("nobody.home", None), ("nobody.else", None)],
+            timeout=0.1, return_exceptions=True,
+        )
+        assert loop.time() - started < 0.5
+        assert replies[0].payload["echo"] == "svc.c"
+        assert all(isinstance(r, asyncio.TimeoutError) for r in replies[1:])
+        with pytest.raises(asyncio.TimeoutError):
+            await bus.request_many([("nobody.home", None)], timeout=0.05)
+        assert not bus._pending
+    finally:
+        task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_queue_depth_sums_subscriptions_sharing_a_name():
+    bus = MessageBus()
+
+    def depth():
+        return REGISTRY.get_sample_value("bus_queue_depth", {"subscriber": "shared"})
+
+    subscriptions = [bus.subscribe([topic], name="shared") for topic in ("a", "b")]
+    firsts = [asyncio.ensure_future(s.__anext__()) for s in subscriptions]
+    await asyncio.sleep(0)
+    base = depth()
+    for topic in ("a", "b"):
+        await bus.publish(topic, Message(type=MessageType.EVENT, source="test"))
+    await asyncio.gather(*firsts)
+    for topic, count in (("a", 2), ("b", 3)):
+        for _ in range(count):
+            await bus.publish(topic, Message(type=MessageType.EVENT, source="test"))
+    assert depth() == base + 5
+    await subscriptions[0].aclose()
+    # closing one subscription leaves the other's backlog in the gauge
+    assert depth() == base + 3
+    await subscriptions[1].__anext__()
+    assert depth() == base + 2
+    await subscriptions[1].aclose()
+    assert depth() == base
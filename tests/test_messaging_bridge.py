@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip('fakeredis')
+
+from messaging_bridge import RedisBusBridge
+from messaging_bus import Message, MessageBus, MessageType
+
+
+async def _pair(outbound_a, outbound_b):
+    server = fakeredis.FakeServer()
+    bus_a, bus_b = MessageBus(), MessageBus()
+    bridge_a = RedisBusBridge(bus_a, outbound_a, client=fakeredis.FakeAsyncRedis(server=server), node_id="a")
+    bridge_b = RedisBusBridge(bus_b, outbound_b, client=fakeredis.FakeAsyncRedis(server=server), node_id="b")
+    await bridge_a.start()
+    await bridge_b.start()
+    return bus_a, bus_b, bridge_a, bridge_b
+
+
+@pytest.mark.asyncio
+async def test_request_crosses_bridge_and_reply_returns():
+    bus_a, bus_b, bridge_a, bridge_b = await _pair(["svc.#"], ["svc.#"])
+
+    async def respond():
+        async for message in bus_b.subscribe(["svc.*"]):
+            await bus_b.publish(f"response.{message.message_id}", message.reply({"seen": message.payload}))
+
+    responder = asyncio.create_task(respond())
+    await asyncio.sleep(0.05)
+    try:
+        reply = await bus_a.request("svc.echo", {"x": 1}, timeout=2)
+        assert reply.payload == {"seen": {"x": 1}}
+        replies = await bus_a.request_many([(f"svc.{i}", {"i": i}) for i in range(20)], timeout=2)
+        assert [r.payload["seen"]["i"] for r in replies] == list(range(20))
+    finally:
+        responder.cancel()
+        await bridge_a.stop()
+        await bridge_b.stop()
+
+
+@pytest.mark.asyncio
+async def test_propagated_correlation_id_keeps_reply_route():
+    bus_a, bus_b, bridge_a, bridge_b = await _pair(["svc.#"], ["svc.#", "audit.#"])
+
+    async def respond():
+        async for message in bus_b.subscribe(["svc.*"]):
+            progress = Message(type=MessageType.EVENT, source="svc", payload={"progress": 50},
+                               correlation_id=message.message_id)
+            await bus_b.publish("audit.progress", progress)
+            await bus_b.publish(f"response.{message.message_id}", message.reply({"done": True}))
+
+    responder = asyncio.create_task(respond())
+    await asyncio.sleep(0.05)
+    try:
+        reply = await bus_a.request("svc.echo", timeout=2)
+        assert reply.payload == {"done": True}
+    finally:
+        responder.cancel()
+        await bridge_a.stop()
+        await bridge_b.stop()
+
+
+@pytest.mark.asyncio
+async def test_bridged_messages_do_not_loop():
+    bus_a, bus_b, bridge_a, bridge_b = await _pair(["evt.#"], ["evt.#"])
+    published = {"a": [], "b": []}
+
+    def count(bridge):
+        original = bridge._client.publish
+
+        async def counting_publish(channel, data):
+            published[bridge.node_id].append(data)
+            return await original(channel, data)
+
+        bridge._client.publish = counting_publish
+
+    count(bridge_a)
+    count(bridge_b)
+    received = []
+
+    async def collect():
+        async for message in bus_b.subscribe(["evt.*"]):
+            received.append(message)
+
+    collector = asyncio.create_task(collect())
+    await asyncio.sleep(0.05)
+    try:
+        for n in range(5):
+            await bus_a.publish("evt.tick", Message(type=MessageType.EVENT, source="a", payload={"n": n}))
+        await asyncio.sleep(0.2)
+        assert [m.payload["n"] for m in received] == list(range(5))
+        assert len(published["a"]) < 5  # batched
+        assert published["b"] == []  # bus b never re-forwards what it received
+    finally:
+        collector.cancel()
+        await bridge_a.stop()
+        await bridge_b.stop()
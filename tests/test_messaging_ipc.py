@@ -0,0 +1,126 @@
+import asyncio
+import contextlib
+import json
+
+import pytest
+
+from agent_core import MeshSupervisor
+from messaging_bus import Message, MessageType
+from messaging_ipc import BusHub, RemoteMessageBus
+
+
+async def _collect(bus, patterns, out, count):
+    subscription = bus.subscribe(patterns)
+    try:
+        async for message in subscription:
+            out.append(message)
+            if len(out) == count:
+                return
+    finally:
+        await subscription.aclose()
+
+
+@contextlib.asynccontextmanager
+async def running_hub(tmp_path):
+    hub = BusHub(str(tmp_path / "bus.sock"))
+    await hub.start()
+    try:
+        yield hub
+    finally:
+        await hub.close()
+
+
+@pytest.mark.asyncio
+async def test_publish_reaches_other_process_patterns(tmp_path):
+    async with running_hub(tmp_path) as hub:
+        await _cross_publish(hub)
+
+
+async def _cross_publish(hub):
+    a = await RemoteMessageBus(hub.path).connect()
+    b = await RemoteMessageBus(hub.path).connect()
+    try:
+        remote, local = [], []
+        remote_task = asyncio.create_task(_collect(b, ["echo.#"], remote, 2))
+        local_task = asyncio.create_task(_collect(a, ["echo.*"], local, 1))
+        await asyncio.sleep(0.05)
+        await a.publish("echo.test", Message(type=MessageType.EVENT, source="a", payload={"n": 1}))
+        await a.publish("echo.deep.topic", Message(type=MessageType.EVENT, source="a", payload={"n": 2}))
+        await asyncio.wait_for(asyncio.gather(remote_task, local_task), 2)
+        assert [m.payload["n"] for m in remote] == [1, 2]
+        assert [m.payload["n"] for m in local] == [1]
+    finally:
+        await a.close()
+        await b.close()
+
+
+@pytest.mark.asyncio
+async def test_request_reply_across_processes(tmp_path):
+    async with running_hub(tmp_path) as hub:
+        await _cross_request(hub)
+
+
+async def _cross_request(hub):
+    client = await RemoteMessageBus(hub.path).connect()
+    server = await RemoteMessageBus(hub.path).connect()
+
+    async def respond():
+        async for message in server.subscribe(["svc.*"]):
+            await server.publish(f"response.{message.message_id}", message.reply({"echo": message.payload}))
+
+    task = asyncio.create_task(respond())
+    await asyncio.sleep(0.05)
+    try:
+        reply = await client.request("svc.a", {"x": 1}, timeout=2)
+        assert reply.payload == {"echo": {"x": 1}}
+        replies = await client.request_many([("svc.b", {"y": 2}), ("svc.c", None)], timeout=2)
+        assert [r.payload["echo"] for r in replies] == [{"y": 2}, {}]
+    finally:
+        task.cancel()
+        await client.close()
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_propagated_correlation_id_keeps_reply_route(tmp_path):
+    async with running_hub(tmp_path) as hub:
+        client = await RemoteMessageBus(hub.path).connect()
+        server = await RemoteMessageBus(hub.path).connect()
+
+        async def respond():
+            async for message in server.subscribe(["svc.*"]):
+                progress = Message(type=MessageType.EVENT, source="svc", payload={"progress": 50},
+                                   correlation_id=message.message_id)
+                await server.publish("audit.progress", progress)
+                await server.publish(f"response.{message.message_id}", message.reply({"done": True}))
+
+        task = asyncio.create_task(respond())
+        await asyncio.sleep(0.05)
+        try:
+            reply = await client.request("svc.a", timeout=2)
+            assert reply.payload == {"done": True}
+        finally:
+            task.cancel()
+            await client.close()
+            await server.close()
+
+
+@pytest.mark.asyncio
+async def test_supervisor_splits_manifests(tmp_path):
+    manifests = tmp_path / "manifests"
+    manifests.mkdir()
+    for name in ("alpha", "beta"):
+        (manifests / f"{name}.json").write_text(json.dumps({
+            "id": name, "module": "async_echo_agent", "function": "echo_agent",
+            "subscriptions": [f"{name}.*"],
+        }))
+    supervisor = MeshSupervisor(str(manifests), workers=2)
+    await supervisor.start()
+    bus = await supervisor.connect()
+    try:
+        replies = await bus.request_many([("alpha.x", {"v": 1}), ("beta.y", {"v": 2})], timeout=5)
+        assert [r.payload["original_payload"]["v"] for r in replies] == [1, 2]
+    finally:
+        await bus.close()
+        await supervisor.stop()
+    assert not supervisor.processes
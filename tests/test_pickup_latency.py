@@ -0,0 +1,45 @@
+import threading
+
+import agent_core
+import sios_messaging as messaging
+from sios_messaging.inmemory import InMemoryBroker
+
+# Far longer than any pickup should take: a consumer that only noticed new
+# work when its wait timed out would miss every deadline below.
+IDLE_WAIT = 30.0
+DEADLINE = 5.0
+
+
+def test_inmemory_receive_wakes_on_send():
+    broker = InMemoryBroker()
+    received = []
+    waiting = threading.Event()
+
+    def consume():
+        waiting.set()
+        for intent in broker.receive_intents(timeout=IDLE_WAIT):
+            received.append(intent)
+            break
+
+    t = threading.Thread(target=consume, daemon=True)
+    t.start()
+    waiting.wait()
+    broker.send_intent({"intent": "echo", "intent_id": "1"})
+    t.join(timeout=DEADLINE)
+    assert received == [{"intent": "echo", "intent_id": "1"}]
+
+
+def test_agent_core_wakes_on_send(monkeypatch):
+    monkeypatch.setattr(messaging, '_client', InMemoryBroker())
+    monkeypatch.setattr(agent_core, 'RECEIVE_TIMEOUT', IDLE_WAIT)
+    monkeypatch.setattr(agent_core.AgentCore, '_start_watcher', lambda self: None)
+    monkeypatch.setattr(agent_core, 'start_metrics_server', lambda port=8001: None)
+
+    core = agent_core.AgentCore()
+    threading.Thread(target=core.loop, daemon=True).start()
+
+    for i in range(20):
+        intent_id = f"latency-{i}"
+        messaging.send_intent({"intent": "echo", "args": "x", "intent_id": intent_id})
+        responses = messaging.receive_responses(timeout=DEADLINE)
+        assert any(resp.get("intent_id") == intent_id for resp in responses)
@@ -0,0 +1,93 @@
+import pytest
+
+fakeredis = pytest.importorskip('fakeredis')
+import redis
+
+from sios_messaging.redis_backend import RedisBroker
+
+
+@pytest.fixture
+def broker():
+    return RedisBroker('redis://localhost:6379/0', client=fakeredis.FakeRedis(), receive_batch=3)
+
+
+def test_bulk_send_preserves_order(broker):
+    intents = [{"intent": "echo", "intent_id": str(i)} for i in range(7)]
+    broker.send_intents(intents)
+    assert list(broker.receive_intents(timeout=0.05)) == intents
+
+
+def test_receive_intent_batch_drains_up_to_max(broker):
+    broker.send_intents([{"intent_id": str(i)} for i in range(5)])
+    assert [i["intent_id"] for i in broker.receive_intent_batch(4, timeout=0.05)] == ["0", "1", "2", "3"]
+    assert [i["intent_id"] for i in broker.receive_intent_batch(4, timeout=0.05)] == ["4"]
+    assert broker.receive_intent_batch(4, timeout=0.05) == []
+
+
+def test_brpop_fallback(broker):
+    broker._has_blmpop = False
+    broker.send_intents([{"intent_id": str(i)} for i in range(3)])
+    assert [i["intent_id"] for i in broker.receive_intent_batch(2, timeout=0.05)] == ["0", "1"]
+
+
+class _OldRedis(fakeredis.FakeRedis):
+    def __init__(self, error, **kwargs):
+        super().__init__(**kwargs)
+        self.error = error
+
+    def blmpop(self, *args, **kwargs):
+        raise redis.ResponseError(self.error)
+
+
+def test_blmpop_falls_back_only_when_unknown():
+    broker = RedisBroker('redis://localhost:6379/0', client=_OldRedis("ERR unknown command 'BLMPOP'"))
+    broker.send_intent({"intent_id": "a"})
+    assert broker.receive_intent_batch(2, timeout=0.05) == [{"intent_id": "a"}]
+    assert broker._has_blmpop is False
+
+    broker = RedisBroker('redis://localhost:6379/0', client=_OldRedis("WRONGTYPE Operation against a key"))
+    with pytest.raises(redis.ResponseError):
+        broker.receive_intent_batch(2, timeout=0.05)
+    assert broker._has_blmpop is True
+
+
+def test_receive_intents_pops_one_at_a_time_by_default():
+    client = fakeredis.FakeRedis()
+    broker = RedisBroker('redis://localhost:6379/0', client=client)
+    broker.send_intents([{"intent_id": str(i)} for i in range(5)])
+    gen = broker.receive_intents(timeout=0.05)
+    next(gen)
+    # only the intent being handled has left Redis
+    assert client.llen("intents") == 4
+    gen.close()
+
+
+def test_early_exit_requeues_unread_items(broker):
+    broker.send_intents([{"intent_id": str(i)} for i in range(5)])
+    gen = broker.receive_intents(timeout=0.05)
+    assert next(gen)["intent_id"] == "0"
+    gen.close()
+    assert [i["intent_id"] for i in broker.receive_intents(timeout=0.05)] == ["1", "2", "3", "4"]
+
+
+def test_publish_responses_roundtrip(broker):
+    responses = [{"status": "ok", "intent_id": str(i)} for i in range(4)]
+    broker.publish_responses(responses)
+    assert list(broker.receive_responses(timeout=0.05)) == responses
+
+
+def test_connection_pool_sizing():
+    broker = RedisBroker('redis://localhost:6379/0', max_connections=7, pool_timeout=3)
+    pool = broker._client.connection_pool
+    # an exhausted pool must make callers wait, not raise "Too many connections"
+    assert isinstance(pool, redis.BlockingConnectionPool)
+    assert pool.max_connections == 7 and pool.timeout == 3
+
+
+def test_mixed_codecs_interoperate():
+    client = fakeredis.FakeRedis()
+    old = RedisBroker('redis://localhost:6379/0', client=client, codec='json')
+    new = RedisBroker('redis://localhost:6379/0', client=client, codec='msgpack')
+    old.send_intent({"intent_id": "a"})
+    new.send_intent({"intent_id": "b"})
+    assert [i["intent_id"] for i in old.receive_intents(timeout=0.05)] == ["a", "b"]
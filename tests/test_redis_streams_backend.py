@@ -0,0 +1,98 @@
+import time
+
+import pytest
+
+fakeredis = pytest.importorskip('fakeredis')
+
+from sios_messaging.redis_streams_backend import RedisStreamsBroker, INTENTS
+
+
+def _broker(server, consumer, **kwargs):
+    return RedisStreamsBroker(
+        'redis://localhost:6379/0',
+        consumer=consumer,
+        client=fakeredis.FakeRedis(server=server),
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def test_consumers_share_work(server):
+    a = _broker(server, 'a', count=2)
+    b = _broker(server, 'b', count=2)
+    a.send_intents([{"intent": "echo", "intent_id": str(i)} for i in range(4)])
+    first = a.receive_intent_batch(2, timeout=0.05)
+    second = b.receive_intent_batch(2, timeout=0.05)
+    ids = [i["intent_id"] for i in first + second]
+    assert sorted(ids) == ["0", "1", "2", "3"]
+
+
+def test_acknowledge_removes_pending(server):
+    broker = _broker(server, 'a')
+    broker.send_intent({"intent": "echo", "intent_id": "1"})
+    intent = next(broker.receive_intents(timeout=0.05))
+    assert broker._client.xpending(INTENTS, broker.group)['pending'] == 1
+    broker.acknowledge_intent(intent)
+    assert broker._client.xpending(INTENTS, broker.group)['pending'] == 0
+
+
+def test_dead_consumer_entries_are_reclaimed(server):
+    dead = _broker(server, 'dead')
+    dead.send_intent({"intent": "echo", "intent_id": "lost"})
+    assert dead.receive_intent_batch(10, timeout=0.05)
+    # 'dead' never acknowledges; a live consumer picks the entry up once idle
+    live = _broker(server, 'live', claim_idle=0.01, claim_interval=0)
+    time.sleep(0.02)
+    reclaimed = live.receive_intent_batch(10, timeout=0.05)
+    assert [i["intent_id"] for i in reclaimed] == ["lost"]
+    live.acknowledge_intent(reclaimed[0])
+    assert live._client.xpending(INTENTS, live.group)['pending'] == 0
+
+
+def test_responses_roundtrip_and_explicit_cap(server):
+    broker = _broker(server, 'a')
+    broker.publish_responses([{"status": "ok", "intent_id": str(i)} for i in range(3)])
+    assert [r["intent_id"] for r in broker.receive_responses(timeout=0.05)] == ["0", "1", "2"]
+    broker.send_intents([{"intent_id": str(i)} for i in range(50)])
+    broker.trim(5, approximate=False)
+    assert broker._client.xlen(INTENTS) == 5
+
+
+def test_trim_keeps_unread_and_pending_intents(server):
+    broker = _broker(server, 'a', trim_interval=0)
+    broker.send_intents([{"intent_id": str(i)} for i in range(6)])
+    first = broker.receive_intent_batch(3, timeout=0.05)
+    broker.acknowledge_intent(first[0])
+    broker.acknowledge_intent(first[2])
+    broker.trim(approximate=False)
+    # "0" is done; "1" is still pending and everything after it must stay
+    assert broker._client.xlen(INTENTS) == 5
+    for intent in first[1:2] + broker.receive_intent_batch(3, timeout=0.05):
+        broker.acknowledge_intent(intent)
+    broker.trim(approximate=False)
+    # only the last delivered entry is left
+    assert broker._client.xlen(INTENTS) == 1
+
+
+def test_writes_trim_periodically(server, monkeypatch):
+    broker = _broker(server, 'a', trim_interval=0)
+    calls = []
+    monkeypatch.setattr(broker, "trim", lambda: calls.append(1))
+    broker.send_intent({"intent_id": "1"})
+    broker.publish_response({"intent_id": "1"})
+    assert len(calls) == 2
+
+
+def test_reclaim_skips_deleted_entries(server):
+    dead = _broker(server, 'dead')
+    dead.send_intents([{"intent_id": "gone"}, {"intent_id": "kept"}])
+    assert len(dead.receive_intent_batch(10, timeout=0.05)) == 2
+    dead._client.xdel(INTENTS, dead._client.xrange(INTENTS)[0][0])
+    live = _broker(server, 'live', claim_idle=0, claim_interval=0)
+    assert [intent["intent_id"] for _, intent in live.reclaim()] == ["kept"]
+    entries = [(b"1-0", None), (b"2-0", {b"data": b'{"intent_id": "x"}'})]
+    assert [intent for _, intent in live._decode(entries)] == [{"intent_id": "x"}]
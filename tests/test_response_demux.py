@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+import pytest
+
+from response_demux import ResponseDemultiplexer
+from sios_messaging.inmemory import InMemoryBroker
+
+
+@pytest.mark.asyncio
+async def test_concurrent_waiters_get_their_own_response():
+    broker = InMemoryBroker()
+    demux = ResponseDemultiplexer(receive=broker.receive_responses, poll_timeout=0.05)
+    await demux.start()
+    try:
+        ids = [str(i) for i in range(1000)]
+        waiters = [asyncio.create_task(demux.wait_for(i, timeout=5)) for i in ids]
+        await asyncio.sleep(0)
+        assert demux.pending == len(ids)
+        broker.publish_responses([{"intent_id": i, "status": "ok"} for i in reversed(ids)])
+        results = await asyncio.gather(*waiters)
+        assert [r["intent_id"] for r in results] == ids
+        assert demux.pending == 0
+    finally:
+        await demux.stop()
+
+
+@pytest.mark.asyncio
+async def test_early_response_is_parked_until_ttl():
+    broker = InMemoryBroker()
+    demux = ResponseDemultiplexer(receive=broker.receive_responses, park_ttl=0.2, poll_timeout=0.05)
+    await demux.start()
+    try:
+        broker.publish_responses([{"intent_id": "a"}, {"intent_id": "b"}])
+        await asyncio.sleep(0.1)
+        assert await demux.wait_for("a", timeout=0.1) == {"intent_id": "a"}
+        await asyncio.sleep(0.2)
+        assert await demux.wait_for("b", timeout=0.1) is None
+    finally:
+        await demux.stop()
+
+
+@pytest.mark.asyncio
+async def test_timeout_cleans_up_waiter():
+    broker = InMemoryBroker()
+    demux = ResponseDemultiplexer(receive=broker.receive_responses, poll_timeout=0.05)
+    await demux.start()
+    try:
+        started = time.monotonic()
+        assert await demux.wait_for("missing", timeout=0.1) is None
+        assert time.monotonic() - started < 1
+        assert demux.pending == 0
+    finally:
+        await demux.stop()
@@ -17,3 +17,54 @@ def test_validate_echo_missing_field():
 def test_validate_echo_extra_field():
     with pytest.raises(ValidationError):
         validate_intent({"intent": "echo", "intent_id": "1", "extra": 1})
+
+
+def test_validator_compiled_once():
+    import validation
+
+    assert validation.get_validator("echo") is validation.get_validator("echo")
+
+
+def test_fast_path_matches_full_validator():
+    import validation
+    from jsonschema import Draft7Validator
+
+    schema = validation._load_schema("echo")
+    fast = validation._fast_check(schema)
+    assert fast is not None
+    full = Draft7Validator(schema)
+    cases = [
+        {"intent": "echo", "intent_id": "1"},
+        {"intent": "echo", "intent_id": "1", "args": "hi"},
+        {"intent": "echo", "intent_id": 1},
+        {"intent": "other", "intent_id": "1"},
+        {"intent": "echo", "args": None, "intent_id": "1"},
+        {"intent": "echo"},
+        {"intent": "echo", "intent_id": "1", "extra": 1},
+    ]
+    for case in cases:
+        assert fast(case) == full.is_valid(case), case
+
+
+def test_preload_rejects_invalid_schema(tmp_path):
+    from jsonschema.exceptions import SchemaError
+    import validation
+
+    (tmp_path / "broken.json").write_text('{"type": 12}')
+    with pytest.raises(SchemaError):
+        validation.preload_schemas(tmp_path)
+    validation._schema_cache.pop("broken", None)
+
+
+def test_validate_intents_rejects_only_broken_schema_items(monkeypatch):
+    import validation
+
+    monkeypatch.setitem(validation._schema_cache, "broken", {"type": 12})
+    errors = validation.validate_intents([
+        {"intent": "echo", "args": "hi", "intent_id": "1"},
+        {"intent": "broken", "intent_id": "2"},
+        {"intent": "nope", "intent_id": "3"},
+    ])
+    assert errors[0] is None
+    assert "12" in errors[1]
+    assert errors[2] == "unknown intent type: nope"
@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+
+import pytest
+
+import agent_core
+from cognition_lattice.base_agent import BaseAgent
+from worker_pool import WorkerPool
+
+
+class SlowAgent(BaseAgent):
+    intent_types = ["echo"]
+    pool_size = 4
+
+    def execute(self, intent):
+        time.sleep(0.2)
+        return {"status": "ok", "echo": intent.get("args")}
+
+
+def test_worker_pool_limits_inflight():
+    pool = WorkerPool("thread", workers=4, max_inflight=2)
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.pop()
+
+    futures = [pool.submit(work) for _ in range(6)]
+    for fut in futures:
+        fut.result()
+    pool.shutdown()
+    assert max(peak) <= 2
+
+
+def test_process_pool_recycle_starts_new_workers():
+    pool = WorkerPool("process", workers=1)
+    before = pool.submit(os.getpid).result()
+    pool.recycle()
+    after = pool.submit(os.getpid).result()
+    pool.shutdown()
+    assert before != after
+
+
+def test_worker_pool_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        WorkerPool("fibers")
+
+
+@pytest.mark.parametrize("mode", ["thread", "process", "asyncio"])
+def test_agent_core_concurrent_dispatch(monkeypatch, mode):
+    monkeypatch.setattr(agent_core.AgentCore, '_start_watcher', lambda self: None)
+    monkeypatch.setattr(agent_core, 'start_metrics_server', lambda port=8001: None)
+    published = []
+    monkeypatch.setattr(agent_core.messaging, 'publish_response', published.append)
+
+    core = agent_core.AgentCore(executor=mode, workers=4)
+    if mode != "process":
+        core.registry["echo"] = SlowAgent
+    try:
+        start = time.monotonic()
+        futures = [
+            core.submit({"intent": "echo", "args": str(i), "intent_id": str(i)})
+            for i in range(4)
+        ]
+        results = [f.result(timeout=5) for f in futures]
+        elapsed = time.monotonic() - start
+    finally:
+        core._pool.shutdown()
+
+    assert [r["intent_id"] for r in results] == ["0", "1", "2", "3"]
+    assert [r["echo"] for r in results] == ["0", "1", "2", "3"]
+    assert len(published) == 4
+    if mode != "process":
+        assert elapsed < 0.6
+
+
+def test_agent_core_submit_surfaces_publish_failure(monkeypatch):
+    monkeypatch.setattr(agent_core.AgentCore, '_start_watcher', lambda self: None)
+    monkeypatch.setattr(agent_core, 'start_metrics_server', lambda port=8001: None)
+
+    def publish_response(result):
+        raise ConnectionError("broker down")
+
+    monkeypatch.setattr(agent_core.messaging, 'publish_response', publish_response)
+    core = agent_core.AgentCore(executor="thread", workers=2)
+    core.registry["echo"] = SlowAgent
+    try:
+        with pytest.raises(ConnectionError):
+            core.submit({"intent": "echo", "args": "x", "intent_id": "1"}).result(timeout=2)
+    finally:
+        core._pool.shutdown()
+
+
+def test_agent_core_submit_validation_error(monkeypatch):
+    monkeypatch.setattr(agent_core.AgentCore, '_start_watcher', lambda self: None)
+    monkeypatch.setattr(agent_core, 'start_metrics_server', lambda port=8001: None)
+    monkeypatch.setattr(agent_core.messaging, 'publish_response', lambda r: None)
+
+    core = agent_core.AgentCore(executor="thread", workers=2)
+    try:
+        result = core.submit({"intent": "echo", "intent_id": "1", "extra": 1}).result(timeout=5)
+    finally:
+        core._pool.shutdown()
+    assert result["status"] == "error"
+    assert result["intent_id"] == "1"
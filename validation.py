@@ -1,11 +1,24 @@
 import json
 from pathlib import Path
-from typing import Dict, Any
-from jsonschema import validate, ValidationError
+from typing import Dict, Any, Callable, List, Optional
+from jsonschema import validators, ValidationError
 
 SCHEMAS_DIR = Path(__file__).parent / 'schemas'
 
 _schema_cache = {}
+_validator_cache: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+
+# Keywords that carry no validation semantics and can be ignored by the fast path.
+_ANNOTATIONS = {'$schema', '$id', 'title', 'description'}
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    'string': lambda v: isinstance(v, str),
+    'boolean': lambda v: isinstance(v, bool),
+    'null': lambda v: v is None,
+    'object': lambda v: isinstance(v, dict),
+    'array': lambda v: isinstance(v, list),
+}
+
 
 def _load_schema(intent_type: str) -> Dict[str, Any]:
     if intent_type not in _schema_cache:
@@ -15,9 +28,123 @@ def _load_schema(intent_type: str) -> Dict[str, Any]:
     return _schema_cache[intent_type]
 
 
+def _fast_check(schema: Dict[str, Any]) -> Optional[Callable[[Dict[str, Any]], bool]]:
+    """Build a plain-Python check for flat object schemas such as ``echo.json``.
+
+    Only ``type: object`` schemas whose properties use ``const`` strings or
+    simple ``type`` constraints qualify; anything else returns ``None`` and is
+    left to the full validator.
+    """
+    if set(schema) - _ANNOTATIONS - {'type', 'properties', 'required', 'additionalProperties'}:
+        return None
+    if schema.get('type') != 'object':
+        return None
+    additional = schema.get('additionalProperties', True)
+    if not isinstance(additional, bool):
+        return None
+    checks: Dict[str, Callable[[Any], bool]] = {}
+    for name, prop in schema.get('properties', {}).items():
+        if not isinstance(prop, dict) or set(prop) - _ANNOTATIONS - {'type', 'const'}:
+            return None
+        if 'const' in prop:
+            if 'type' in prop or not isinstance(prop['const'], str):
+                return None
+            const = prop['const']
+            checks[name] = lambda v, c=const: isinstance(v, str) and v == c
+        elif prop.get('type') in _TYPE_CHECKS:
+            checks[name] = _TYPE_CHECKS[prop['type']]
+        elif prop:
+            return None
+        else:
+            checks[name] = lambda v: True
+    required = tuple(schema.get('required', ()))
+
+    def check(instance: Dict[str, Any]) -> bool:
+        if not isinstance(instance, dict):
+            return False
+        for name in required:
+            if name not in instance:
+                return False
+        for name, value in instance.items():
+            prop_check = checks.get(name)
+            if prop_check is None:
+                if not additional:
+                    return False
+            elif not prop_check(value):
+                return False
+        return True
+
+    return check
+
+
+def _compile(schema: Dict[str, Any]) -> Callable[[Dict[str, Any]], None]:
+    """Check ``schema`` once and return a function validating instances against it."""
+    cls = validators.validator_for(schema)
+    cls.check_schema(schema)
+    validator = cls(schema)
+    fast = _fast_check(schema)
+    if fast is None:
+        return validator.validate
+
+    def validate_fast(instance: Dict[str, Any]) -> None:
+        # The full validator only runs to produce the error for invalid input.
+        if not fast(instance):
+            validator.validate(instance)
+
+    return validate_fast
+
+
+def get_validator(intent_type: str) -> Callable[[Dict[str, Any]], None]:
+    if intent_type not in _validator_cache:
+        _validator_cache[intent_type] = _compile(_load_schema(intent_type))
+    return _validator_cache[intent_type]
+
+
+def preload_schemas(schemas_dir: Path = SCHEMAS_DIR) -> None:
+    """Load and compile every schema in ``schemas_dir`` ahead of the first intent."""
+    for path in schemas_dir.glob('*.json'):
+        if path.stem not in _validator_cache:
+            with open(path, 'r') as f:
+                _schema_cache[path.stem] = json.load(f)
+            get_validator(path.stem)
+
+
 def validate_intent(intent: Dict[str, Any]) -> None:
     intent_type = intent.get('intent')
     if not intent_type:
         raise ValidationError('intent field missing')
-    schema = _load_schema(intent_type)
-    validate(instance=intent, schema=schema)
+    get_validator(intent_type)(intent)
+
+
+def validate_intents(intents: List[Dict[str, Any]]) -> List[Optional[str]]:
+    """Validate many intents, returning an error message (or ``None``) per intent.
+
+    Validators are looked up once per intent type rather than once per intent,
+    and an unknown type or a broken schema rejects only its own intents.
+    """
+    errors: List[Optional[str]] = [None] * len(intents)
+    by_type: Dict[str, List[int]] = {}
+    for index, intent in enumerate(intents):
+        intent_type = intent.get('intent')
+        if not intent_type:
+            errors[index] = 'intent field missing'
+        else:
+            by_type.setdefault(intent_type, []).append(index)
+    for intent_type, indices in by_type.items():
+        try:
+            validate = get_validator(intent_type)
+        except FileNotFoundError:
+            for index in indices:
+                errors[index] = f'unknown intent type: {intent_type}'
+            continue
+        except Exception as exc:
+            # e.g. SchemaError or a schema file that is not valid JSON
+            for index in indices:
+                errors[index] = str(exc)
+            continue
+        for index in indices:
+            try:
+                validate(intents[index])
+            except ValidationError as exc:
+                errors[index] = exc.message
+    return errors
@@ -0,0 +1,94 @@
+"""Bounded worker pools for concurrent intent execution."""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+MODES = ("thread", "process", "asyncio")
+
+
+class WorkerPool:
+    """Run callables on a thread, process or asyncio pool.
+
+    ``submit`` blocks once ``max_inflight`` submissions are still running, which
+    applies backpressure to whoever is feeding the pool.  In ``asyncio`` mode the
+    submitted callable must be a coroutine function; it is scheduled on an event
+    loop owned by a background thread.
+    """
+
+    def __init__(
+        self,
+        mode: str = "thread",
+        workers: Optional[int] = None,
+        max_inflight: Optional[int] = None,
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown worker pool mode: {mode}")
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self.max_inflight = max_inflight or self.workers * 2
+        self._slots = threading.BoundedSemaphore(self.max_inflight)
+        self._executor_lock = threading.Lock()
+        self._executor: Optional[Any] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._async_slots: Optional[asyncio.Semaphore] = None
+        if mode == "thread":
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="agent_worker"
+            )
+        elif mode == "process":
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._loop.run_forever, name="agent_worker_loop", daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Schedule ``fn(*args)`` and return a future for its result."""
+        self._slots.acquire()
+        try:
+            if self._loop is not None:
+                future = asyncio.run_coroutine_threadsafe(self._run(fn, *args), self._loop)
+            else:
+                with self._executor_lock:
+                    future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._async_slots is None:
+            self._async_slots = asyncio.Semaphore(self.workers)
+        async with self._async_slots:
+            return await fn(*args)
+
+    def recycle(self) -> None:
+        """Replace the worker processes so new submissions run freshly imported code.
+
+        Process workers unpickle agent classes by reference and keep their own
+        instances, so after a hot-reload they would go on running the old
+        classes.  Work already submitted finishes on the old processes, which
+        exit afterwards.  Thread and asyncio pools share the reloaded modules
+        and are left alone.
+        """
+        if self.mode != "process":
+            return
+        with self._executor_lock:
+            old, self._executor = self._executor, ProcessPoolExecutor(max_workers=self.workers)
+        old.shutdown(wait=False)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work and release pool resources."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            if wait and self._thread is not None:
+                self._thread.join()